@@ -0,0 +1,172 @@
+"""Server-side response cache for read-heavy analytics endpoints.
+
+Responses are stored per endpoint and query string in an in-process LRU with
+a TTL, or in any shared backend with the cachelib ``get``/``set``/``delete``/
+``clear`` interface (set ``ANALYTICS_CACHE_BACKEND`` to e.g. a RedisCache).
+
+Each cached view declares the tables it reads, and the entry key folds in
+their ``table_versions`` counters (see app.versions). Every commit that
+writes a table bumps its counter in the database, so a write made by any
+worker or process retires the dependent entries everywhere. The stale
+entries are never requested again and age out. Building the key costs one
+primary-key lookup on table_versions per request.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+from . import versions
+
+
+class LRUBackend:
+    """Thread-safe in-process store with least-recently-used eviction"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """Store ``value``; a falsy ``timeout`` means it never expires"""
+        expires_at = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        return True
+
+
+class ResponseCache:
+    """Caches JSON responses of decorated views, invalidated by table writes"""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.timeout = None
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stats = {}  # endpoint -> {'hits': n, 'misses': n}
+        self._invalidations = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ANALYTICS_CACHE_ENABLED', True)
+        app.config.setdefault('ANALYTICS_CACHE_TTL', 300)
+        app.config.setdefault('ANALYTICS_CACHE_MAX_ENTRIES', 256)
+        app.config.setdefault('ANALYTICS_CACHE_BACKEND', None)
+        self.enabled = app.config['ANALYTICS_CACHE_ENABLED']
+        self.timeout = app.config['ANALYTICS_CACHE_TTL']
+        self.backend = app.config['ANALYTICS_CACHE_BACKEND'] or LRUBackend(
+            app.config['ANALYTICS_CACHE_MAX_ENTRIES']
+        )
+        versions.subscribe(self.invalidate_tables)
+        app.extensions['response_cache'] = self
+
+    def cached(self, *tables, vary_on=None):
+        """Decorator caching a view's 200 responses until one of ``tables`` is written.
+
+        ``vary_on``, if given, is called per request and its string is added
+        to the key, for inputs the query string doesn't carry (e.g. today's
+        date behind a default window).
+        """
+        tables = sorted(tables)
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return view(*args, **kwargs)
+
+                # Read the counters before computing, so a write that
+                # commits mid-request leaves this entry under a stale key
+                key = self._entry_key(request.endpoint, tables, vary_on() if vary_on else '')
+                hit = self.backend.get(key)
+                self._count(request.endpoint, 'hits' if hit is not None else 'misses')
+                if hit is not None:
+                    body, mimetype = hit
+                    response = current_app.response_class(body, mimetype=mimetype)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    self.backend.set(key, (response.get_data(), response.mimetype), self.timeout)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate_tables(self, tables):
+        """Count a commit that retired entries depending on ``tables``.
+
+        Nothing needs deleting: the commit bumped the tables' counters, so
+        the next request for those entries builds a different key.
+        """
+        with self._lock:
+            self._invalidations += 1
+
+    def clear(self):
+        """Drop every entry from the backend"""
+        self.backend.clear()
+
+    def stats(self):
+        """Hit/miss counters for this process"""
+        with self._lock:
+            endpoints = {name: dict(counts) for name, counts in self._stats.items()}
+            invalidations = self._invalidations
+        hits = sum(c['hits'] for c in endpoints.values())
+        misses = sum(c['misses'] for c in endpoints.values())
+        return {
+            'enabled': self.enabled,
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend) if hasattr(self.backend, '__len__') else None,
+            'ttl_seconds': self.timeout,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+            'invalidations': invalidations,
+            'endpoints': endpoints
+        }
+
+    def _count(self, endpoint, field):
+        with self._lock:
+            counts = self._stats.setdefault(endpoint, {'hits': 0, 'misses': 0})
+            counts[field] += 1
+
+    def _entry_key(self, endpoint, tables, extra=''):
+        args = urlencode(sorted(request.args.items(multi=True)))
+        digest = hashlib.sha1(f'{endpoint}?{args}|{extra}|{versions.etag_for(tables)}'.encode()).hexdigest()
+        return f'resp:{digest}'
+
+
+response_cache = ResponseCache()
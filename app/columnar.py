@@ -0,0 +1,70 @@
+"""Columnar JSON responses for large list endpoints.
+
+Clients opt in with ``?format=columnar`` or ``Accept: application/vnd.claudefinance.columnar+json``.
+Instead of one object per row the payload carries parallel arrays
+(``{"columns": {"id": [...], "date": [...], "amount_cents": [...]}}``), built
+straight from SQL result tuples by the ``columnar_*`` serializers, with money
+as integer cents so no Decimal/float conversion happens per row.
+
+The body is encoded with orjson when it is installed (stdlib json otherwise)
+and compressed with brotli or gzip, per Accept-Encoding, once it is larger
+than COLUMNAR_COMPRESS_MIN_BYTES.
+"""
+import gzip
+import json
+
+from flask import current_app, request
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip is always available
+    brotli = None
+
+
+COLUMNAR_MIMETYPE = 'application/vnd.claudefinance.columnar+json'
+
+
+def wants_columnar():
+    """True if the current request asked for the columnar format"""
+    if request.args.get('format') == 'columnar':
+        return True
+    # Only an explicit mention counts; */* must keep getting the row format
+    return any(value == COLUMNAR_MIMETYPE and quality > 0 for value, quality in request.accept_mimetypes)
+
+
+def encode(payload):
+    """Compact JSON bytes for ``payload``"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+def _content_encoding():
+    """Best compression the client accepts, or None"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def columnar_response(payload, status=200):
+    """Encode ``payload`` and compress it when it is large enough to be worth it"""
+    body = encode(payload)
+    response = current_app.response_class(body, status=status, mimetype=COLUMNAR_MIMETYPE)
+    response.vary.update(('Accept', 'Accept-Encoding'))
+
+    encoding = _content_encoding() if len(body) >= current_app.config['COLUMNAR_COMPRESS_MIN_BYTES'] else None
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=5))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(body, compresslevel=5))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
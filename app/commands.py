@@ -0,0 +1,33 @@
+# app/commands.py
+"""Flask CLI commands (run with `flask <command>`)."""
+import click
+
+from .extensions import db
+
+
+def register_commands(app):
+    @app.cli.command('rebuild-rollup')
+    def rebuild_rollup():
+        """Recompute the category_period_actuals rollup from all transactions."""
+        from . import rollup
+        cells = rollup.rebuild()
+        db.session.commit()
+        click.echo(f'Rebuilt rollup: {cells} category/period cells.')
+
+    @app.cli.command('resume-imports')
+    def resume_imports():
+        """Finish imports cut off by a crash or restart (run while no server is importing)."""
+        from .jobs import ACTIVE_STATUSES, job_runner
+        from .models import ImportJob
+        jobs = ImportJob.query.filter(
+            ImportJob.status.in_(ACTIVE_STATUSES + ('failed',)),
+            ImportJob.filepath.isnot(None)
+        ).order_by(ImportJob.id).all()
+        if not jobs:
+            click.echo('No interrupted imports.')
+        for job in jobs:
+            done = job.chunks_committed or 0
+            # Runs in its own app context and session
+            job_runner.run_import(job.id)
+            db.session.refresh(job)
+            click.echo(f'Job {job.id} ({job.filename}): resumed after {done} chunks, {job.status}.')
@@ -0,0 +1,351 @@
+# app/importer.py
+"""Vectorized bank statement import.
+
+Parses, normalizes, dedupes and inserts a whole statement as a set instead of
+walking the DataFrame row by row. pandas is imported inside the functions that
+use it, so importing this module (and the routes) stays cheap at startup.
+
+Statements are streamed in fixed-size chunks (pandas chunked CSV reader,
+openpyxl read-only rows for XLSX) and each chunk is normalized, deduped,
+categorized, inserted and committed on its own, so memory is bounded by the
+chunk size rather than the file size. The running counters are committed with
+each chunk; ``rows_parsed`` doubles as the resume offset after an interruption.
+
+Duplicates are detected by ``Transaction.dedupe_hash``, a digest of the
+normalized date, description, amount and optional bank reference. The column
+is unique, so rows already stored are skipped by the insert itself
+(ON CONFLICT DO NOTHING) rather than by a lookup beforehand. That also makes
+re-running a chunk after a crash harmless. Rows stored before references were
+hashed (and rows from statements without one) carry the reference-less hash,
+so rows that do have a reference are also checked against that form.
+"""
+import csv
+import hashlib
+import io
+import time
+from datetime import datetime
+
+from sqlalchemy import column, insert, select, table
+
+from . import pay_periods, rollup, rules, versions
+from .extensions import db
+from .money import format_cents
+from .models import Transaction
+
+
+DESCRIPTION_MAX_LENGTH = 255
+DEFAULT_CHUNK_SIZE = 5000
+# Running totals reported after each chunk (ImportJob column names)
+COUNTER_FIELDS = ('rows_parsed', 'rows_inserted', 'rows_duplicate', 'rows_invalid', 'rows_categorized',
+                  'chunks_committed')
+REFERENCE_COLUMNS = {'ref', 'ref #', 'ref no', 'fitid', 'transaction id', 'confirmation number'}
+INSERT_COLUMNS = ['date', 'pay_period_id', 'description', 'amount', 'category_id', 'is_categorized',
+                  'dedupe_hash', 'created_at']
+
+
+class StatementFormatError(ValueError):
+    """Raised when a statement cannot be mapped to Date/Description/Amount."""
+
+
+class PhaseTimer:
+    """Collects wall-clock milliseconds per named import phase."""
+
+    def __init__(self):
+        self.timings = {}
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Add the time since the previous mark to ``phase`` (summed over chunks)"""
+        now = time.perf_counter()
+        self.timings[phase] = round(self.timings.get(phase, 0) + (now - self._last) * 1000, 2)
+        self._last = now
+
+
+def read_statement_chunks(filepath, chunk_size=DEFAULT_CHUNK_SIZE, skip_rows=0):
+    """Yield the statement as DataFrames of at most ``chunk_size`` data rows.
+
+    The first ``skip_rows`` data rows are skipped (the header is kept).
+    """
+    import pandas as pd
+
+    extension = filepath.rsplit('.', 1)[-1].lower()
+    if extension == 'csv':
+        yield from _skip_records(pd.read_csv(filepath, chunksize=chunk_size), skip_rows)
+    elif extension == 'xlsx':
+        yield from _xlsx_chunks(filepath, chunk_size, skip_rows)
+    else:
+        # Legacy .xls has no streaming reader; load it whole and slice
+        df = pd.read_excel(filepath)
+        for start in range(skip_rows, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+
+def _skip_records(chunks, skip_rows):
+    """Drop the first ``skip_rows`` parsed records from a stream of frames.
+
+    Counted in records, like rows_parsed, not file lines: blank lines and
+    quoted multi-line fields make the two differ.
+    """
+    for chunk in chunks:
+        if skip_rows >= len(chunk):
+            skip_rows -= len(chunk)
+            continue
+        yield chunk.iloc[skip_rows:] if skip_rows else chunk
+        skip_rows = 0
+
+
+def _xlsx_chunks(filepath, chunk_size, skip_rows):
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(value) if value is not None else f'column {i}' for i, value in enumerate(header)]
+        width = len(columns)
+        # Blank rows are skipped before counting, so skip_rows lines up on resume
+        data = (row for row in rows if any(value is not None for value in row))
+        for _ in zip(range(skip_rows), data):
+            pass
+        batch = []
+        for row in data:
+            batch.append(tuple(row[:width]) + (None,) * (width - len(row)))
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        workbook.close()
+
+
+def find_columns(columns):
+    """Guess the date, description and amount columns from lower-cased headers"""
+    date_col = next((col for col in columns if 'date' in col), None)
+    desc_col = next((col for col in columns if 'desc' in col or 'merchant' in col or 'name' in col), None)
+    amount_col = next((col for col in columns if 'amount' in col or 'debit' in col or 'credit' in col), None)
+    return date_col, desc_col, amount_col
+
+
+def find_reference_column(columns):
+    """Optional bank reference / transaction id column"""
+    return next((col for col in columns if 'reference' in col or col in REFERENCE_COLUMNS), None)
+
+
+def normalize_frame(df):
+    """Return a frame with typed date/description/amount columns.
+
+    ``amount`` is int64 cents. Rows whose date or amount cannot be parsed are
+    dropped; the number dropped is returned alongside the frame.
+    """
+    import pandas as pd
+
+    df.columns = df.columns.astype(str).str.strip().str.lower()
+    date_col, desc_col, amount_col = find_columns(df.columns)
+    if not all([date_col, desc_col, amount_col]):
+        raise StatementFormatError('Could not identify Date, Description, and Amount columns')
+
+    amounts = df[amount_col]
+    if not pd.api.types.is_numeric_dtype(amounts):
+        amounts = amounts.astype(str).str.replace(r'[$,\s]', '', regex=True)
+
+    reference_col = find_reference_column(df.columns)
+    out = pd.DataFrame({
+        'date': pd.to_datetime(df[date_col], errors='coerce').dt.date,
+        'description': df[desc_col].astype(str).str.slice(0, DESCRIPTION_MAX_LENGTH),
+        'amount': (pd.to_numeric(amounts, errors='coerce') * 100).round(),
+        'reference': df[reference_col].astype('string').str.strip().fillna('') if reference_col else '',
+    })
+    valid = out['date'].notna() & out['amount'].notna()
+    out = out[valid].reset_index(drop=True)
+    out['amount'] = out['amount'].astype('int64')
+    return out, int((~valid).sum())
+
+
+def normalize_description(description):
+    """Case- and whitespace-insensitive form of a description"""
+    return ' '.join(description.split()).lower()
+
+
+def dedupe_hash(trans_date, description, amount, reference=''):
+    """Hex SHA-256 of the normalized duplicate-detection fields (``amount`` in cents)"""
+    key = '\x1f'.join([
+        trans_date.isoformat(),
+        normalize_description(description),
+        format_cents(int(amount)),
+        (reference or '').strip(),
+    ])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def add_dedupe_hashes(frame):
+    """Hash every row and drop repeats within the statement (first one wins)"""
+    frame = frame.assign(dedupe_hash=[
+        dedupe_hash(d, desc, amt, ref) for d, desc, amt, ref in
+        zip(frame['date'], frame['description'], frame['amount'], frame['reference'])
+    ])
+    return frame.drop_duplicates(subset=['dedupe_hash'])
+
+
+def drop_stored_without_reference(frame):
+    """Drop rows with a reference whose reference-less hash is already stored.
+
+    The dedupe_hash migration backfilled existing rows with an empty
+    reference, so without this a statement that exports references would
+    re-insert every transaction it shares with them. One lookup per chunk.
+    """
+    referenced = frame[frame['reference'] != '']
+    if referenced.empty:
+        return frame
+    bare = [dedupe_hash(d, desc, amt) for d, desc, amt in
+            zip(referenced['date'], referenced['description'], referenced['amount'])]
+    stored = {h for (h,) in db.session.query(Transaction.dedupe_hash).filter(
+        Transaction.dedupe_hash.in_(set(bare))
+    )}
+    if not stored:
+        return frame
+    return frame.drop(index=[i for i, h in zip(referenced.index, bare) if h in stored])
+
+
+def categorize_frame(frame):
+    """Assign category_id from the compiled active rules"""
+    import pandas as pd
+
+    return pd.Series(rules.categorize(frame['description']), index=frame.index, dtype=object)
+
+
+def bulk_insert(records):
+    """Insert transaction dicts, skipping any whose dedupe_hash already exists.
+
+    One INSERT ... ON CONFLICT DO NOTHING statement (fed by COPY into a staging
+    table on PostgreSQL). Returns (date, category_id) of the inserted rows.
+    """
+    if not records:
+        return []
+    connection = db.session.connection()
+    name = connection.dialect.name
+    if name == 'postgresql':
+        inserted = _copy_transactions(connection, records)
+    elif name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        stmt = sqlite_insert(Transaction).on_conflict_do_nothing(index_elements=['dedupe_hash'])
+        inserted = connection.execute(stmt.returning(Transaction.date, Transaction.category_id), records).all()
+    else:
+        existing = {h for (h,) in db.session.query(Transaction.dedupe_hash).filter(
+            Transaction.dedupe_hash.in_([r['dedupe_hash'] for r in records])
+        )}
+        records = [r for r in records if r['dedupe_hash'] not in existing]
+        if records:
+            connection.execute(insert(Transaction), records)
+        inserted = [(r['date'], r['category_id']) for r in records]
+    # Core statements on the connection bypass the ORM events that maintain table_versions
+    versions.touch(Transaction.__tablename__)
+    return [tuple(row) for row in inserted]
+
+
+def _copy_transactions(connection, records):
+    """COPY into a staging table, then move new rows over in one INSERT ... SELECT"""
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    staging = 'transactions_import'
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {', '.join(INSERT_COLUMNS)} FROM {Transaction.__tablename__} WITH NO DATA"
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            writer.writerow([
+                '' if record[col] is None else record[col]
+                for col in INSERT_COLUMNS
+            ])
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {staging} ({', '.join(INSERT_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv, NULL '')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+    source = table(staging, *[column(c) for c in INSERT_COLUMNS])
+    stmt = pg_insert(Transaction).from_select(
+        INSERT_COLUMNS, select(*source.c)
+    ).on_conflict_do_nothing(index_elements=['dedupe_hash']).returning(
+        Transaction.date, Transaction.category_id
+    )
+    inserted = connection.execute(stmt).all()
+    # Only on success: after a failed statement PostgreSQL rejects everything
+    # until rollback, and ON COMMIT DROP cleans up either way
+    connection.exec_driver_sql(f'DROP TABLE {staging}')
+    return inserted
+
+
+def import_statement(filepath, progress=None, chunk_size=DEFAULT_CHUNK_SIZE, resume=None):
+    """Run the chunked import pipeline and return a summary dict.
+
+    ``progress``, if given, is called with the running COUNTER_FIELDS totals
+    after each chunk, before that chunk is committed (so a caller persisting
+    them commits both together). ``resume`` holds the totals of an
+    interrupted run; its rows_parsed rows are skipped and counting continues.
+    """
+    report = progress or (lambda **counts: None)
+    timer = PhaseTimer()
+    totals = dict.fromkeys(COUNTER_FIELDS, 0)
+    totals.update({field: (resume or {}).get(field) or 0 for field in COUNTER_FIELDS})
+    period_index = pay_periods.get_index()
+
+    for df in read_statement_chunks(filepath, chunk_size, skip_rows=totals['rows_parsed']):
+        timer.mark('parse')
+
+        frame, invalid_count = normalize_frame(df)
+        timer.mark('normalize')
+
+        new_rows = drop_stored_without_reference(add_dedupe_hashes(frame))
+        timer.mark('dedupe')
+
+        category_ids = categorize_frame(new_rows)
+        timer.mark('categorize')
+
+        now = datetime.utcnow()
+        records = [{
+            'date': trans_date,
+            'pay_period_id': period_index.resolve(trans_date),
+            'description': description,
+            'amount': int(amount),
+            'category_id': None if category_id is None else int(category_id),
+            'is_categorized': category_id is not None,
+            'dedupe_hash': row_hash,
+            'created_at': now,
+        } for trans_date, description, amount, category_id, row_hash in zip(
+            new_rows['date'], new_rows['description'], new_rows['amount'], category_ids, new_rows['dedupe_hash']
+        )]
+        inserted = bulk_insert(records)
+        rollup.refresh_transactions(inserted)
+
+        # Repeats within the file and rows already stored both count as duplicates
+        totals['rows_parsed'] += len(df)
+        totals['rows_inserted'] += len(inserted)
+        totals['rows_duplicate'] += len(frame) - len(inserted)
+        totals['rows_invalid'] += invalid_count
+        totals['rows_categorized'] += sum(1 for _, category_id in inserted if category_id is not None)
+        totals['chunks_committed'] += 1
+        report(**totals)
+        db.session.commit()
+        timer.mark('insert')
+
+    return {
+        'parsed': totals['rows_parsed'],
+        'imported': totals['rows_inserted'],
+        'auto_categorized': totals['rows_categorized'],
+        'skipped_duplicates': totals['rows_duplicate'],
+        'skipped_invalid': totals['rows_invalid'],
+        'chunks': totals['chunks_committed'],
+        'timings_ms': timer.timings,
+        'message': f"Imported {totals['rows_inserted']} transactions ({totals['rows_categorized']} auto-categorized)"
+    }
@@ -0,0 +1,184 @@
+# app/jobs.py
+"""Background job runner for long-running statement imports.
+
+Jobs are persisted in the ``import_jobs`` table so their progress can be
+polled from any worker, and executed on a small per-process thread pool. The
+pool size bounds how many imports (and therefore DB connections) run at once.
+
+Imports commit chunk by chunk together with the job's counters. A job that
+fails or is cut off keeps its upload, and re-running it continues after the
+last committed chunk (``resume_import`` / ``flask resume-imports``).
+
+Each runner stamps ``heartbeat_at`` on the jobs it holds (queued or running)
+every IMPORT_HEARTBEAT_SECONDS. A worker that exits, e.g. a routine gunicorn
+``max_requests`` restart, stops stamping; once a job's heartbeat is older than
+IMPORT_STALE_SECONDS it is marked failed, so it no longer counts against
+IMPORT_MAX_PENDING and can be resumed like any other failed import.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from .extensions import db
+from .importer import COUNTER_FIELDS, StatementFormatError, import_statement
+from .models import ImportJob
+
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when too many imports are already queued or running."""
+
+
+class JobRunner:
+    """Thread-pool executor bound to a Flask app"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.executor = None
+        self._held = set()
+        self._lock = threading.Lock()
+        self._heartbeat = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('IMPORT_MAX_WORKERS', 2)
+        app.config.setdefault('IMPORT_MAX_PENDING', 10)
+        app.config.setdefault('IMPORT_CHUNK_SIZE', 5000)
+        app.config.setdefault('IMPORT_HEARTBEAT_SECONDS', 30)
+        app.config.setdefault('IMPORT_STALE_SECONDS', 300)
+        self.app = app
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config['IMPORT_MAX_WORKERS'],
+            thread_name_prefix='import-job'
+        )
+        app.extensions['job_runner'] = self
+
+    def submit_import(self, filename, filepath):
+        """Create a queued ImportJob for ``filepath`` and schedule it"""
+        self.reclaim_stale()
+        pending = ImportJob.query.filter(ImportJob.status.in_(ACTIVE_STATUSES)).count()
+        if pending >= self.app.config['IMPORT_MAX_PENDING']:
+            raise JobQueueFull('Too many imports in progress, try again shortly')
+
+        job = ImportJob(filename=filename, filepath=filepath, status='queued', heartbeat_at=datetime.utcnow())
+        db.session.add(job)
+        db.session.commit()
+        self._schedule(job.id)
+        return job
+
+    def resume_import(self, job):
+        """Re-queue a failed import; it continues after its last committed chunk"""
+        job.status = 'queued'
+        job.error = None
+        job.finished_at = None
+        job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+        self._schedule(job.id)
+        return job
+
+    def reclaim_stale(self):
+        """Mark queued/running jobs whose owner stopped heartbeating as failed.
+
+        Returns the number of jobs reclaimed.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.app.config['IMPORT_STALE_SECONDS'])
+        with self._lock:
+            held = list(self._held)
+        reclaimed = ImportJob.query.filter(
+            ImportJob.status.in_(ACTIVE_STATUSES),
+            # Jobs from before heartbeats were recorded fall back to created_at
+            db.func.coalesce(ImportJob.heartbeat_at, ImportJob.created_at) < cutoff,
+            ImportJob.id.notin_(held)
+        ).update({
+            'status': 'failed',
+            'error': 'Import was interrupted (its worker stopped); resume it to continue',
+            'finished_at': datetime.utcnow(),
+        }, synchronize_session=False)
+        if reclaimed:
+            db.session.commit()
+        return reclaimed
+
+    def _schedule(self, job_id):
+        self._hold(job_id)
+        self.executor.submit(self.run_import, job_id)
+
+    def _hold(self, job_id):
+        with self._lock:
+            self._held.add(job_id)
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._beat, name='import-job-heartbeat', daemon=True)
+                self._heartbeat.start()
+
+    def _release(self, job_id):
+        with self._lock:
+            self._held.discard(job_id)
+
+    def _beat(self):
+        """Refresh heartbeat_at on every job this process holds, forever"""
+        while True:
+            time.sleep(self.app.config['IMPORT_HEARTBEAT_SECONDS'])
+            with self._lock:
+                held = list(self._held)
+            if not held:
+                continue
+            with self.app.app_context():
+                try:
+                    ImportJob.query.filter(
+                        ImportJob.id.in_(held), ImportJob.status.in_(ACTIVE_STATUSES)
+                    ).update({'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+                    db.session.commit()
+                except Exception:
+                    # Try again next beat; a missed one only matters after IMPORT_STALE_SECONDS
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+    def run_import(self, job_id):
+        """Execute (or continue) an import job in the calling thread"""
+        self._hold(job_id)
+        with self.app.app_context():
+            job = db.session.get(ImportJob, job_id)
+            filepath = job.filepath
+            job.status = 'running'
+            job.started_at = job.started_at or datetime.utcnow()
+            job.heartbeat_at = datetime.utcnow()
+            job.error = None
+            db.session.commit()
+
+            def progress(**counts):
+                # Committed by the importer together with the chunk itself
+                for field, value in counts.items():
+                    setattr(job, field, value)
+
+            discard_file = True
+            try:
+                summary = import_statement(
+                    filepath, progress=progress, chunk_size=self.app.config['IMPORT_CHUNK_SIZE'],
+                    resume={field: getattr(job, field) for field in COUNTER_FIELDS}
+                )
+                job.timings = summary['timings_ms']
+                job.status = 'completed'
+            except Exception as e:
+                db.session.rollback()
+                job = db.session.get(ImportJob, job_id)
+                job.status = 'failed'
+                job.error = str(e)
+                # Keep the upload so the import can resume, unless the file itself is unusable
+                discard_file = isinstance(e, (StatementFormatError, FileNotFoundError))
+            finally:
+                job.finished_at = datetime.utcnow()
+                if discard_file:
+                    job.filepath = None
+                db.session.commit()
+                db.session.remove()
+                self._release(job_id)
+                if discard_file and filepath and os.path.exists(filepath):
+                    os.remove(filepath)
+
+
+job_runner = JobRunner()
@@ -1,6 +1,7 @@
 # Marker for Grok 3-1-2026 08:28am
 #from app import db
 from .extensions import db
+from .money import Cents, to_dollars
 from datetime import datetime
 from sqlalchemy import CheckConstraint
 
@@ -62,6 +63,8 @@ class BudgetCategory(db.Model):
     
     __table_args__ = (
         CheckConstraint(category_type.in_(['expense', 'income']), name='valid_category_type'),
+        # Active-category listings filter on is_active and sort by type, then sort_order
+        db.Index('ix_budget_categories_active_type_sort', 'is_active', 'category_type', 'sort_order'),
     )
     
     def to_dict(self):
@@ -90,6 +93,10 @@ class PayPeriod(db.Model):
     
     planned_amounts = db.relationship('PlannedAmount', back_populates='pay_period', cascade='all, delete-orphan')
     
+    __table_args__ = (
+        db.Index('ix_pay_periods_end_date', 'end_date'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -105,7 +112,7 @@ class PlannedAmount(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     category_id = db.Column(db.Integer, db.ForeignKey('budget_categories.id'), nullable=False)
     pay_period_id = db.Column(db.Integer, db.ForeignKey('pay_periods.id'), nullable=False)
-    amount = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    amount = db.Column(Cents, nullable=False, default=0)
     is_cleared = db.Column(db.Boolean, default=False)
     due_date = db.Column(db.Date, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -116,6 +123,8 @@ class PlannedAmount(db.Model):
     
     __table_args__ = (
         db.UniqueConstraint('category_id', 'pay_period_id', name='unique_category_period'),
+        # The unique constraint leads with category_id; grid and period deletes look up by period
+        db.Index('ix_planned_amounts_pay_period_id', 'pay_period_id'),
     )
     
     def to_dict(self):
@@ -124,7 +133,7 @@ class PlannedAmount(db.Model):
             'category_id': self.category_id,
             'category_name': self.category.name,
             'pay_period_id': self.pay_period_id,
-            'amount': float(self.amount),
+            'amount': to_dollars(self.amount),
             'is_cleared': self.is_cleared,
             'due_date': self.due_date.isoformat() if self.due_date else None
         }
@@ -137,26 +146,40 @@ class Transaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     description = db.Column(db.String(255), nullable=False)
-    amount = db.Column(db.Numeric(10, 2), nullable=False)
+    amount = db.Column(Cents, nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('budget_categories.id'), nullable=True)
     is_categorized = db.Column(db.Boolean, default=False)
     matched_planned_id = db.Column(db.Integer, db.ForeignKey('planned_amounts.id'), nullable=True)
+    pay_period_id = db.Column(db.Integer, db.ForeignKey('pay_periods.id'), nullable=True)  # resolved from date
+    dedupe_hash = db.Column(db.String(64), nullable=True)  # set by statement imports (and backfilled for note-less pre-hash rows), NULL for manual entries
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     category = db.relationship('BudgetCategory', back_populates='transactions')
     matched_planned = db.relationship('PlannedAmount', foreign_keys=[matched_planned_id])
     
+    __table_args__ = (
+        # Keyset pagination on (date, id), optionally narrowed by category
+        db.Index('ix_transactions_date_id', 'date', 'id'),
+        db.Index('ix_transactions_category_date_id', 'category_id', 'date', 'id'),
+        # Rollup refresh groups by (category, period) within periods; covers amount
+        db.Index('ix_transactions_period_category_amount', 'pay_period_id', 'category_id', 'amount'),
+        # Re-imported statement rows conflict here and are skipped (see app.importer)
+        db.UniqueConstraint('dedupe_hash', name='unique_transaction_dedupe_hash'),
+        db.Index('ix_transactions_matched_planned_id', 'matched_planned_id'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
             'date': self.date.isoformat(),
             'description': self.description,
-            'amount': float(self.amount),
+            'amount': to_dollars(self.amount),
             'category_id': self.category_id,
             'category_name': self.category.name if self.category else None,
             'is_categorized': self.is_categorized,
             'matched_planned_id': self.matched_planned_id,
+            'pay_period_id': self.pay_period_id,
             'notes': self.notes
         }
 
@@ -190,7 +213,7 @@ class RecurringTemplate(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('budget_categories.id'), nullable=False)
-    amount = db.Column(db.Numeric(10, 2), nullable=False)
+    amount = db.Column(Cents, nullable=False)
     frequency = db.Column(db.String(20), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -203,10 +226,87 @@ class RecurringTemplate(db.Model):
             'name': self.name,
             'category_id': self.category_id,
             'category_name': self.category.name,
-            'amount': float(self.amount),
+            'amount': to_dollars(self.amount),
             'frequency': self.frequency,
             'is_active': self.is_active
         }
+
+
+class CategoryPeriodActual(db.Model):
+    """Rollup of actual transaction totals per (category, pay period).
+
+    Maintained incrementally by app.rollup; category_id is NULL for the
+    uncategorized bucket.
+    """
+    __tablename__ = 'category_period_actuals'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('budget_categories.id'), nullable=True)
+    pay_period_id = db.Column(db.Integer, db.ForeignKey('pay_periods.id', ondelete='CASCADE'), nullable=False)
+    spent = db.Column(Cents, nullable=False, default=0)  # sum of negative amounts
+    received = db.Column(Cents, nullable=False, default=0)  # sum of positive amounts
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('category_id', 'pay_period_id', name='unique_actual_category_period'),
+        db.Index('ix_category_period_actuals_pay_period_id', 'pay_period_id'),
+    )
+
+
+class TableVersion(db.Model):
+    """Per-table change counters, bumped on every commit that writes the table.
+
+    Used to derive cheap ETags for reference-data responses (see app.versions).
+    """
+    __tablename__ = 'table_versions'
+    
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class ImportJob(db.Model):
+    """Background statement import jobs and their progress counters"""
+    __tablename__ = 'import_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    filename = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    rows_parsed = db.Column(db.Integer, default=0)
+    rows_inserted = db.Column(db.Integer, default=0)
+    rows_duplicate = db.Column(db.Integer, default=0)
+    rows_invalid = db.Column(db.Integer, default=0)
+    rows_categorized = db.Column(db.Integer, default=0)
+    chunks_committed = db.Column(db.Integer, default=0)
+    filepath = db.Column(db.String(512), nullable=True)  # kept until completion so the import can resume
+    timings = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # refreshed by the owning worker while queued/running
+    
+    __table_args__ = (
+        CheckConstraint(status.in_(['queued', 'running', 'completed', 'failed']), name='valid_job_status'),
+    )
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'rows_parsed': self.rows_parsed,
+            'rows_inserted': self.rows_inserted,
+            'rows_duplicate': self.rows_duplicate,
+            'rows_invalid': self.rows_invalid,
+            'rows_categorized': self.rows_categorized,
+            'chunks_committed': self.chunks_committed,
+            'timings_ms': self.timings,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
     
 # ────────────────────────────────────────────────
 # IMPORTANT: Force mapper configuration after all classes are defined
@@ -0,0 +1,54 @@
+# app/money.py
+"""Money as integer cents.
+
+Every amount column (transactions, planned amounts, recurring templates and
+the rollup) is a ``Cents`` column: BIGINT in the database and a plain ``int``
+on the model, so sums, comparisons and differences are exact and cost integer
+arithmetic instead of ``Decimal``. The API still speaks dollars; convert at
+the edges with ``to_cents`` (request values) and ``to_dollars`` (responses).
+"""
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+
+CENT = Decimal('0.01')
+
+
+class Cents(TypeDecorator):
+    """BIGINT column holding an amount in cents, loaded as ``int``"""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else int(value)
+
+    def process_result_value(self, value, dialect):
+        # SUM() over BIGINT comes back as NUMERIC on PostgreSQL
+        return None if value is None else int(value)
+
+
+def to_cents(value):
+    """Exact cents for a dollar amount given as str, int, float or Decimal.
+
+    Raises ValueError for anything that isn't a finite number.
+    """
+    try:
+        dollars = Decimal(str(value).strip().replace('$', '').replace(',', ''))
+        return int(dollars.quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+    except (InvalidOperation, ValueError, TypeError):
+        raise ValueError(f'Invalid amount: {value!r}')
+
+
+def to_dollars(cents):
+    """JSON-ready dollars for an amount in cents (None stays None)"""
+    return None if cents is None else cents / 100
+
+
+def format_cents(cents):
+    """'-12.34'-style fixed two-decimal string, without going through floats"""
+    sign = '-' if cents < 0 else ''
+    whole, fraction = divmod(abs(cents), 100)
+    return f'{sign}{whole}.{fraction:02d}'
@@ -0,0 +1,107 @@
+# app/pay_periods.py
+"""Shared date -> pay period resolution.
+
+Pay periods are loaded once into sorted start/end arrays and looked up with
+bisect, so resolving a date (or a whole batch of dates) never scans the
+pay_periods table. The index is cached per process, keyed by a cheap
+fingerprint so periods added by another worker are picked up, and is
+invalidated explicitly when /api/pay-periods changes.
+"""
+import threading
+from bisect import bisect_right
+
+from sqlalchemy import func, select, update
+
+from .extensions import db
+from .models import PayPeriod, Transaction
+
+
+class PayPeriodIndex:
+    """Immutable sorted interval index over (start_date, end_date, id)"""
+
+    def __init__(self, periods):
+        periods = sorted(periods, key=lambda p: p[0])
+        self.starts = [p[0] for p in periods]
+        self.ends = [p[1] for p in periods]
+        self.ids = [p[2] for p in periods]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resolve(self, day):
+        """Return the id of the pay period containing ``day``, or None"""
+        i = bisect_right(self.starts, day) - 1
+        if i >= 0 and day <= self.ends[i]:
+            return self.ids[i]
+        return None
+
+    def resolve_many(self, days):
+        """Resolve a batch of dates; returns a list of period ids (or None)"""
+        return [self.resolve(day) for day in days]
+
+    def overlapping(self, start_date, end_date):
+        """Ids of periods that overlap [start_date, end_date]"""
+        lo = max(bisect_right(self.starts, start_date) - 1, 0)
+        hi = bisect_right(self.starts, end_date)
+        return [self.ids[i] for i in range(lo, hi) if self.ends[i] >= start_date]
+
+
+_lock = threading.Lock()
+_cached = None  # (fingerprint, PayPeriodIndex)
+
+
+def _fingerprint():
+    return tuple(db.session.query(
+        func.count(PayPeriod.id), func.max(PayPeriod.id), func.max(PayPeriod.end_date)
+    ).one())
+
+
+def get_index():
+    """Return the process-wide pay period index, rebuilding it if periods changed"""
+    global _cached
+    fingerprint = _fingerprint()
+    cached = _cached
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    with _lock:
+        if _cached is not None and _cached[0] == fingerprint:
+            return _cached[1]
+        periods = db.session.query(PayPeriod.start_date, PayPeriod.end_date, PayPeriod.id).all()
+        index = PayPeriodIndex(periods)
+        _cached = (fingerprint, index)
+        return index
+
+
+def invalidate():
+    """Drop the cached index; called whenever pay periods are created"""
+    global _cached
+    with _lock:
+        _cached = None
+
+
+def resolve(day):
+    """Pay period id for one date"""
+    return get_index().resolve(day)
+
+
+def resolve_many(days):
+    """Pay period ids for a batch of dates"""
+    return get_index().resolve_many(days)
+
+
+def assign_transactions(start_date, end_date):
+    """Store the resolved pay_period_id on transactions dated in [start_date, end_date].
+
+    One UPDATE with a correlated lookup; used after pay periods are created.
+    """
+    period_id = select(PayPeriod.id).where(
+        PayPeriod.start_date <= Transaction.date,
+        PayPeriod.end_date >= Transaction.date
+    ).order_by(PayPeriod.start_date.desc()).limit(1).scalar_subquery()
+    db.session.execute(
+        update(Transaction).where(
+            Transaction.date >= start_date,
+            Transaction.date <= end_date
+        ).values(pay_period_id=period_id).execution_options(synchronize_session=False)
+    )
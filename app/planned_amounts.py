@@ -0,0 +1,148 @@
+# app/planned_amounts.py
+"""Set-based writes for PlannedAmount rows.
+
+Writes lean on the ``unique_category_period`` constraint: PostgreSQL and
+SQLite get a native ``INSERT ... ON CONFLICT``; any other backend falls back to
+one lookup of the existing keys followed by plain inserts/updates.
+"""
+from datetime import datetime
+
+from sqlalchemy import exists, insert, literal, update, tuple_
+
+from .extensions import db
+from .models import PayPeriod, PlannedAmount, RecurringTemplate
+
+
+CONFLICT_KEYS = ['category_id', 'pay_period_id']
+
+
+def _dialect_insert():
+    """Return the dialect's insert() if it supports ON CONFLICT, else None"""
+    name = db.session.connection().dialect.name
+    if name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert
+    if name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert
+    return None
+
+
+def _insert_ignoring_conflicts():
+    """INSERT that skips rows whose (category_id, pay_period_id) is already taken"""
+    dialect_insert = _dialect_insert()
+    if dialect_insert is None:
+        return insert(PlannedAmount)
+    return dialect_insert(PlannedAmount).on_conflict_do_nothing(index_elements=CONFLICT_KEYS)
+
+
+def existing_keys(pairs):
+    """Subset of (category_id, pay_period_id) pairs that already have a row"""
+    if not pairs:
+        return set()
+    rows = db.session.query(PlannedAmount.category_id, PlannedAmount.pay_period_id).filter(
+        tuple_(PlannedAmount.category_id, PlannedAmount.pay_period_id).in_(list(pairs))
+    ).all()
+    return {(r.category_id, r.pay_period_id) for r in rows}
+
+
+def upsert_planned_amounts(rows):
+    """Insert or update planned amounts keyed on (category_id, pay_period_id).
+
+    Each row needs category_id, pay_period_id and amount; due_date and
+    is_cleared are only written when present in the row. Rows are grouped by
+    which optional fields they carry so each group is a single statement.
+    """
+    now = datetime.utcnow()
+    groups = {}
+    for row in rows:
+        fields = tuple(f for f in ('due_date', 'is_cleared') if f in row)
+        groups.setdefault(fields, []).append(row)
+
+    dialect_insert = _dialect_insert()
+    for fields, group in groups.items():
+        values = [dict(row, created_at=now, updated_at=now) for row in group]
+        if dialect_insert is not None:
+            stmt = dialect_insert(PlannedAmount)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=CONFLICT_KEYS,
+                set_={name: stmt.excluded[name] for name in ('amount', 'updated_at') + fields}
+            )
+            db.session.execute(stmt, values)
+        else:
+            _upsert_fallback(values, ('amount', 'updated_at') + fields)
+
+
+def _upsert_fallback(values, update_fields):
+    found = existing_keys({(v['category_id'], v['pay_period_id']) for v in values})
+    new_rows = [v for v in values if (v['category_id'], v['pay_period_id']) not in found]
+    if new_rows:
+        db.session.execute(insert(PlannedAmount), new_rows)
+    for v in values:
+        if (v['category_id'], v['pay_period_id']) in found:
+            db.session.execute(
+                update(PlannedAmount).where(
+                    PlannedAmount.category_id == v['category_id'],
+                    PlannedAmount.pay_period_id == v['pay_period_id']
+                ).values({name: v[name] for name in update_fields})
+            )
+
+
+
+def insert_missing_planned_amounts(rows):
+    """Insert rows whose (category_id, pay_period_id) has no planned amount yet.
+
+    Existing keys are looked up in one query and the remaining rows go in as a
+    single INSERT (ON CONFLICT DO NOTHING where supported, in case a concurrent
+    writer wins the race). Returns the rows that were inserted.
+    """
+    if not rows:
+        return []
+    found = existing_keys({(r['category_id'], r['pay_period_id']) for r in rows})
+    new_rows = [r for r in rows if (r['category_id'], r['pay_period_id']) not in found]
+    if not new_rows:
+        return []
+
+    now = datetime.utcnow()
+    values = [dict(row, created_at=now, updated_at=now) for row in new_rows]
+    db.session.execute(_insert_ignoring_conflicts(), values)
+    return new_rows
+
+
+def apply_recurring_templates(template_filter, period_filter):
+    """Create planned amounts for every template x pay period pair that has none.
+
+    ``template_filter`` / ``period_filter`` are WHERE clauses on
+    RecurringTemplate / PayPeriod. The missing pairs come from one anti-join
+    and are inserted in a single statement; when two templates share a
+    category the lower template id wins the cell. Returns {template_id: count}.
+    """
+    missing = db.session.query(
+        RecurringTemplate.id.label('template_id'),
+        RecurringTemplate.category_id,
+        PayPeriod.id.label('pay_period_id'),
+        RecurringTemplate.amount
+    ).join(PayPeriod, literal(True)).filter(
+        template_filter,
+        period_filter,
+        ~exists().where(
+            PlannedAmount.category_id == RecurringTemplate.category_id,
+            PlannedAmount.pay_period_id == PayPeriod.id
+        )
+    ).order_by(RecurringTemplate.id, PayPeriod.start_date).all()
+
+    counts = {}
+    rows = {}
+    for m in missing:
+        counts.setdefault(m.template_id, 0)
+        key = (m.category_id, m.pay_period_id)
+        if key in rows:
+            continue
+        rows[key] = {'category_id': m.category_id, 'pay_period_id': m.pay_period_id, 'amount': m.amount}
+        counts[m.template_id] += 1
+
+    if rows:
+        now = datetime.utcnow()
+        values = [dict(row, created_at=now, updated_at=now) for row in rows.values()]
+        db.session.execute(_insert_ignoring_conflicts(), values)
+    return counts
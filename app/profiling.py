@@ -0,0 +1,193 @@
+"""Opt-in request instrumentation (PROFILING_ENABLED / ENABLE_PROFILING=1).
+
+Every request gets a ``Server-Timing`` header splitting its wall time into
+SQL (cursor execution, from engine events), JSON encoding (timed inside the
+app's JSON provider) and the remaining Python work in the handler (ORM row
+hydration, to_dict/serializers, business logic). Statements slower than
+SLOW_QUERY_MS are logged with their text. Per-route latency histograms are
+kept in process memory and served by /api/_metrics.
+
+A single request can be profiled with cProfile by sending ``X-Profile: 1``
+or ``?_profile=1``; the stats are written to PROFILE_DIR and the file name is
+returned in the ``X-Profile-File`` header. Only one request per process can be
+profiled at a time; others asking for a profile get a 409.
+"""
+import cProfile
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from flask import g, has_app_context, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that adds its encoding time to the request's counters"""
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            stats = _request_stats()
+            if stats is not None:
+                stats['json_ms'] += (time.perf_counter() - started) * 1000
+
+
+def _request_stats():
+    return g.get('profiling') if has_app_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('profiling_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['profiling_started'].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats = _request_stats()
+    if stats is not None:
+        stats['sql_count'] += 1
+        stats['sql_ms'] += elapsed_ms
+    if elapsed_ms >= profiler.slow_query_ms:
+        logger.warning('Slow query (%.1f ms)%s: %s', elapsed_ms,
+                       f' during {request.method} {request.path}' if stats is not None else '',
+                       ' '.join(statement.split())[:2000])
+
+
+def _handle_error(context):
+    # Failed statements never reach after_cursor_execute; drop their start time
+    started = context.connection.info.get('profiling_started') if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+class RouteHistogram:
+    """Latency histogram plus SQL totals for one route"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, total_ms, sql_count, sql_ms):
+        self.count += 1
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        self.sql_count += sql_count
+        self.sql_ms += sql_ms
+        self.buckets[next((i for i, bound in enumerate(BUCKETS_MS) if total_ms <= bound), len(BUCKETS_MS))] += 1
+
+    def to_dict(self):
+        labels = [f'le_{bound}' for bound in BUCKETS_MS] + ['gt_%d' % BUCKETS_MS[-1]]
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else None,
+            'max_ms': round(self.max_ms, 3),
+            'sql_queries_per_request': round(self.sql_count / self.count, 2) if self.count else None,
+            'sql_ms_per_request': round(self.sql_ms / self.count, 3) if self.count else None,
+            'buckets_ms': dict(zip(labels, self.buckets))
+        }
+
+
+class Profiler:
+    """Request timing, SQL counters, histograms and cProfile capture for a Flask app"""
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.slow_query_ms = float('inf')
+        self.profile_dir = None
+        self._lock = threading.Lock()
+        # cProfile allows one active profiler per process (Python 3.12+ raises otherwise)
+        self._profile_lock = threading.Lock()
+        self._routes = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILING_ENABLED', False)
+        app.config.setdefault('SLOW_QUERY_MS', 200)
+        app.config.setdefault('PROFILE_DIR', '/tmp/claudefinance-profiles')
+        app.extensions['profiler'] = self
+        self.enabled = app.config['PROFILING_ENABLED']
+        if not self.enabled:
+            return
+
+        self.slow_query_ms = app.config['SLOW_QUERY_MS']
+        self.profile_dir = app.config['PROFILE_DIR']
+        app.json = TimedJSONProvider(app)
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._stop_profile)
+
+    def _start_request(self):
+        g.profiling = {'started': time.perf_counter(), 'sql_count': 0, 'sql_ms': 0.0, 'json_ms': 0.0}
+        if request.headers.get('X-Profile') == '1' or request.args.get('_profile') == '1':
+            if not self._profile_lock.acquire(blocking=False):
+                return jsonify({'error': 'Another request is being profiled, try again shortly'}), 409
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    def _finish_request(self, response):
+        stats = g.pop('profiling', None)
+        if stats is None:
+            return response
+        capture = self._stop_profile()
+        if capture is not None:
+            response.headers['X-Profile-File'] = self._save_profile(capture)
+
+        total_ms = (time.perf_counter() - stats['started']) * 1000
+        app_ms = max(total_ms - stats['sql_ms'] - stats['json_ms'], 0)
+        response.headers.add('Server-Timing', ', '.join([
+            f'sql;dur={stats["sql_ms"]:.2f};desc="{stats["sql_count"]} queries"',
+            f'app;dur={app_ms:.2f};desc="handler, ORM, serialization"',
+            f'json;dur={stats["json_ms"]:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ]))
+
+        route = f'{request.method} {request.url_rule.rule if request.url_rule else "<unmatched>"}'
+        with self._lock:
+            self._routes.setdefault(route, RouteHistogram()).add(total_ms, stats['sql_count'], stats['sql_ms'])
+        return response
+
+    def _stop_profile(self, exc=None):
+        """Disable this request's profiler, if any, and let the next request profile"""
+        capture = g.pop('profiler', None)
+        if capture is not None:
+            capture.disable()
+            self._profile_lock.release()
+        return capture
+
+    def _save_profile(self, capture):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        endpoint = (request.endpoint or 'unmatched').replace('.', '_')
+        path = os.path.join(self.profile_dir, f'{datetime.utcnow():%Y%m%dT%H%M%S%f}_{endpoint}.prof')
+        capture.dump_stats(path)
+        logger.info('Profiled %s %s -> %s (inspect with python -m pstats)', request.method, request.path, path)
+        return os.path.basename(path)
+
+    def snapshot(self):
+        """Aggregated per-route metrics for this process"""
+        with self._lock:
+            routes = {route: histogram.to_dict() for route, histogram in sorted(self._routes.items())}
+        return {'enabled': self.enabled, 'slow_query_ms': self.slow_query_ms, 'routes': routes}
+
+
+profiler = Profiler()
@@ -0,0 +1,77 @@
+# app/recurrence.py
+"""Due-date arithmetic for recurring expenses.
+
+Works on (start_date, end_date, id) pay period tuples sorted by start date
+(e.g. from app.pay_periods.get_index()) and never walks calendars day by day.
+"""
+import calendar
+from bisect import bisect_right
+from datetime import date, timedelta
+
+
+# Months between due dates for the calendar-based frequencies
+MONTH_STEPS = {
+    'monthly': 1,
+    'bimonthly': 2,
+    'quarterly': 3,
+}
+FREQUENCIES = tuple(MONTH_STEPS) + ('everyperiod',)
+
+
+def clamp_day(year, month, day):
+    """Date for ``day`` in the given month, clamped to the month's last day (e.g. 31 -> Feb 28)"""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def _month_index(d):
+    return d.year * 12 + d.month - 1
+
+
+def monthly_due_dates(due_day, first, last, step=1, anchor=None):
+    """Due dates every ``step`` months within [first, last].
+
+    ``anchor`` is a date whose month is a due month (defaults to ``first``).
+    """
+    anchor_index = _month_index(anchor or first)
+    index = _month_index(first)
+    # Move forward to the first due month on the anchor's cadence
+    index += (anchor_index - index) % step
+    dates = []
+    while index <= _month_index(last):
+        due = clamp_day(index // 12, index % 12 + 1, due_day)
+        if first <= due <= last:
+            dates.append(due)
+        index += step
+    return dates
+
+
+def schedule(frequency, due_day, periods, anchor=None, start_date=None):
+    """Return [(pay_period_id, due_date)] for the periods that have a due date.
+
+    ``periods`` must be sorted by start date. At most one due date is placed in
+    each period (the earliest). Due dates before ``start_date`` are dropped,
+    so a first period that began earlier only gets the dates from it onwards.
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError(f'frequency must be one of {", ".join(FREQUENCIES)}')
+    if not periods:
+        return []
+
+    if frequency == 'everyperiod':
+        # due_day is an offset from the period start (day 1 = start date)
+        result = []
+        for start, end, period_id in periods:
+            due = start + timedelta(days=due_day - 1)
+            if due <= end and (start_date is None or due >= start_date):
+                result.append((period_id, due))
+        return result
+
+    starts = [p[0] for p in periods]
+    first = max(periods[0][0], start_date) if start_date else periods[0][0]
+    last = max(p[1] for p in periods)
+    result = {}
+    for due in monthly_due_dates(due_day, first, last, MONTH_STEPS[frequency], anchor):
+        i = bisect_right(starts, due) - 1
+        if i >= 0 and due <= periods[i][1]:
+            result.setdefault(periods[i][2], due)
+    return sorted(result.items(), key=lambda item: item[1])
@@ -0,0 +1,89 @@
+# app/rollup.py
+"""Per-category, per-pay-period actuals rollup.
+
+``category_period_actuals`` holds one row per (category, pay period) with the
+summed spend/income of its transactions. Writers call one of the refresh
+helpers after changing transactions or pay periods; each recomputes only the
+affected cells with a DELETE plus an INSERT ... SELECT, so the rollup can never
+drift from the transactions table. ``rebuild()`` recomputes everything.
+"""
+from datetime import datetime
+
+from sqlalchemy import case, delete, func, insert, literal, select
+
+from . import pay_periods
+from .extensions import db
+from .models import CategoryPeriodActual, Transaction
+
+
+ROLLUP_COLUMNS = ['category_id', 'pay_period_id', 'spent', 'received', 'transaction_count', 'updated_at']
+
+
+def _aggregate_select(period_ids=None, category_ids=None):
+    """SELECT producing rollup rows, optionally limited to some periods/categories"""
+    query = select(
+        Transaction.category_id,
+        Transaction.pay_period_id,
+        func.coalesce(func.sum(case((Transaction.amount < 0, Transaction.amount), else_=0)), 0),
+        func.coalesce(func.sum(case((Transaction.amount > 0, Transaction.amount), else_=0)), 0),
+        func.count(Transaction.id),
+        literal(datetime.utcnow())
+    ).where(Transaction.pay_period_id.isnot(None)).group_by(
+        Transaction.category_id, Transaction.pay_period_id
+    )
+    if period_ids is not None:
+        query = query.where(Transaction.pay_period_id.in_(period_ids))
+    if category_ids is not None:
+        query = query.where(_category_in(Transaction.category_id, category_ids))
+    return query
+
+
+def _category_in(column, category_ids):
+    """IN filter that also matches the NULL (uncategorized) bucket when asked"""
+    ids = [c for c in category_ids if c is not None]
+    condition = column.in_(ids)
+    if None in category_ids:
+        condition = db.or_(condition, column.is_(None))
+    return condition
+
+
+def refresh_periods(period_ids, category_ids=None):
+    """Recompute rollup cells for the given pay periods (optionally only some categories)"""
+    period_ids = list(set(period_ids))
+    if not period_ids:
+        return
+    if category_ids is not None:
+        category_ids = set(category_ids)
+
+    stmt = delete(CategoryPeriodActual).where(CategoryPeriodActual.pay_period_id.in_(period_ids))
+    if category_ids is not None:
+        stmt = stmt.where(_category_in(CategoryPeriodActual.category_id, category_ids))
+    db.session.execute(stmt)
+    db.session.execute(
+        insert(CategoryPeriodActual).from_select(ROLLUP_COLUMNS, _aggregate_select(period_ids, category_ids))
+    )
+
+
+def refresh_dates(start_date, end_date, category_ids=None):
+    """Recompute rollup cells for every pay period overlapping [start_date, end_date]"""
+    refresh_periods(pay_periods.get_index().overlapping(start_date, end_date), category_ids)
+
+
+def refresh_transactions(changes):
+    """Recompute the cells touched by changed transactions.
+
+    ``changes`` is an iterable of (date, category_id) pairs; pass both the old
+    and the new pair when a transaction moves between categories.
+    """
+    changes = list(changes)
+    if not changes:
+        return
+    dates = [d for d, _ in changes]
+    refresh_dates(min(dates), max(dates), {c for _, c in changes})
+
+
+def rebuild():
+    """Recompute the whole rollup table; returns the number of cells written"""
+    db.session.execute(delete(CategoryPeriodActual))
+    db.session.execute(insert(CategoryPeriodActual).from_select(ROLLUP_COLUMNS, _aggregate_select()))
+    return db.session.query(func.count(CategoryPeriodActual.id)).scalar()
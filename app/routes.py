@@ -1,10 +1,27 @@
 from app import db
-from flask import Blueprint, render_template, request, jsonify, send_file
-from app.models import BudgetCategory, PayPeriod, PlannedAmount, Transaction, CategoryRule, RecurringTemplate, CategoryGroup
-from datetime import datetime, timedelta
-from decimal import Decimal
-import pandas as pd
+from flask import Blueprint, render_template, request, jsonify, send_file, current_app
+from app.models import BudgetCategory, PayPeriod, PlannedAmount, Transaction, CategoryRule, RecurringTemplate, CategoryGroup, ImportJob, CategoryPeriodActual
+from app.importer import import_statement, StatementFormatError
+from app import rules as rule_engine
+from app import rollup
+from app import pay_periods as pay_period_index
+from app import recurrence
+from app import trends
+from app import versions
+from app.jobs import job_runner, JobQueueFull
+from app.cache import response_cache
+from app.profiling import profiler
+from app.planned_amounts import (upsert_planned_amounts, insert_missing_planned_amounts, existing_keys,
+                                 apply_recurring_templates)
+from app.serializers import (serialize_categories, serialize_planned_amounts, serialize_transactions,
+                             serialize_category_rules, serialize_recurring_templates,
+                             columnar_transactions, columnar_planned_amounts)
+from app.columnar import wants_columnar, columnar_response
+from app.money import to_cents, to_dollars
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
 import os
+import uuid
 from werkzeug.utils import secure_filename
 
 main = Blueprint('main', __name__)
@@ -23,6 +40,57 @@ def index():
     return render_template('index.html')
 
 
+# ==================== BOOTSTRAP ====================
+
+BOOTSTRAP_TABLES = [
+    BudgetCategory.__tablename__, CategoryGroup.__tablename__, PayPeriod.__tablename__,
+    PlannedAmount.__tablename__, Transaction.__tablename__, CategoryRule.__tablename__,
+    RecurringTemplate.__tablename__
+]
+
+
+@main.route('/api/bootstrap', methods=['GET'])
+def bootstrap():
+    """All reference data for the initial page load in one response.
+
+    Carries a strong ETag built from the per-table change counters, so a
+    reload with If-None-Match gets a 304 without touching the data tables.
+    """
+    etag = versions.etag_for(BOOTSTRAP_TABLES)
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        limit = current_app.config['TRANSACTIONS_PAGE_SIZE']
+        transactions = serialize_transactions(
+            Transaction.query.order_by(Transaction.date.desc(), Transaction.id.desc()), limit=limit + 1
+        )
+        has_more = len(transactions) > limit
+        transactions = transactions[:limit]
+        response = jsonify({
+            'categories': serialize_categories(BudgetCategory.query.filter_by(is_active=True).order_by(
+                BudgetCategory.category_type, BudgetCategory.sort_order
+            )),
+            'category_groups': [g.to_dict() for g in CategoryGroup.query.all()],
+            'pay_periods': [p.to_dict() for p in PayPeriod.query.order_by(PayPeriod.start_date).all()],
+            'planned_amounts': serialize_planned_amounts(
+                PlannedAmount.query.join(BudgetCategory).join(PayPeriod).order_by(
+                    PayPeriod.start_date, BudgetCategory.sort_order
+                )
+            ),
+            'transactions': {
+                'transactions': transactions,
+                'next_cursor': encode_cursor(transactions[-1]) if has_more and transactions else None,
+                'has_more': has_more
+            },
+            'category_rules': serialize_category_rules(CategoryRule.query.filter_by(is_active=True)),
+            'recurring_templates': serialize_recurring_templates(RecurringTemplate.query.filter_by(is_active=True))
+        })
+    response.set_etag(etag)
+    # Always revalidate; the 304 path is cheap
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 # ==================== CATEGORY MANAGEMENT ====================
 
 @main.route('/api/categories', methods=['GET', 'POST'])
@@ -31,8 +99,8 @@ def manage_categories():
     if request.method == 'GET':
         categories = BudgetCategory.query.filter_by(is_active=True).order_by(
             BudgetCategory.category_type, BudgetCategory.sort_order
-        ).all()
-        return jsonify([cat.to_dict() for cat in categories])
+        )
+        return jsonify(serialize_categories(categories))
     
     elif request.method == 'POST':
         data = request.json
@@ -180,7 +248,12 @@ def manage_pay_periods():
                     db.session.add(period)
                     periods.append(period)
             
+            db.session.flush()
+            if periods:
+                pay_period_index.assign_transactions(periods[0].start_date, periods[-1].end_date)
+                rollup.refresh_periods([p.id for p in periods])
             db.session.commit()
+            pay_period_index.invalidate()
             return jsonify([p.to_dict() for p in periods]), 201
         
         # Single period
@@ -190,7 +263,11 @@ def manage_pay_periods():
             
             period = PayPeriod(start_date=start_date, end_date=end_date)
             db.session.add(period)
+            db.session.flush()
+            pay_period_index.assign_transactions(period.start_date, period.end_date)
+            rollup.refresh_periods([period.id])
             db.session.commit()
+            pay_period_index.invalidate()
             return jsonify(period.to_dict()), 201
 
 
@@ -202,8 +279,11 @@ def manage_planned_amounts():
     if request.method == 'GET':
         planned = PlannedAmount.query.join(BudgetCategory).join(PayPeriod).order_by(
             PayPeriod.start_date, BudgetCategory.sort_order
-        ).all()
-        return jsonify([p.to_dict() for p in planned])
+        )
+        if wants_columnar():
+            columns = columnar_planned_amounts(planned)
+            return columnar_response({'count': len(columns['id']), 'columns': columns})
+        return jsonify(serialize_planned_amounts(planned))
     
     elif request.method == 'POST':
         data = request.json
@@ -215,7 +295,7 @@ def manage_planned_amounts():
         ).first()
         
         if existing:
-            existing.amount = Decimal(str(data['amount']))
+            existing.amount = to_cents(data['amount'])
             if 'due_date' in data and data['due_date']:
                 existing.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
             db.session.commit()
@@ -224,7 +304,7 @@ def manage_planned_amounts():
             planned = PlannedAmount(
                 category_id=data['category_id'],
                 pay_period_id=data['pay_period_id'],
-                amount=Decimal(str(data['amount']))
+                amount=to_cents(data['amount'])
             )
             if 'due_date' in data and data['due_date']:
                 planned.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
@@ -233,6 +313,155 @@ def manage_planned_amounts():
             return jsonify(planned.to_dict()), 201
 
 
+@main.route('/api/planned-amounts/batch', methods=['POST'])
+def batch_upsert_planned_amounts():
+    """Create or update many planned amounts in one transaction.
+
+    Body: {"items": [{category_id, pay_period_id, amount, due_date?, is_cleared?}, ...]}.
+    Returns a result per item (same order) with status created/updated/error.
+    """
+    items = (request.json or {}).get('items', [])
+    results = [None] * len(items)
+    rows = {}  # (category_id, pay_period_id) -> (index, row); last write wins
+
+    for index, item in enumerate(items):
+        try:
+            row = {
+                'category_id': int(item['category_id']),
+                'pay_period_id': int(item['pay_period_id']),
+                'amount': to_cents(item['amount'])
+            }
+            if 'due_date' in item:
+                row['due_date'] = datetime.strptime(item['due_date'], '%Y-%m-%d').date() if item['due_date'] else None
+            if 'is_cleared' in item:
+                row['is_cleared'] = bool(item['is_cleared'])
+        except (KeyError, TypeError, ValueError) as e:
+            results[index] = {'index': index, 'status': 'error', 'error': f'Invalid item: {e}'}
+            continue
+        key = (row['category_id'], row['pay_period_id'])
+        if key in rows:
+            previous = rows[key][0]
+            results[previous] = {'index': previous, 'status': 'error', 'error': 'Superseded by a later item for the same cell'}
+        rows[key] = (index, row)
+
+    # Reject unknown categories/periods up front so one bad row can't abort the batch
+    category_ids = {key[0] for key in rows}
+    period_ids = {key[1] for key in rows}
+    known_categories = {c.id for c in db.session.query(BudgetCategory.id).filter(BudgetCategory.id.in_(category_ids))}
+    known_periods = {p.id for p in db.session.query(PayPeriod.id).filter(PayPeriod.id.in_(period_ids))}
+    for key, (index, row) in list(rows.items()):
+        if key[0] not in known_categories or key[1] not in known_periods:
+            results[index] = {'index': index, 'status': 'error', 'error': 'Unknown category or pay period'}
+            del rows[key]
+
+    found = existing_keys(set(rows))
+    upsert_planned_amounts([row for _, row in rows.values()])
+    db.session.commit()
+
+    saved = {}
+    if rows:
+        planned_query = PlannedAmount.query.filter(
+            db.tuple_(PlannedAmount.category_id, PlannedAmount.pay_period_id).in_(list(rows))
+        )
+        saved = {(p['category_id'], p['pay_period_id']): p for p in serialize_planned_amounts(planned_query)}
+    for key, (index, _) in rows.items():
+        results[index] = {
+            'index': index,
+            'status': 'updated' if key in found else 'created',
+            'planned': saved.get(key)
+        }
+
+    return jsonify({
+        'created': sum(1 for r in results if r['status'] == 'created'),
+        'updated': sum(1 for r in results if r['status'] == 'updated'),
+        'errors': sum(1 for r in results if r['status'] == 'error'),
+        'results': results
+    })
+
+
+@main.route('/api/budget-grid', methods=['GET'])
+def budget_grid():
+    """Pre-pivoted category x pay period matrix for a window of periods.
+
+    Query args: start_date (first period whose end_date >= it; defaults to
+    today), count (number of periods, default 26) and category_type
+    (default 'expense'). Cell arrays are dense and row-major: the cell for
+    category_ids[i] and period_ids[j] is at index i * len(period_ids) + j.
+    prev_start_date / next_start_date are the start_date values for the
+    adjacent windows (null at either end of the history).
+    """
+    try:
+        start = parse_date_arg(request.args['start_date'], 'start_date') \
+            if request.args.get('start_date') else datetime.utcnow().date()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    count = max(1, min(request.args.get('count', 26, type=int), 260))
+    category_type = request.args.get('category_type', 'expense')
+
+    periods = PayPeriod.query.filter(PayPeriod.end_date >= start).order_by(
+        PayPeriod.start_date
+    ).limit(count).all()
+    if not periods:
+        # Nothing ahead of start_date: show the most recent window instead
+        periods = PayPeriod.query.order_by(PayPeriod.start_date.desc()).limit(count).all()[::-1]
+
+    categories = db.session.query(BudgetCategory.id).filter(
+        BudgetCategory.is_active.is_(True),
+        BudgetCategory.is_parent_only.isnot(True),
+        BudgetCategory.category_type == category_type
+    ).order_by(BudgetCategory.sort_order, BudgetCategory.id).all()
+
+    category_ids = [c.id for c in categories]
+    period_ids = [p.id for p in periods]
+    row_of = {cid: i for i, cid in enumerate(category_ids)}
+    col_of = {pid: j for j, pid in enumerate(period_ids)}
+    width = len(period_ids)
+    size = len(category_ids) * width
+
+    planned_ids = [None] * size
+    amounts = [None] * size
+    cleared = [False] * size
+    due_dates = [None] * size
+
+    if size:
+        cells = db.session.query(
+            PlannedAmount.id, PlannedAmount.category_id, PlannedAmount.pay_period_id,
+            PlannedAmount.amount, PlannedAmount.is_cleared, PlannedAmount.due_date
+        ).filter(
+            PlannedAmount.pay_period_id.in_(period_ids),
+            PlannedAmount.category_id.in_(category_ids)
+        ).all()
+        for cell in cells:
+            index = row_of[cell.category_id] * width + col_of[cell.pay_period_id]
+            planned_ids[index] = cell.id
+            amounts[index] = to_dollars(cell.amount)
+            cleared[index] = bool(cell.is_cleared)
+            due_dates[index] = cell.due_date.isoformat() if cell.due_date else None
+
+    # Adjacent windows, from the cached sorted period index
+    prev_start = next_start = None
+    if periods:
+        index = pay_period_index.get_index()
+        first = bisect_left(index.starts, periods[0].start_date)
+        last = bisect_left(index.starts, periods[-1].start_date)
+        if first > 0:
+            prev_start = index.starts[max(first - count, 0)].isoformat()
+        if last + 1 < len(index):
+            next_start = index.starts[last + 1].isoformat()
+
+    return jsonify({
+        'category_ids': category_ids,
+        'period_ids': period_ids,
+        'periods': [p.to_dict() for p in periods],
+        'prev_start_date': prev_start,
+        'next_start_date': next_start,
+        'planned_ids': planned_ids,
+        'amounts': amounts,
+        'cleared': cleared,
+        'due_dates': due_dates
+    })
+
+
 @main.route('/api/planned-amounts/<int:planned_id>', methods=['PUT'])
 def update_planned_amount(planned_id):
     """Update a planned amount"""
@@ -240,7 +469,7 @@ def update_planned_amount(planned_id):
     data = request.json
     
     if 'amount' in data:
-        planned.amount = Decimal(str(data['amount']))
+        planned.amount = to_cents(data['amount'])
     if 'is_cleared' in data:
         planned.is_cleared = data['is_cleared']
     
@@ -252,29 +481,162 @@ def update_planned_amount(planned_id):
 
 @main.route('/api/transactions', methods=['GET', 'POST'])
 def manage_transactions():
-    """Get all transactions or add a new one"""
+    """Get a page of transactions (newest first) or add a new one.
+
+    GET accepts start_date, end_date, category_id, uncategorized, categorized,
+    min_amount, max_amount, q (description substring), limit and cursor. The
+    cursor is the (date, id) of the last row of the previous page, as returned
+    in next_cursor. with_total=1 adds the number of rows matching the filters
+    (one extra COUNT query).
+    With format=columnar the page comes back as parallel arrays and may be
+    up to TRANSACTIONS_COLUMNAR_MAX_PAGE_SIZE rows.
+    """
     if request.method == 'GET':
-        transactions = Transaction.query.order_by(Transaction.date.desc()).all()
-        return jsonify([t.to_dict() for t in transactions])
+        columnar = wants_columnar()
+        max_page_size = current_app.config[
+            'TRANSACTIONS_COLUMNAR_MAX_PAGE_SIZE' if columnar else 'TRANSACTIONS_MAX_PAGE_SIZE'
+        ]
+        try:
+            query = filter_transactions(Transaction.query, request.args)
+            total = query.order_by(None).count() if request.args.get('with_total') in ('1', 'true') else None
+            limit = request.args.get('limit', current_app.config['TRANSACTIONS_PAGE_SIZE'])
+            limit = min(parse_int_arg(limit, 'limit', minimum=1), max_page_size)
+            cursor = request.args.get('cursor')
+            if cursor:
+                query = after_cursor(query, *decode_cursor(cursor))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if columnar:
+            columns = columnar_transactions(
+                query.order_by(Transaction.date.desc(), Transaction.id.desc()), limit=limit + 1
+            )
+            has_more = len(columns['id']) > limit
+            columns = {name: values[:limit] for name, values in columns.items()}
+            last = {'date': columns['date'][-1], 'id': columns['id'][-1]} if columns['id'] else None
+            payload = {
+                'count': len(columns['id']),
+                'columns': columns,
+                'next_cursor': encode_cursor(last) if has_more and last else None,
+                'has_more': has_more
+            }
+            if total is not None:
+                payload['total'] = total
+            return columnar_response(payload)
+
+        # Fetch one extra row to learn whether another page exists
+        page = serialize_transactions(
+            query.order_by(Transaction.date.desc(), Transaction.id.desc()), limit=limit + 1
+        )
+        has_more = len(page) > limit
+        page = page[:limit]
+        payload = {
+            'transactions': page,
+            'next_cursor': encode_cursor(page[-1]) if has_more and page else None,
+            'has_more': has_more
+        }
+        if total is not None:
+            payload['total'] = total
+        return jsonify(payload)
     
     elif request.method == 'POST':
         data = request.json
+        trans_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
         transaction = Transaction(
-            date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
+            date=trans_date,
+            pay_period_id=pay_period_index.resolve(trans_date),
             description=data['description'],
-            amount=Decimal(str(data['amount'])),
+            amount=to_cents(data['amount']),
             category_id=data.get('category_id'),
             is_categorized=bool(data.get('category_id')),
             notes=data.get('notes')
         )
         db.session.add(transaction)
+        db.session.flush()
+        rollup.refresh_transactions([(transaction.date, transaction.category_id)])
         db.session.commit()
         return jsonify(transaction.to_dict()), 201
 
 
+def parse_date_arg(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{name} must be YYYY-MM-DD')
+
+
+def parse_amount_arg(value, name):
+    try:
+        return to_cents(value)
+    except ValueError:
+        raise ValueError(f'{name} must be a number')
+
+
+def parse_int_arg(value, name, minimum=None):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+    if minimum is not None and number < minimum:
+        raise ValueError(f'{name} must be at least {minimum}')
+    return number
+
+
+def parse_id_list(value, name, allow=None):
+    """A JSON list of integer ids; ``allow`` names a string also accepted in its place"""
+    if not isinstance(value, list) or not all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+        expected = f'a list of integer ids or "{allow}"' if allow else 'a list of integer ids'
+        raise ValueError(f'{name} must be {expected}')
+    return value
+
+
+def filter_transactions(query, args):
+    """Apply the list filters from request args to a Transaction query"""
+    if args.get('start_date'):
+        query = query.filter(Transaction.date >= parse_date_arg(args['start_date'], 'start_date'))
+    if args.get('end_date'):
+        query = query.filter(Transaction.date <= parse_date_arg(args['end_date'], 'end_date'))
+    if args.get('uncategorized') in ('1', 'true'):
+        query = query.filter(Transaction.category_id.is_(None))
+    elif args.get('categorized') in ('1', 'true'):
+        query = query.filter(Transaction.category_id.isnot(None))
+    elif args.get('category_id'):
+        query = query.filter(Transaction.category_id == parse_int_arg(args['category_id'], 'category_id'))
+    if args.get('min_amount'):
+        query = query.filter(Transaction.amount >= parse_amount_arg(args['min_amount'], 'min_amount'))
+    if args.get('max_amount'):
+        query = query.filter(Transaction.amount <= parse_amount_arg(args['max_amount'], 'max_amount'))
+    if args.get('q'):
+        query = query.filter(Transaction.description.ilike(f"%{args['q']}%"))
+    return query
+
+
+def encode_cursor(row):
+    return f"{row['date']}_{row['id']}"
+
+
+def decode_cursor(cursor):
+    try:
+        cursor_date, cursor_id = cursor.split('_', 1)
+        return datetime.strptime(cursor_date, '%Y-%m-%d').date(), int(cursor_id)
+    except ValueError:
+        raise ValueError('Invalid cursor')
+
+
+def after_cursor(query, cursor_date, cursor_id):
+    """Keyset condition for rows after (cursor_date, cursor_id) in date desc, id desc order"""
+    return query.filter(db.or_(
+        Transaction.date < cursor_date,
+        db.and_(Transaction.date == cursor_date, Transaction.id < cursor_id)
+    ))
+
+
 @main.route('/api/transactions/import', methods=['POST'])
 def import_transactions():
-    """Import transactions from CSV file"""
+    """Queue a CSV/XLSX statement import; poll /api/jobs/<id> for progress.
+
+    Pass ?sync=1 to run the import inside the request instead.
+    """
     if 'file' not in request.files:
         return jsonify({'error': 'No file provided'}), 400
     
@@ -283,81 +645,48 @@ def import_transactions():
         return jsonify({'error': 'Invalid file'}), 400
     
     filename = secure_filename(file.filename)
-    filepath = os.path.join('/app/uploads', filename)
+    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], f'{uuid.uuid4().hex}_{filename}')
     file.save(filepath)
     
+    if request.args.get('sync'):
+        try:
+            return jsonify(import_statement(filepath, chunk_size=current_app.config['IMPORT_CHUNK_SIZE']))
+        except StatementFormatError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+        finally:
+            os.remove(filepath)
+
     try:
-        # Read CSV
-        if filename.endswith('.csv'):
-            df = pd.read_csv(filepath)
-        else:
-            df = pd.read_excel(filepath)
-        
-        # Expected columns: Date, Description, Amount (or similar)
-        # Try to find the right columns
-        df.columns = df.columns.str.strip().str.lower()
-        
-        date_col = next((col for col in df.columns if 'date' in col), None)
-        desc_col = next((col for col in df.columns if 'desc' in col or 'merchant' in col or 'name' in col), None)
-        amount_col = next((col for col in df.columns if 'amount' in col or 'debit' in col or 'credit' in col), None)
-        
-        if not all([date_col, desc_col, amount_col]):
-            return jsonify({'error': 'Could not identify Date, Description, and Amount columns'}), 400
-        
-        imported_count = 0
-        categorized_count = 0
-        
-        for _, row in df.iterrows():
-            try:
-                # Parse date
-                trans_date = pd.to_datetime(row[date_col]).date()
-                description = str(row[desc_col])
-                amount = Decimal(str(row[amount_col]))
-                
-                # Check for duplicate
-                existing = Transaction.query.filter_by(
-                    date=trans_date,
-                    description=description,
-                    amount=amount
-                ).first()
-                
-                if existing:
-                    continue
-                
-                # Try to auto-categorize
-                category_id = None
-                rules = CategoryRule.query.filter_by(is_active=True).all()
-                for rule in rules:
-                    if rule.pattern.lower() in description.lower():
-                        category_id = rule.category_id
-                        categorized_count += 1
-                        break
-                
-                transaction = Transaction(
-                    date=trans_date,
-                    description=description,
-                    amount=amount,
-                    category_id=category_id,
-                    is_categorized=bool(category_id)
-                )
-                db.session.add(transaction)
-                imported_count += 1
-                
-            except Exception as e:
-                print(f"Error importing row: {e}")
-                continue
-        
-        db.session.commit()
+        job = job_runner.submit_import(filename, filepath)
+    except JobQueueFull as e:
         os.remove(filepath)
-        
-        return jsonify({
-            'imported': imported_count,
-            'auto_categorized': categorized_count,
-            'message': f'Imported {imported_count} transactions ({categorized_count} auto-categorized)'
-        })
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'error': str(e)}), 429
+
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f'/api/jobs/{job.id}'
+    }), 202
+
+
+@main.route('/api/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Report progress of a background import job"""
+    job = ImportJob.query.get_or_404(job_id)
+    return jsonify(job.to_dict())
+
+
+@main.route('/api/jobs/<int:job_id>/resume', methods=['POST'])
+def resume_job(job_id):
+    """Continue a failed import after its last committed chunk"""
+    job = ImportJob.query.get_or_404(job_id)
+    if job.status != 'failed' or not job.filepath or not os.path.exists(job.filepath):
+        return jsonify({'error': 'Only failed imports whose upload is still available can be resumed'}), 409
+    job_runner.resume_import(job)
+    return jsonify(job.to_dict()), 202
 
 
 @main.route('/api/transactions/<int:transaction_id>/categorize', methods=['PUT'])
@@ -366,6 +695,7 @@ def categorize_transaction(transaction_id):
     transaction = Transaction.query.get_or_404(transaction_id)
     data = request.json
     
+    previous_category_id = transaction.category_id
     transaction.category_id = data['category_id']
     transaction.is_categorized = True
     
@@ -374,16 +704,13 @@ def categorize_transaction(transaction_id):
         category = BudgetCategory.query.get(data['category_id'])
         if category:
             # Find pay period for this transaction
-            pay_period = PayPeriod.query.filter(
-                PayPeriod.start_date <= transaction.date,
-                PayPeriod.end_date >= transaction.date
-            ).first()
+            pay_period_id = transaction.pay_period_id or pay_period_index.resolve(transaction.date)
             
-            if pay_period:
+            if pay_period_id:
                 # Find planned amount
                 planned = PlannedAmount.query.filter_by(
                     category_id=category.id,
-                    pay_period_id=pay_period.id,
+                    pay_period_id=pay_period_id,
                     is_cleared=False
                 ).first()
                 
@@ -391,18 +718,115 @@ def categorize_transaction(transaction_id):
                     transaction.matched_planned_id = planned.id
                     planned.is_cleared = True
     
+    db.session.flush()
+    rollup.refresh_transactions([
+        (transaction.date, previous_category_id),
+        (transaction.date, transaction.category_id)
+    ])
     db.session.commit()
     return jsonify(transaction.to_dict())
 
 
+@main.route('/api/transactions/categorize', methods=['POST'])
+def batch_categorize_transactions():
+    """Categorize many transactions in one transaction.
+
+    Body: {"items": [{transaction_id, category_id, auto_match?}, ...]}. With
+    auto_match the transaction is matched to the open planned amount of its
+    category and pay period, first come first served within the batch.
+    Returns a result per item (same order) with status updated/error and the
+    updated transaction.
+    """
+    from sqlalchemy import update
+
+    items = (request.json or {}).get('items', [])
+    results = [None] * len(items)
+    entries = {}  # transaction_id -> (index, category_id, auto_match); last write wins
+
+    for index, item in enumerate(items):
+        try:
+            transaction_id = int(item['transaction_id'])
+            entry = (index, int(item['category_id']), bool(item.get('auto_match', False)))
+        except (KeyError, TypeError, ValueError) as e:
+            results[index] = {'index': index, 'status': 'error', 'error': f'Invalid item: {e}'}
+            continue
+        if transaction_id in entries:
+            previous = entries[transaction_id][0]
+            results[previous] = {'index': previous, 'status': 'error', 'error': 'Superseded by a later item for the same transaction'}
+        entries[transaction_id] = entry
+
+    category_ids = {entry[1] for entry in entries.values()}
+    known_categories = {c.id for c in db.session.query(BudgetCategory.id).filter(BudgetCategory.id.in_(category_ids))}
+    transactions = {t.id: t for t in db.session.query(
+        Transaction.id, Transaction.date, Transaction.category_id, Transaction.pay_period_id
+    ).filter(Transaction.id.in_(list(entries)))}
+    for transaction_id, (index, category_id, _) in list(entries.items()):
+        if transaction_id not in transactions or category_id not in known_categories:
+            results[index] = {'index': index, 'status': 'error', 'error': 'Unknown transaction or category'}
+            del entries[transaction_id]
+
+    # Open planned amounts for every (category, pay period) that wants a match, in one query
+    period_of = {}
+    for transaction_id, (_, category_id, auto_match) in entries.items():
+        if auto_match:
+            transaction = transactions[transaction_id]
+            period_of[transaction_id] = transaction.pay_period_id or pay_period_index.resolve(transaction.date)
+    wanted = {(entries[tid][1], pid) for tid, pid in period_of.items() if pid}
+    open_planned = {}
+    if wanted:
+        open_planned = {(p.category_id, p.pay_period_id): p.id for p in db.session.query(
+            PlannedAmount.id, PlannedAmount.category_id, PlannedAmount.pay_period_id
+        ).filter(
+            db.tuple_(PlannedAmount.category_id, PlannedAmount.pay_period_id).in_(list(wanted)),
+            PlannedAmount.is_cleared.isnot(True)
+        )}
+
+    plain, matched, changes = [], [], []
+    for transaction_id, (_, category_id, _) in sorted(entries.items(), key=lambda e: e[1][0]):
+        row = {'id': transaction_id, 'category_id': category_id, 'is_categorized': True}
+        planned_id = open_planned.pop((category_id, period_of.get(transaction_id)), None)
+        if planned_id:
+            matched.append(dict(row, matched_planned_id=planned_id))
+        else:
+            plain.append(row)
+        transaction = transactions[transaction_id]
+        changes += [(transaction.date, transaction.category_id), (transaction.date, category_id)]
+
+    # ORM bulk UPDATE by primary key; rows with and without a match differ in columns
+    for rows in (plain, matched):
+        if rows:
+            db.session.execute(update(Transaction), rows)
+    if matched:
+        db.session.execute(
+            update(PlannedAmount).where(
+                PlannedAmount.id.in_([row['matched_planned_id'] for row in matched])
+            ).values(is_cleared=True).execution_options(synchronize_session=False)
+        )
+    rollup.refresh_transactions(changes)
+    db.session.commit()
+
+    saved = {}
+    if entries:
+        saved = {t['id']: t for t in serialize_transactions(Transaction.query.filter(Transaction.id.in_(list(entries))))}
+    for transaction_id, (index, _, _) in entries.items():
+        results[index] = {'index': index, 'status': 'updated', 'transaction': saved.get(transaction_id)}
+
+    return jsonify({
+        'updated': len(entries),
+        'matched': len(matched),
+        'errors': sum(1 for r in results if r['status'] == 'error'),
+        'results': results
+    })
+
+
 # ==================== CATEGORY RULES ====================
 
 @main.route('/api/category-rules', methods=['GET', 'POST'])
 def manage_category_rules():
     """Get or create category rules"""
     if request.method == 'GET':
-        rules = CategoryRule.query.filter_by(is_active=True).all()
-        return jsonify([r.to_dict() for r in rules])
+        rules = CategoryRule.query.filter_by(is_active=True)
+        return jsonify(serialize_category_rules(rules))
     
     elif request.method == 'POST':
         data = request.json
@@ -412,6 +836,7 @@ def manage_category_rules():
         )
         db.session.add(rule)
         db.session.commit()
+        rule_engine.invalidate()
         return jsonify(rule.to_dict()), 201
 
 
@@ -421,24 +846,57 @@ def delete_category_rule(rule_id):
     rule = CategoryRule.query.get_or_404(rule_id)
     rule.is_active = False
     db.session.commit()
+    rule_engine.invalidate()
     return '', 204
 
 
+@main.route('/api/category-rules/apply', methods=['POST'])
+def apply_category_rules():
+    """Re-run the active rules over existing transactions.
+
+    Body: scope ('uncategorized' (default) or 'all'), optional start_date /
+    end_date, and dry_run (a JSON boolean) to only report what would change.
+    The response counts the rows each rule changed.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        start_date = parse_date_arg(data['start_date'], 'start_date') if data.get('start_date') else None
+        end_date = parse_date_arg(data['end_date'], 'end_date') if data.get('end_date') else None
+        dry_run = data.get('dry_run', False)
+        # Strings like "false" would be truthy
+        if not isinstance(dry_run, bool):
+            raise ValueError('dry_run must be true or false')
+        result = rule_engine.recategorize(
+            scope=data.get('scope', 'uncategorized'),
+            start_date=start_date,
+            end_date=end_date,
+            dry_run=dry_run
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if result['dry_run']:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    return jsonify(result)
+
+
 # ==================== RECURRING TEMPLATES ====================
 
 @main.route('/api/recurring-templates', methods=['GET', 'POST'])
 def manage_recurring_templates():
     """Get or create recurring templates"""
     if request.method == 'GET':
-        templates = RecurringTemplate.query.filter_by(is_active=True).all()
-        return jsonify([t.to_dict() for t in templates])
+        templates = RecurringTemplate.query.filter_by(is_active=True)
+        return jsonify(serialize_recurring_templates(templates))
     
     elif request.method == 'POST':
         data = request.json
         template = RecurringTemplate(
             name=data['name'],
             category_id=data['category_id'],
-            amount=Decimal(str(data['amount'])),
+            amount=to_cents(data['amount']),
             frequency=data['frequency']
         )
         db.session.add(template)
@@ -450,148 +908,212 @@ def manage_recurring_templates():
 def apply_recurring_template(template_id):
     """Apply a recurring template to pay periods"""
     template = RecurringTemplate.query.get_or_404(template_id)
-    data = request.json
+    data = request.json or {}
     
-    pay_period_ids = data.get('pay_period_ids', [])
-    applied_count = 0
+    try:
+        pay_period_ids = parse_id_list(data.get('pay_period_ids', []), 'pay_period_ids')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    counts = apply_recurring_templates(
+        RecurringTemplate.id == template.id,
+        PayPeriod.id.in_(pay_period_ids)
+    )
     
-    for period_id in pay_period_ids:
-        # Check if already exists
-        existing = PlannedAmount.query.filter_by(
-            category_id=template.category_id,
-            pay_period_id=period_id
-        ).first()
-        
-        if not existing:
-            planned = PlannedAmount(
-                category_id=template.category_id,
-                pay_period_id=period_id,
-                amount=template.amount
+    db.session.commit()
+    return jsonify({'applied_count': counts.get(template.id, 0)})
+
+
+@main.route('/api/recurring-templates/apply', methods=['POST'])
+def apply_recurring_templates_batch():
+    """Apply many recurring templates across a range of pay periods at once.
+
+    Body: template_ids (list, or "all" for every active template) plus either
+    pay_period_ids or a start_date/end_date range (periods starting within it).
+    """
+    data = request.json or {}
+    
+    try:
+        template_ids = data.get('template_ids', 'all')
+        if template_ids == 'all':
+            template_filter = RecurringTemplate.is_active.is_(True)
+        else:
+            template_filter = RecurringTemplate.id.in_(parse_id_list(template_ids, 'template_ids', allow='all'))
+
+        if 'pay_period_ids' in data:
+            period_filter = PayPeriod.id.in_(parse_id_list(data['pay_period_ids'], 'pay_period_ids'))
+        else:
+            start = parse_date_arg(data['start_date'], 'start_date') if data.get('start_date') else None
+            end = parse_date_arg(data['end_date'], 'end_date') if data.get('end_date') else None
+            if start is None and end is None:
+                raise ValueError('pay_period_ids or start_date/end_date required')
+            period_filter = db.and_(
+                PayPeriod.start_date >= start if start else db.true(),
+                PayPeriod.start_date <= end if end else db.true()
             )
-            db.session.add(planned)
-            applied_count += 1
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
+    counts = apply_recurring_templates(template_filter, period_filter)
     db.session.commit()
-    return jsonify({'applied_count': applied_count})
+    
+    applied = [{'template_id': tid, 'applied_count': n} for tid, n in sorted(counts.items())]
+    return jsonify({
+        'applied_count': sum(counts.values()),
+        'templates': applied
+    })
 
 
 # ==================== ANALYTICS ====================
 
 @main.route('/api/analytics/budget-vs-actual', methods=['GET'])
+@response_cache.cached(
+    BudgetCategory.__tablename__, PlannedAmount.__tablename__, Transaction.__tablename__,
+    CategoryPeriodActual.__tablename__
+)
 def budget_vs_actual():
-    from sqlalchemy import func, Integer  # ← add Integer here
+    """Planned vs actual spend per expense category.
 
-    planned_total = db.session.query(func.sum(PlannedAmount.amount)).scalar() or 0.0
+    Actuals come from the category_period_actuals rollup, so the cost scales
+    with categories x pay periods rather than with the transaction count.
+    Transactions outside every pay period have no rollup cell and are summed
+    from the transactions table directly (the pay_period_id-led index finds
+    them), so actuals still cover every negative transaction.
+    """
+    from sqlalchemy import case, func
 
-    actual_total = db.session.query(
-        func.sum(func.coalesce(Transaction.amount, 0))
-    ).filter(Transaction.amount < 0).scalar() or 0.0
+    planned_total = db.session.query(func.sum(PlannedAmount.amount)).scalar() or 0
+
+    in_periods = db.session.query(
+        CategoryPeriodActual.category_id.label('category_id'),
+        CategoryPeriodActual.spent.label('spent')
+    )
+    outside_periods = db.session.query(
+        Transaction.category_id.label('category_id'),
+        func.sum(case((Transaction.amount < 0, Transaction.amount), else_=0)).label('spent')
+    ).filter(Transaction.pay_period_id.is_(None)).group_by(Transaction.category_id)
+    spent = in_periods.union_all(outside_periods).subquery()
+
+    actual_total = db.session.query(func.sum(spent.c.spent)).scalar() or 0
+
+    # Aggregate each side separately before joining, so categories with many
+    # planned rows and many transactions don't multiply each other
+    planned = db.session.query(
+        PlannedAmount.category_id,
+        func.sum(PlannedAmount.amount).label('planned')
+    ).group_by(PlannedAmount.category_id).subquery()
+    actual = db.session.query(
+        spent.c.category_id,
+        func.sum(spent.c.spent).label('actual')
+    ).group_by(spent.c.category_id).subquery()
 
-    # Per-category
     results = db.session.query(
         BudgetCategory.name.label('category_name'),
         BudgetCategory.id.label('category_id'),
-        func.sum(PlannedAmount.amount).label('planned'),
-        func.sum(
-            func.coalesce(
-                Transaction.amount * (Transaction.amount < 0).cast(Integer), 
-                0
-            )
-        ).label('actual')
-    ).outerjoin(PlannedAmount, PlannedAmount.category_id == BudgetCategory.id
-    ).outerjoin(Transaction, Transaction.category_id == BudgetCategory.id
+        planned.c.planned,
+        actual.c.actual
+    ).outerjoin(planned, planned.c.category_id == BudgetCategory.id
+    ).outerjoin(actual, actual.c.category_id == BudgetCategory.id
     ).filter(BudgetCategory.category_type == 'expense'
-    ).group_by(BudgetCategory.id, BudgetCategory.name
     ).all()
 
     categories = [{
         'category_name': r.category_name,
         'category_id': r.category_id,
-        'planned': float(r.planned or 0),
-        'actual': float(r.actual or 0)
+        'planned': to_dollars(r.planned or 0),
+        'actual': to_dollars(r.actual or 0)
     } for r in results]
 
+    # Totals are integer cents, so the difference is exact before the one conversion
     return jsonify({
-        'planned_total': float(planned_total),
-        'actual_total': float(actual_total),
-        'difference': float(planned_total - actual_total),
+        'planned_total': to_dollars(planned_total),
+        'actual_total': to_dollars(actual_total),
+        'difference': to_dollars(planned_total - actual_total),
         'categories': categories
     })
 
+def _default_window_day():
+    """Today, for trend requests whose window defaults to ending today"""
+    return '' if request.args.get('end_date') else date.today().isoformat()
+
+
 @main.route('/api/analytics/spending-trend')
+@response_cache.cached(
+    BudgetCategory.__tablename__, CategoryGroup.__tablename__, PayPeriod.__tablename__,
+    Transaction.__tablename__, CategoryPeriodActual.__tablename__,
+    vary_on=_default_window_day
+)
 def spending_trend():
-    """Get spending trend over pay periods"""
-    from sqlalchemy import func
-    
-    results = db.session.query(
-        PayPeriod.start_date,
-        func.sum(Transaction.amount).label('total_spent')
-    ).join(
-        Transaction,
-        db.and_(
-            Transaction.date >= PayPeriod.start_date,
-            Transaction.date <= PayPeriod.end_date
-        )
-    ).group_by(PayPeriod.start_date).order_by(PayPeriod.start_date).all()
-    
-    return jsonify([{
-        'period': row.start_date.isoformat(),
-        'total': float(row.total_spent) if row.total_spent else 0
-    } for row in results])
+    """Spend over time for a bounded window.
+
+    Query args: granularity (day, week, month, pay_period), split (none,
+    category, group, type), measure (spent, received, net), start_date,
+    end_date (default: a window ending today) and rolling (trailing average
+    over N buckets). See app.trends for the response shape.
+    """
+    args = request.args
+    try:
+        return jsonify(trends.spending_trend(
+            granularity=args.get('granularity', 'pay_period'),
+            split=args.get('split', 'none'),
+            measure=args.get('measure', 'spent'),
+            start_date=parse_date_arg(args['start_date'], 'start_date') if args.get('start_date') else None,
+            end_date=parse_date_arg(args['end_date'], 'end_date') if args.get('end_date') else None,
+            rolling=args.get('rolling', type=int)
+        ))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@main.route('/api/_metrics', methods=['GET'])
+def request_metrics():
+    """Per-route latency histograms and SQL totals (this process; needs ENABLE_PROFILING=1)"""
+    return jsonify(profiler.snapshot())
+
+
+@main.route('/api/analytics/cache-stats', methods=['GET'])
+def analytics_cache_stats():
+    """Hit/miss counters of the analytics response cache (this process only)"""
+    return jsonify(response_cache.stats())
 
 # ==================== Recurring Expenses ====================
 
 @main.route('/api/expenses/recurring', methods=['POST'])
 def create_recurring_expense():
-    """Create a recurring expense with due date that auto-populates pay periods"""
+    """Create a recurring expense with due date that auto-populates pay periods.
+
+    frequency: monthly, bimonthly, quarterly (due_day = day of month, clamped
+    to month end) or everyperiod (due_day = day offset within the period).
+    Optional start_date drops due dates before it and anchors the
+    bimonthly/quarterly cadence.
+    """
     data = request.json
     
     category_id = data['category_id']
-    amount = Decimal(str(data['amount']))
-    due_day = data['due_day']  # Day of month (1-31)
-    frequency = data.get('frequency', 'monthly')  # monthly, bimonthly, quarterly
+    amount = to_cents(data['amount'])
+    due_day = int(data['due_day'])  # Day of month (1-31)
+    frequency = data.get('frequency', 'monthly')  # monthly, bimonthly, quarterly, everyperiod
+    start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date() if data.get('start_date') else None
     
-    # Get all pay periods
-    pay_periods = PayPeriod.query.order_by(PayPeriod.start_date).all()
+    if not 1 <= due_day <= 31:
+        return jsonify({'error': 'due_day must be between 1 and 31'}), 400
     
-    created_count = 0
-    for period in pay_periods:
-        # Calculate due date for this period
-        due_date = None
-        
-        if frequency == 'monthly':
-            # Find the due day within this pay period
-            current_date = period.start_date
-            while current_date <= period.end_date:
-                if current_date.day == due_day:
-                    due_date = current_date
-                    break
-                current_date += timedelta(days=1)
-        
-        elif frequency == 'everyperiod':
-            # Use the due_day as offset from start (e.g., day 5 of period)
-            due_date = period.start_date + timedelta(days=due_day - 1)
-            if due_date > period.end_date:
-                due_date = None
-        
-        # Create planned amount if due date falls in this period
-        if due_date:
-            existing = PlannedAmount.query.filter_by(
-                category_id=category_id,
-                pay_period_id=period.id
-            ).first()
-            
-            if not existing:
-                planned = PlannedAmount(
-                    category_id=category_id,
-                    pay_period_id=period.id,
-                    amount=amount,
-                    due_date=due_date
-                )
-                db.session.add(planned)
-                created_count += 1
+    index = pay_period_index.get_index()
+    periods = [p for p in zip(index.starts, index.ends, index.ids)
+               if start_date is None or p[1] >= start_date]
+    
+    try:
+        due_dates = recurrence.schedule(frequency, due_day, periods, anchor=start_date, start_date=start_date)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    created = insert_missing_planned_amounts([{
+        'category_id': category_id,
+        'pay_period_id': period_id,
+        'amount': amount,
+        'due_date': due_date
+    } for period_id, due_date in due_dates])
     
     db.session.commit()
+    created_count = len(created)
     return jsonify({'created': created_count, 'message': f'Created {created_count} recurring expenses'})
 
 
@@ -0,0 +1,177 @@
+# app/rules.py
+"""Compiled auto-categorization rules.
+
+All active CategoryRule patterns are folded into one regular expression so a
+description is scanned once regardless of how many rules exist. Rule priority
+is preserved: when several patterns occur in a description, the rule with the
+lowest id wins, exactly as the old "first rule in the list" loop behaved.
+
+``recategorize()`` re-runs the active rules over stored transactions.
+"""
+import re
+import threading
+from collections import Counter, defaultdict
+
+from sqlalchemy import func, update
+
+from . import rollup
+from .extensions import db
+from .models import CategoryRule, Transaction
+
+
+RECATEGORIZE_SCOPES = ('uncategorized', 'all')
+
+
+class RuleMatcher:
+    """Immutable multi-pattern matcher built from (pattern, category_id[, rule_id]) rows"""
+
+    def __init__(self, rules):
+        # Lower-cased pattern -> (priority, category_id, rule_id); first rule wins on duplicates
+        self._targets = {}
+        for priority, (pattern, category_id, *rule_id) in enumerate(rules):
+            self._targets.setdefault(pattern.lower(), (priority, category_id, rule_id[0] if rule_id else None))
+
+        if self._targets:
+            # Alternatives are ordered by priority, so at any position the
+            # zero-width lookahead captures the highest-priority pattern there.
+            ordered = sorted(self._targets, key=lambda p: self._targets[p][0])
+            alternation = '|'.join(re.escape(p) for p in ordered)
+            self._regex = re.compile(f'(?=({alternation}))')
+        else:
+            self._regex = None
+
+    def __len__(self):
+        return len(self._targets)
+
+    def match_rule(self, description):
+        """Return (rule_id, category_id) of the best matching rule, or None"""
+        if self._regex is None or description is None:
+            return None
+        best = None
+        for hit in self._regex.finditer(description.lower()):
+            target = self._targets[hit.group(1)]
+            if best is None or target[0] < best[0]:
+                best = target
+                if best[0] == 0:
+                    break
+        return (best[2], best[1]) if best else None
+
+    def match(self, description):
+        """Return the category_id of the best matching rule, or None"""
+        hit = self.match_rule(description)
+        return hit[1] if hit else None
+
+    def categorize(self, descriptions):
+        """Return a category_id (or None) for each description"""
+        return [self.match(description) for description in descriptions]
+
+
+_lock = threading.Lock()
+_cached = None  # (fingerprint, RuleMatcher)
+
+
+def _fingerprint():
+    """Cheap signature of the active rule set, so other workers' edits are seen"""
+    return tuple(db.session.query(
+        func.count(CategoryRule.id), func.max(CategoryRule.id)
+    ).filter(CategoryRule.is_active.is_(True)).one())
+
+
+def get_matcher():
+    """Return the process-wide matcher, compiling it if rules changed"""
+    global _cached
+    fingerprint = _fingerprint()
+    cached = _cached
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    with _lock:
+        if _cached is not None and _cached[0] == fingerprint:
+            return _cached[1]
+        rules = db.session.query(CategoryRule.pattern, CategoryRule.category_id, CategoryRule.id).filter(
+            CategoryRule.is_active.is_(True)
+        ).order_by(CategoryRule.id).all()
+        matcher = RuleMatcher(rules)
+        _cached = (fingerprint, matcher)
+        return matcher
+
+
+def invalidate():
+    """Drop the compiled matcher; called whenever rules are created or deleted"""
+    global _cached
+    with _lock:
+        _cached = None
+
+
+def categorize(descriptions):
+    """Batch categorize descriptions with the active rules -> list of category_ids"""
+    return get_matcher().categorize(descriptions)
+
+
+def recategorize(scope='uncategorized', start_date=None, end_date=None, dry_run=False, batch_size=5000):
+    """Re-run the active rules over stored transactions.
+
+    ``scope`` is 'uncategorized' (only rows without a category) or 'all'
+    (rules also override existing categories; rows no rule matches are left
+    alone). Transactions are read in id-ordered batches and every change is
+    applied with one UPDATE per target category and batch; the rollup is
+    refreshed once at the end. With ``dry_run`` nothing is written. The
+    caller commits.
+    """
+    if scope not in RECATEGORIZE_SCOPES:
+        raise ValueError(f"scope must be one of {', '.join(RECATEGORIZE_SCOPES)}")
+    matcher = get_matcher()
+
+    query = db.session.query(Transaction.id, Transaction.date, Transaction.description, Transaction.category_id)
+    if scope == 'uncategorized':
+        query = query.filter(Transaction.category_id.is_(None))
+    if start_date:
+        query = query.filter(Transaction.date >= start_date)
+    if end_date:
+        query = query.filter(Transaction.date <= end_date)
+
+    scanned = 0
+    changed_by_rule = Counter()
+    rollup_changes = set()
+    last_id = 0
+    while True:
+        rows = query.filter(Transaction.id > last_id).order_by(Transaction.id).limit(batch_size).all()
+        if not rows:
+            break
+        scanned += len(rows)
+        last_id = rows[-1].id
+
+        ids_by_category = defaultdict(list)
+        for row in rows:
+            hit = matcher.match_rule(row.description)
+            if hit is None or hit[1] == row.category_id:
+                continue
+            rule_id, category_id = hit
+            ids_by_category[category_id].append(row.id)
+            changed_by_rule[rule_id] += 1
+            rollup_changes.update([(row.date, row.category_id), (row.date, category_id)])
+
+        if not dry_run:
+            for category_id, ids in ids_by_category.items():
+                db.session.execute(
+                    update(Transaction).where(Transaction.id.in_(ids)).values(
+                        category_id=category_id, is_categorized=True
+                    ).execution_options(synchronize_session=False)
+                )
+
+    if rollup_changes and not dry_run:
+        rollup.refresh_transactions(rollup_changes)
+
+    rules = {r.id: r for r in CategoryRule.query.filter(CategoryRule.id.in_(list(changed_by_rule)))}
+    return {
+        'scope': scope,
+        'dry_run': dry_run,
+        'scanned': scanned,
+        'changed': sum(changed_by_rule.values()),
+        'rules': [{
+            'rule_id': rule_id,
+            'pattern': rules[rule_id].pattern,
+            'category_id': rules[rule_id].category_id,
+            'changed': count
+        } for rule_id, count in changed_by_rule.most_common()]
+    }
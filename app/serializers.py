@@ -0,0 +1,169 @@
+# app/serializers.py
+"""List serializers built from projected columns.
+
+Model ``to_dict`` methods follow relationships (``self.category``,
+``self.parent``, ``self.group``), which lazy-loads one extra SELECT per row
+when used on a list. These helpers take the already-filtered/ordered list
+query, join in the related names once and build the same payloads from plain
+result tuples, so each list endpoint costs a single query.
+
+The ``columnar_*`` variants return parallel arrays instead (see
+app/columnar.py): no category join, amounts left as integer cents.
+"""
+from sqlalchemy.orm import aliased
+
+from .money import to_dollars
+from .models import BudgetCategory, CategoryGroup, PlannedAmount, Transaction, CategoryRule, RecurringTemplate
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def serialize_categories(query):
+    """Payloads matching BudgetCategory.to_dict for a BudgetCategory query"""
+    parent = aliased(BudgetCategory)
+    group = aliased(CategoryGroup)
+    rows = query.outerjoin(parent, BudgetCategory.parent_id == parent.id).outerjoin(
+        group, BudgetCategory.group_id == group.id
+    ).with_entities(
+        BudgetCategory.id, BudgetCategory.name, BudgetCategory.category_type,
+        BudgetCategory.parent_id, parent.name.label('parent_name'),
+        BudgetCategory.is_parent_only, BudgetCategory.group_id,
+        group.name.label('group_name'), BudgetCategory.sort_order,
+        BudgetCategory.is_active
+    ).all()
+    return [{
+        'id': r.id,
+        'name': r.name,
+        'category_type': r.category_type,
+        'parent_id': r.parent_id,
+        'parent_name': r.parent_name,
+        'is_parent_only': r.is_parent_only,
+        'group_id': r.group_id,
+        'group_name': r.group_name,
+        'sort_order': r.sort_order,
+        'is_active': r.is_active
+    } for r in rows]
+
+
+def serialize_planned_amounts(query):
+    """Payloads matching PlannedAmount.to_dict for a PlannedAmount query"""
+    query, category = _with_category_name(query, PlannedAmount)
+    rows = query.with_entities(
+        PlannedAmount.id, PlannedAmount.category_id, category.name.label('category_name'),
+        PlannedAmount.pay_period_id, PlannedAmount.amount, PlannedAmount.is_cleared,
+        PlannedAmount.due_date
+    ).all()
+    return [{
+        'id': r.id,
+        'category_id': r.category_id,
+        'category_name': r.category_name,
+        'pay_period_id': r.pay_period_id,
+        'amount': to_dollars(r.amount),
+        'is_cleared': r.is_cleared,
+        'due_date': _iso(r.due_date)
+    } for r in rows]
+
+
+def serialize_transactions(query, limit=None):
+    """Payloads matching Transaction.to_dict for a Transaction query.
+
+    ``limit`` is applied after the category join (joins can't follow LIMIT).
+    """
+    query, category = _with_category_name(query, Transaction)
+    query = query.with_entities(
+        Transaction.id, Transaction.date, Transaction.description, Transaction.amount,
+        Transaction.category_id, category.name.label('category_name'),
+        Transaction.is_categorized, Transaction.matched_planned_id, Transaction.pay_period_id,
+        Transaction.notes
+    )
+    rows = (query.limit(limit) if limit is not None else query).all()
+    return [{
+        'id': r.id,
+        'date': r.date.isoformat(),
+        'description': r.description,
+        'amount': to_dollars(r.amount),
+        'category_id': r.category_id,
+        'category_name': r.category_name,
+        'is_categorized': r.is_categorized,
+        'matched_planned_id': r.matched_planned_id,
+        'pay_period_id': r.pay_period_id,
+        'notes': r.notes
+    } for r in rows]
+
+
+TRANSACTION_COLUMNS = ('id', 'date', 'description', 'amount_cents', 'category_id', 'is_categorized',
+                       'matched_planned_id', 'pay_period_id', 'notes')
+PLANNED_AMOUNT_COLUMNS = ('id', 'category_id', 'pay_period_id', 'amount_cents', 'is_cleared', 'due_date')
+
+
+def columnar_transactions(query, limit=None):
+    """TRANSACTION_COLUMNS as parallel lists for a Transaction query"""
+    query = query.with_entities(
+        Transaction.id, Transaction.date, Transaction.description, Transaction.amount,
+        Transaction.category_id, Transaction.is_categorized, Transaction.matched_planned_id,
+        Transaction.pay_period_id, Transaction.notes
+    )
+    rows = (query.limit(limit) if limit is not None else query).all()
+    columns = _transpose(TRANSACTION_COLUMNS, rows)
+    columns['date'] = [value.isoformat() for value in columns['date']]
+    return columns
+
+
+def columnar_planned_amounts(query):
+    """PLANNED_AMOUNT_COLUMNS as parallel lists for a PlannedAmount query"""
+    rows = query.with_entities(
+        PlannedAmount.id, PlannedAmount.category_id, PlannedAmount.pay_period_id,
+        PlannedAmount.amount, PlannedAmount.is_cleared, PlannedAmount.due_date
+    ).all()
+    columns = _transpose(PLANNED_AMOUNT_COLUMNS, rows)
+    columns['due_date'] = [_iso(value) for value in columns['due_date']]
+    return columns
+
+
+def _transpose(names, rows):
+    if not rows:
+        return {name: [] for name in names}
+    return dict(zip(names, map(list, zip(*rows))))
+
+
+def serialize_category_rules(query):
+    """Payloads matching CategoryRule.to_dict for a CategoryRule query"""
+    query, category = _with_category_name(query, CategoryRule)
+    rows = query.with_entities(
+        CategoryRule.id, CategoryRule.pattern, CategoryRule.category_id,
+        category.name.label('category_name'), CategoryRule.is_active
+    ).all()
+    return [{
+        'id': r.id,
+        'pattern': r.pattern,
+        'category_id': r.category_id,
+        'category_name': r.category_name,
+        'is_active': r.is_active
+    } for r in rows]
+
+
+def serialize_recurring_templates(query):
+    """Payloads matching RecurringTemplate.to_dict for a RecurringTemplate query"""
+    query, category = _with_category_name(query, RecurringTemplate)
+    rows = query.with_entities(
+        RecurringTemplate.id, RecurringTemplate.name, RecurringTemplate.category_id,
+        category.name.label('category_name'), RecurringTemplate.amount,
+        RecurringTemplate.frequency, RecurringTemplate.is_active
+    ).all()
+    return [{
+        'id': r.id,
+        'name': r.name,
+        'category_id': r.category_id,
+        'category_name': r.category_name,
+        'amount': to_dollars(r.amount),
+        'frequency': r.frequency,
+        'is_active': r.is_active
+    } for r in rows]
+
+
+def _with_category_name(query, model):
+    """Outer-join an aliased BudgetCategory so queries that already join it still work"""
+    category = aliased(BudgetCategory)
+    return query.outerjoin(category, model.category_id == category.id), category
@@ -30,29 +30,52 @@ export async function fetchData(url, method = 'GET', body = null) {
   }
 }
 
+/**
+ * Fetches one keyset page of transactions (newest first).
+ *
+ * @param {Object} [params={}] - Filters (start_date, end_date, category_id, uncategorized,
+ *   categorized, min_amount, max_amount, q) plus limit and the cursor returned by the
+ *   previous page. with_total: 1 also returns the number of matching rows.
+ * @returns {Promise<Object>} - { transactions, next_cursor, has_more[, total] }.
+ */
+export async function fetchTransactionsPage(params = {}) {
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+  ).toString();
+  return fetchData(`/transactions${query ? `?${query}` : ''}`);
+}
+
+/**
+ * Categorizes many transactions in one request.
+ *
+ * @param {Array<Object>} items - Entries of { transaction_id, category_id, auto_match }.
+ * @returns {Promise<Object>} - { updated, matched, errors, results } with one result per item.
+ */
+export async function categorizeTransactions(items) {
+  return fetchData('/transactions/categorize', 'POST', { items });
+}
+
 /**
  * Loads all necessary data for the application.
  *
+ * Uses the single /api/bootstrap snapshot. The server sends a strong ETag with
+ * Cache-Control: no-cache, so the browser revalidates and reuses its cached
+ * copy on a 304 when nothing has changed.
+ *
  * @returns {Promise<Object>} - An object containing categories, transactions, pay periods, category rules, and recurring templates.
  */
 export async function loadAllData() {
-  const [categories, transactions, payPeriods, categoryRules, recurringTemplates, plannedAmounts] = await Promise.all([
-    fetchData('/categories'),
-    fetchData('/transactions'),
-    fetchData('/pay-periods'),
-    fetchData('/category-rules'),
-    fetchData('/recurring-templates'),
-    fetchData('/planned-amounts'),
-    // fetchData('/category-groups')  // NEW: Load category groups
-  ]);
-  
+  const data = await fetchData('/bootstrap');
+  if (!data) return {};
+
   return {
-    categories,
-    transactions,
-    payPeriods,
-    categoryRules,
-    recurringTemplates,
-    plannedAmounts,
-    categoryGroups: await fetchData('/category-groups')  // NEW: Load category groups
+    categories: data.categories,
+    transactions: data.transactions.transactions,
+    transactionsCursor: data.transactions.next_cursor,
+    payPeriods: data.pay_periods,
+    categoryRules: data.category_rules,
+    recurringTemplates: data.recurring_templates,
+    plannedAmounts: data.planned_amounts,
+    categoryGroups: data.category_groups
   };
-}
\ No newline at end of file
+}
@@ -111,9 +111,6 @@ function setupEventListeners() {
   // Generate pay periods
   //document.getElementById('generatePeriodsBtn').addEventListener('click', generatePayPeriods);
     
-  // Transaction filter
-  document.getElementById('transactionFilter').addEventListener('change', initializeTransactions);
-    
   // Add rule button
  // document.getElementById('addRuleBtn').addEventListener('click', addCategoryRule);
   
@@ -3,24 +3,41 @@
 import { state } from './state.js';
 import { fetchData } from './api.js';  // For saving
 
+const WINDOW_PERIODS = 26;
+
+// start_date of the visible window; null means "from today"
+let windowStart = null;
+
 async function renderBudgetTable() {
   const table = document.getElementById('budgetTable');
   const thead = table.querySelector('thead tr');
   const tbody = table.querySelector('tbody');
 
+  // Pre-pivoted matrix for the visible window of pay periods
+  const params = new URLSearchParams({ count: WINDOW_PERIODS });
+  if (windowStart) params.set('start_date', windowStart);
+  const grid = await fetchData(`/budget-grid?${params}`);
+  if (!grid) return;
+  updateWindowControls(grid);
+
   thead.innerHTML = '<th>Category</th><th>Due Day</th>';
   tbody.innerHTML = '';
 
-  state.payPeriods.forEach(period => {
+  grid.periods.forEach(period => {
     const th = document.createElement('th');
     const date = new Date(period.start_date || period.startdate);
     th.textContent = `${date.getMonth() + 1}/${date.getDate()}/${String(date.getFullYear()).slice(-2)}`;
     thead.appendChild(th);
   });
 
-  const expenseCategories = state.categories.filter(c => c.category_type === 'expense' && !c.is_parent_only);
+  const categoriesById = new Map(state.categories.map(c => [Number(c.id), c]));
+  const width = grid.period_ids.length;
+
+  grid.category_ids.forEach((categoryId, row) => {
+    const category = categoriesById.get(Number(categoryId));
+    if (!category) return;
+    const offset = row * width;
 
-  expenseCategories.forEach(category => {
     const tr = document.createElement('tr');
     const tdName = document.createElement('td');
     tdName.textContent = category.name;
@@ -31,8 +48,8 @@ async function renderBudgetTable() {
     dueDaySelect.className = 'due-day-select';
     dueDaySelect.dataset.categoryId = category.id;
 
-    const existingPlanned = state.plannedAmounts.find(p => p.category_id === category.id && p.due_date);
-    let selectedDay = existingPlanned ? new Date(existingPlanned.due_date).getDate() : null;
+    const firstDue = grid.due_dates.slice(offset, offset + width).find(d => d);
+    let selectedDay = firstDue ? new Date(firstDue).getDate() : null;
 
     dueDaySelect.innerHTML = '<option value=""></option>';
     for (let day = 1; day <= 31; day++) {
@@ -47,17 +64,17 @@ async function renderBudgetTable() {
     tdDueDay.appendChild(dueDaySelect);
     tr.appendChild(tdDueDay);
 
-    state.payPeriods.forEach(period => {
+    grid.period_ids.forEach((periodId, col) => {
       const td = document.createElement('td');
-      const planned = state.plannedAmounts.find(p => Number(p.category_id) === Number(category.id) && Number(p.pay_period_id) === Number(period.id));
+      const amount = grid.amounts[offset + col];
       const input = document.createElement('input');
       input.type = 'number';
       input.step = '0.01';
       input.className = 'amount-input';
       input.dataset.categoryId = category.id;
-      input.dataset.periodId = period.id;
-      input.value = planned ? parseFloat(planned.amount).toFixed(2) : '';
-      if (planned && (planned.is_cleared || planned.iscleared)) td.classList.add('cleared');
+      input.dataset.periodId = periodId;
+      input.value = amount !== null ? parseFloat(amount).toFixed(2) : '';
+      if (grid.cleared[offset + col]) td.classList.add('cleared');
 
       input.addEventListener('change', savePlannedAmount);
       input.addEventListener('blur', formatCurrency);
@@ -71,6 +88,22 @@ async function renderBudgetTable() {
   });
 }
 
+function updateWindowControls(grid) {
+  const prev = document.getElementById('budgetPrevBtn');
+  const next = document.getElementById('budgetNextBtn');
+  if (!prev || !next) return;
+  prev.disabled = !grid.prev_start_date;
+  next.disabled = !grid.next_start_date;
+  prev.onclick = () => showWindow(grid.prev_start_date);
+  next.onclick = () => showWindow(grid.next_start_date);
+  document.getElementById('budgetTodayBtn').onclick = () => showWindow(null);
+}
+
+async function showWindow(startDate) {
+  windowStart = startDate;
+  await renderBudgetTable();
+}
+
 // NEW: Missing handlers from original
 async function setRecurringDueDate(event) {
   const select = event.target;
@@ -1,7 +1,6 @@
 // src/dashboard.js
 
-import { state } from './state.js';
-import { fetchData } from './api.js';
+import { fetchData, fetchTransactionsPage } from './api.js';
 
 let charts = {
   budgetVsActual: null,
@@ -12,7 +11,8 @@ export async function loadDashboard() {
   try {
     // Fetch real data (add this endpoint in routes.py if missing)
     const budgetData = await fetchData('/analytics/budget-vs-actual') || {};
-    const trendData = await fetchData('/analytics/spending-trend') || {};
+    // Monthly money out vs in with a 3-month rolling average of spend
+    const trendData = await fetchData('/analytics/spending-trend?granularity=month&split=type&rolling=3') || {};
 
     console.log('Dashboard data loaded:', { budgetData, trendData }); // debug
 
@@ -28,9 +28,9 @@ export async function loadDashboard() {
     // Add class for color: red if over, green if under
     document.getElementById('totalDiff').className = difference >= 0 ? 'text-success' : 'text-danger';
 
-    // Uncategorized count
-    const uncat = state.transactions.filter(t => !t.category_id).length;
-    document.getElementById('uncategorizedCount').textContent = uncat;
+    // Uncategorized count over all transactions, not just the pages loaded so far
+    const uncategorized = await fetchTransactionsPage({ uncategorized: 1, limit: 1, with_total: 1 });
+    document.getElementById('uncategorizedCount').textContent = uncategorized?.total ?? 0;
 
     // Charts (only init if canvas exists and data present)
     const ctx1 = document.getElementById('budgetVsActualChart');
@@ -49,7 +49,23 @@ export async function loadDashboard() {
       });
     }
 
-    // Add similar for spendingTrendChart if you have data
+    const ctx2 = document.getElementById('spendingTrendChart');
+    if (ctx2 && trendData.series) {
+      if (charts.spendingTrend) charts.spendingTrend.destroy();
+      const expense = trendData.series.find(s => s.key === 'expense');
+      const income = trendData.series.find(s => s.key === 'income');
+      const datasets = [];
+      if (expense) {
+        datasets.push({ label: 'Spent', data: expense.values, borderColor: '#FF6384' });
+        datasets.push({ label: 'Spent (3-month avg)', data: expense.rolling_average, borderColor: '#FF9F40', borderDash: [6, 4] });
+      }
+      if (income) datasets.push({ label: 'Received', data: income.values, borderColor: '#4BC0C0' });
+      charts.spendingTrend = new Chart(ctx2, {
+        type: 'line',
+        data: { labels: trendData.buckets.map(b => b.slice(0, 7)), datasets },
+        options: { responsive: true, scales: { y: { beginAtZero: true } } }
+      });
+    }
 
   } catch (err) {
     console.error('Dashboard load failed:', err);
@@ -288,6 +288,23 @@ export function showUploadModal() {
     document.getElementById('uploadModal').classList.add('show');
 }
 
+/**
+ * Polls a background import job until it completes or fails.
+ *
+ * @param {string} statusUrl - The job URL returned by /api/transactions/import.
+ * @returns {Promise<Object>} - The final job record.
+ */
+async function waitForImportJob(statusUrl, intervalMs = 500) {
+    while (true) {
+        const response = await fetch(statusUrl);
+        const job = await response.json();
+        if (job.status === 'completed' || job.status === 'failed') {
+            return job;
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
 export async function uploadTransactions() {
     const fileInput = document.getElementById('fileInput');
     const file = fileInput.files[0];
@@ -307,8 +324,13 @@ export async function uploadTransactions() {
         });
         
         if (response.ok) {
-            const result = await response.json();
-            alert(result.message);
+            const job = await response.json();
+            const result = await waitForImportJob(job.status_url);
+            if (result.status === 'failed') {
+                alert('Error: ' + result.error);
+                return;
+            }
+            alert(`Imported ${result.rows_inserted} transactions (${result.rows_categorized} auto-categorized, ${result.rows_duplicate} duplicates skipped)`);
             document.getElementById('uploadModal').classList.remove('show');
             await loadAllData();
             renderTransactions();
@@ -7,6 +7,7 @@ import { loadAllData, fetchData } from './api.js';
 const state = {
   categories: [],
   transactions: [],
+  transactionsCursor: null,  // next_cursor of the last loaded transactions page
   payPeriods: [],
   categoryRules: [],
   recurringTemplates: [],
@@ -1,53 +1,20 @@
 // src/transactions.js
 
 import { state } from './state.js';
-import { fetchData } from './api.js';
+import { fetchData, fetchTransactionsPage, categorizeTransactions } from './api.js';
 
 async function renderTransactions() {
   // Your existing code...
     const tbody = document.querySelector('#transactionsTable tbody');
     tbody.innerHTML = '';
-    
-    const filter = document.getElementById('transactionFilter').value;
-    let filteredTransactions = state.transactions;
-    
-    if (filter === 'uncategorized') {
-        filteredTransactions = state.transactions.filter(t => !t.is_categorized);
-    } else if (filter === 'categorized') {
-        filteredTransactions = state.transactions.filter(t => t.is_categorized);
-    }
-    
-    filteredTransactions.forEach(transaction => {
-        const tr = document.createElement('tr');
-        
-        tr.innerHTML = `
-            <td>${new Date(transaction.date).toLocaleDateString()}</td>
-            <td>${transaction.description}</td>
-            <td>$${parseFloat(transaction.amount).toFixed(2)}</td>
-            <td>
-                <select class="category-select" data-transaction-id="${transaction.id}">
-                    <option value="">Select category...</option>
-                    ${state.categories.map(c => 
-                        `<option value="${c.id}" ${c.id === transaction.category_id ? 'selected' : ''}>
-                            ${c.name}
-                        </option>`
-                    ).join('')}
-                </select>
-            </td>
-            <td>
-                <button class="btn btn-sm btn-success" onclick="categorizeTransaction(${transaction.id})">
-                    Categorize
-                </button>
-            </td>
-        `;
-        
-        tbody.appendChild(tr);
-    });
+
+    // Filters are applied by the server (see applyTransactionFilters), so
+    // every loaded row is shown
 
     // Filter out parent-only categories
     const assignableCategories = state.categories.filter(c => !c.is_parent_only);
     
-    filteredTransactions.forEach(transaction => {
+    state.transactions.forEach(transaction => {
         const tr = document.createElement('tr');
         tr.innerHTML = `
             <td>${new Date(transaction.date).toLocaleDateString()}</td>
@@ -64,60 +31,82 @@ async function renderTransactions() {
                 </select>
             </td>
             <td>
-                <button class="btn btn-sm btn-success" onclick="categorizeTransaction(${transaction.id})">Categorize</button>
+                <button class="btn btn-sm btn-success categorize-btn" data-transaction-id="${transaction.id}">Categorize</button>
             </td>
         `;
         tbody.appendChild(tr);
     });
     
-    // Add change listener to category selects
+    updateLoadMoreButton();
+
+    // Category changes are staged and saved together with "Save Categories"
     document.querySelectorAll('.category-select').forEach(select => {
+        const transactionId = parseInt(select.dataset.transactionId);
+        if (pendingCategories.has(transactionId)) select.value = pendingCategories.get(transactionId);
         select.addEventListener('change', function() {
-            const transactionId = parseInt(this.dataset.transactionId);
             const categoryId = parseInt(this.value);
             if (categoryId) {
-                categorizeTransaction(transactionId, categoryId);
+                pendingCategories.set(transactionId, categoryId);
+            } else {
+                pendingCategories.delete(transactionId);
             }
+            updateSaveCategoriesButton();
         });
     });
+
+    document.querySelectorAll('.categorize-btn').forEach(button => {
+        button.addEventListener('click', () => categorizeTransaction(parseInt(button.dataset.transactionId)));
+    });
+    updateSaveCategoriesButton();
 }
 
-async function categorizeTransaction(transactionId, categoryId) {
-    if (!categoryId) {
-        const select = document.querySelector(`select[data-transaction-id="${transactionId}"]`);
-        categoryId = parseInt(select.value);
-    }
-    
+// transaction id -> category id chosen in the table but not saved yet
+const pendingCategories = new Map();
+
+// Save one row's selected category
+async function categorizeTransaction(transactionId) {
+    const select = document.querySelector(`select[data-transaction-id="${transactionId}"]`);
+    const categoryId = parseInt(select?.value);
     if (!categoryId) {
         alert('Please select a category');
         return;
     }
-    
-    try {
-        const response = await fetch(`/api/transactions/${transactionId}/categorize`, {
-            method: 'PUT',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                category_id: categoryId,
-                auto_match: true
-            })
-        });
-        
-        if (response.ok) {
-            const updated = await response.json();
-            const index = state.transactions.findIndex(t => t.id === transactionId);
-            if (index >= 0) {
-                state.transactions[index] = updated;
-            }
-            renderTransactions();
-            alert('Transaction categorized successfully!');
-        }
-    } catch (error) {
-        console.error('Error categorizing transaction:', error);
-        alert('Error categorizing transaction');
+    await saveCategories([[transactionId, categoryId]]);
+}
+
+// Save every staged category change in one batch request
+async function savePendingCategories() {
+    if (pendingCategories.size) await saveCategories([...pendingCategories]);
+}
+
+async function saveCategories(entries) {
+    const result = await categorizeTransactions(entries.map(([transactionId, categoryId]) => ({
+        transaction_id: transactionId,
+        category_id: categoryId,
+        auto_match: true
+    })));
+    if (!result) return;
+
+    result.results.forEach((item, i) => {
+        if (item.status !== 'updated') return;
+        const transactionId = entries[i][0];
+        pendingCategories.delete(transactionId);
+        const index = state.transactions.findIndex(t => t.id === transactionId);
+        if (index >= 0 && item.transaction) state.transactions[index] = item.transaction;
+    });
+    renderTransactions();
+    if (result.errors) {
+        alert(`Categorized ${result.updated} transactions; ${result.errors} failed`);
     }
 }
 
+function updateSaveCategoriesButton() {
+    const button = document.getElementById('saveCategoriesBtn');
+    if (!button) return;
+    button.textContent = `Save Categories (${pendingCategories.size})`;
+    button.disabled = pendingCategories.size === 0;
+}
+
 
   // Add from original: auto-categorize on load if needed
   state.transactions.forEach(t => {
@@ -135,9 +124,54 @@ function autoCategorize(transaction) {
 
 
 
+// Server-side filters for the list; the bootstrap page is unfiltered
+function transactionFilters() {
+  const show = document.getElementById('transactionFilter')?.value;
+  return {
+    uncategorized: show === 'uncategorized' ? 1 : undefined,
+    categorized: show === 'categorized' ? 1 : undefined,
+    q: document.getElementById('transactionSearch')?.value.trim()
+  };
+}
+
+// Reload the first page for the current filters
+async function applyTransactionFilters() {
+  const page = await fetchTransactionsPage(transactionFilters());
+  if (!page) return;
+  state.transactions = page.transactions;
+  state.transactionsCursor = page.next_cursor;
+  renderTransactions();
+}
+
+// Append the next keyset page from the server
+async function loadMoreTransactions() {
+  if (!state.transactionsCursor) return;
+  const page = await fetchTransactionsPage({ ...transactionFilters(), cursor: state.transactionsCursor });
+  if (!page) return;
+  state.transactions.push(...page.transactions);
+  state.transactionsCursor = page.next_cursor;
+  renderTransactions();
+}
+
+function updateLoadMoreButton() {
+  const button = document.getElementById('loadMoreTransactionsBtn');
+  if (button) button.style.display = state.transactionsCursor ? '' : 'none';
+}
+
+let listenersReady = false;
+let searchTimer = null;
+
 function setupTransactionEventListeners() {
-  // Filters, imports, etc. from original
-  document.getElementById('transactionFilter')?.addEventListener('change', renderTransactions);
+  // Tab switches call initializeTransactions again; register once
+  if (listenersReady) return;
+  listenersReady = true;
+  document.getElementById('transactionFilter')?.addEventListener('change', applyTransactionFilters);
+  document.getElementById('transactionSearch')?.addEventListener('input', () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(applyTransactionFilters, 300);
+  });
+  document.getElementById('loadMoreTransactionsBtn')?.addEventListener('click', loadMoreTransactions);
+  document.getElementById('saveCategoriesBtn')?.addEventListener('click', savePendingCategories);
 }
 
 export async function initializeTransactions() {
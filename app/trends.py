@@ -0,0 +1,252 @@
+# app/trends.py
+"""Spending trends bucketed by day, week, month or pay period.
+
+``spending_trend`` returns money out (``spent``), money in (``received``) or
+their sum (``net``) per bucket over a bounded date window. The result can be
+one series, one per category or category group, or an expense/income pair.
+It can also carry a trailing rolling average.
+
+Pay period buckets are read from the category_period_actuals rollup, so they
+cost one row per category and period. Calendar buckets are aggregated in SQL
+over the window's transactions only. PostgreSQL buckets with date_trunc;
+SQLite uses strftime and date arithmetic. Empty buckets are filled with zeros
+afterwards, so every series has exactly one value per bucket.
+"""
+from bisect import bisect_right
+from datetime import date, timedelta
+
+from sqlalchemy import Date, Integer, case, cast, func, literal_column, select
+
+from . import pay_periods
+from .extensions import db
+from .models import BudgetCategory, CategoryGroup, CategoryPeriodActual, Transaction
+from .money import to_dollars
+
+
+GRANULARITIES = ('day', 'week', 'month', 'pay_period')
+SPLITS = ('none', 'category', 'group', 'type')
+MEASURES = ('spent', 'received', 'net')
+# Bounds the work per request regardless of how much history there is
+MAX_BUCKETS = 400
+MAX_ROLLING = 52
+DEFAULT_WINDOW_DAYS = {'day': 90, 'week': 364, 'month': 365, 'pay_period': 364}
+
+
+def bucket_start(day, granularity):
+    """First day of the calendar bucket containing ``day`` (weeks start on Monday)"""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, granularity):
+    if granularity == 'week':
+        return start + timedelta(days=7)
+    if granularity == 'month':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def previous_bucket(start, granularity):
+    if granularity == 'week':
+        return start - timedelta(days=7)
+    if granularity == 'month':
+        return (start - timedelta(days=1)).replace(day=1)
+    return start - timedelta(days=1)
+
+
+def _calendar_buckets(granularity, start_date, end_date, lead):
+    """Bucket start dates covering the window, preceded by ``lead`` extra buckets"""
+    first = bucket_start(start_date, granularity)
+    starts = []
+    current = first
+    while current <= end_date:
+        starts.append(current)
+        if len(starts) > MAX_BUCKETS:
+            raise ValueError(f'Window too long for {granularity} buckets (max {MAX_BUCKETS})')
+        current = next_bucket(current, granularity)
+    for _ in range(lead):
+        first = previous_bucket(first, granularity)
+        starts.insert(0, first)
+    return starts
+
+
+def _period_buckets(start_date, end_date, lead):
+    """Pay periods overlapping the window, preceded by up to ``lead`` earlier ones.
+
+    Returns (start dates, period ids, last period's end date, lead actually used).
+    """
+    index = pay_periods.get_index()
+    lo = max(bisect_right(index.starts, start_date) - 1, 0)
+    if lo < len(index) and index.ends[lo] < start_date:
+        lo += 1
+    hi = bisect_right(index.starts, end_date)
+    if hi - lo > MAX_BUCKETS:
+        raise ValueError(f'Window too long for pay_period buckets (max {MAX_BUCKETS})')
+    if hi <= lo:
+        return [], [], end_date, 0
+    first = max(lo - lead, 0)
+    return index.starts[first:hi], index.ids[first:hi], index.ends[hi - 1], lo - first
+
+
+def _bucket_expression(granularity, dialect):
+    """SQL expression mapping Transaction.date to its bucket's start date"""
+    if granularity == 'day':
+        return Transaction.date
+    # Constants are inlined so the SELECT and GROUP BY expressions compare equal
+    if dialect == 'sqlite':
+        if granularity == 'month':
+            return func.strftime(literal_column("'%Y-%m-01'"), Transaction.date, type_=Date)
+        # strftime('%w') is 0 for Sunday; step back to Monday
+        weekday = (cast(func.strftime(literal_column("'%w'"), Transaction.date), Integer) + 6) % 7
+        return func.date(Transaction.date, func.printf(literal_column("'-%d days'"), weekday), type_=Date)
+    return cast(func.date_trunc(literal_column(f"'{granularity}'"), Transaction.date), Date)
+
+
+def _sums(amount):
+    return (
+        func.coalesce(func.sum(case((amount < 0, amount), else_=0)), 0),
+        func.coalesce(func.sum(case((amount > 0, amount), else_=0)), 0),
+    )
+
+
+def _calendar_select(granularity, split, start_date, stop_date, dialect):
+    """(bucket, key, spent, received) per bucket for transactions in [start_date, stop_date)"""
+    bucket = _bucket_expression(granularity, dialect).label('bucket')
+    columns = [bucket]
+    query_from = Transaction.__table__
+    if split == 'category':
+        columns.append(Transaction.category_id.label('key'))
+    elif split == 'group':
+        columns.append(BudgetCategory.group_id.label('key'))
+        query_from = query_from.outerjoin(BudgetCategory.__table__, Transaction.category_id == BudgetCategory.id)
+    query = select(*columns, *_sums(Transaction.amount)).select_from(query_from).where(
+        Transaction.date >= start_date, Transaction.date < stop_date
+    )
+    return query.group_by(*columns)
+
+
+def _period_select(split, period_ids):
+    """(pay_period_id, key, spent, received) per period from the rollup"""
+    columns = [CategoryPeriodActual.pay_period_id]
+    query_from = CategoryPeriodActual.__table__
+    if split == 'category':
+        columns.append(CategoryPeriodActual.category_id.label('key'))
+    elif split == 'group':
+        columns.append(BudgetCategory.group_id.label('key'))
+        query_from = query_from.outerjoin(BudgetCategory.__table__,
+                                          CategoryPeriodActual.category_id == BudgetCategory.id)
+    query = select(
+        *columns,
+        func.coalesce(func.sum(CategoryPeriodActual.spent), 0),
+        func.coalesce(func.sum(CategoryPeriodActual.received), 0)
+    ).select_from(query_from).where(CategoryPeriodActual.pay_period_id.in_(period_ids))
+    return query.group_by(*columns)
+
+
+def _labels(split, keys):
+    """Display name per series key"""
+    if split == 'category':
+        names = dict(db.session.query(BudgetCategory.id, BudgetCategory.name).filter(
+            BudgetCategory.id.in_([k for k in keys if k is not None])
+        ).all())
+        return {key: names.get(key, 'Uncategorized') for key in keys}
+    if split == 'group':
+        names = dict(db.session.query(CategoryGroup.id, CategoryGroup.name).filter(
+            CategoryGroup.id.in_([k for k in keys if k is not None])
+        ).all())
+        return {key: names.get(key, 'Uncategorized') for key in keys}
+    return {'total': 'Total', 'expense': 'Expense', 'income': 'Income'}
+
+
+def _rolling_average(values, window):
+    """Trailing mean over ``window`` buckets; None until the window is full"""
+    averages = []
+    running = 0
+    for i, value in enumerate(values):
+        running += value
+        if i >= window:
+            running -= values[i - window]
+        averages.append(round(running / window / 100, 2) if i >= window - 1 else None)
+    return averages
+
+
+def spending_trend(granularity='pay_period', split='none', measure='spent', start_date=None, end_date=None,
+                   rolling=None):
+    """Bucketed trend for the window [start_date, end_date].
+
+    Calendar windows are widened to whole buckets. Amounts are dollars;
+    ``spent`` and ``received`` are positive, ``net`` is received minus spent.
+    Series with no activity in the window are omitted and the rest are
+    ordered by their absolute total, largest first.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+    if split not in SPLITS:
+        raise ValueError(f"split must be one of {', '.join(SPLITS)}")
+    if measure not in MEASURES:
+        raise ValueError(f"measure must be one of {', '.join(MEASURES)}")
+    if rolling is not None and not 1 <= rolling <= MAX_ROLLING:
+        raise ValueError(f'rolling must be between 1 and {MAX_ROLLING}')
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=DEFAULT_WINDOW_DAYS[granularity])
+    if start_date > end_date:
+        raise ValueError('start_date must not be after end_date')
+
+    # Earlier buckets feed the first rolling averages but aren't returned
+    lead = (rolling or 1) - 1
+    if granularity == 'pay_period':
+        starts, period_ids, window_end, lead = _period_buckets(start_date, end_date, lead)
+        position = {period_id: i for i, period_id in enumerate(period_ids)}
+        rows = db.session.execute(_period_select(split, period_ids)).all() if period_ids else []
+    else:
+        starts = _calendar_buckets(granularity, start_date, end_date, lead)
+        position = {start: i for i, start in enumerate(starts)}
+        stop_date = next_bucket(starts[-1], granularity)
+        rows = db.session.execute(
+            _calendar_select(granularity, split, starts[0], stop_date, db.engine.dialect.name)
+        ).all()
+        window_end = stop_date - timedelta(days=1)
+
+    # Dense per-series arrays of cents, one slot per bucket
+    series = {}
+    for bucket, *key, spent, received in rows:
+        i = position[bucket]
+        if split == 'type':
+            series.setdefault('expense', [0] * len(starts))[i] -= spent
+            series.setdefault('income', [0] * len(starts))[i] += received
+        else:
+            value = {'spent': -spent, 'received': received, 'net': spent + received}[measure]
+            series.setdefault(key[0] if key else 'total', [0] * len(starts))[i] += value
+
+    labels = _labels(split, list(series))
+    visible = slice(lead, None)
+    result = []
+    for key, values in series.items():
+        shown = values[visible]
+        if not any(shown):
+            continue
+        entry = {
+            'key': key,
+            'label': labels[key],
+            'values': [to_dollars(value) for value in shown],
+            'total': to_dollars(sum(shown)),
+        }
+        if rolling:
+            entry['rolling_average'] = _rolling_average(values, rolling)[visible]
+        result.append(entry)
+    result.sort(key=lambda entry: abs(entry['total']), reverse=True)
+
+    buckets = starts[visible]
+    return {
+        'granularity': granularity,
+        'split': split,
+        'measure': measure,
+        'rolling': rolling,
+        'start_date': buckets[0].isoformat() if buckets else start_date.isoformat(),
+        'end_date': window_end.isoformat(),
+        'buckets': [start.isoformat() for start in buckets],
+        'series': result,
+    }
@@ -0,0 +1,114 @@
+# app/versions.py
+"""Per-table change counters for ETags.
+
+Session events record which tables a transaction wrote to, both for unit of
+work flushes and for bulk ORM insert/update/delete statements, and bump their
+counters in ``table_versions`` just before the commit. Code that writes
+through a raw DBAPI cursor (e.g. COPY) must call ``touch()`` itself.
+
+Other modules can ``subscribe()`` to be told which tables each successful
+commit wrote (the analytics response cache uses this for invalidation).
+"""
+import hashlib
+
+from sqlalchemy import event
+
+from .extensions import db
+from .models import TableVersion
+
+
+TOUCHED_KEY = 'touched_tables'
+COMMITTED_KEY = 'committed_tables'
+
+_subscribers = []
+
+
+def touch(*table_names, session=None):
+    """Mark tables as written in the current transaction"""
+    session = session or db.session
+    session.info.setdefault(TOUCHED_KEY, set()).update(table_names)
+
+
+def _after_flush(session, flush_context):
+    tables = {obj.__table__.name for obj in (*session.new, *session.dirty, *session.deleted)
+              if hasattr(obj, '__table__')}
+    if tables:
+        touch(*tables, session=session)
+
+
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            touch(table.name, session=orm_execute_state.session)
+
+
+def _before_commit(session):
+    # before_commit fires ahead of commit's own flush; flush now so its writes are counted
+    session.flush()
+    tables = session.info.pop(TOUCHED_KEY, set()) - {TableVersion.__tablename__}
+    if tables:
+        _bump(session.connection(), sorted(tables))
+        session.info[COMMITTED_KEY] = tables
+
+
+def _after_commit(session):
+    tables = session.info.pop(COMMITTED_KEY, None)
+    if tables:
+        for callback in _subscribers:
+            callback(tables)
+
+
+def _after_rollback(session):
+    session.info.pop(TOUCHED_KEY, None)
+    session.info.pop(COMMITTED_KEY, None)
+
+
+def subscribe(callback):
+    """Call ``callback(tables)`` after every commit that wrote to ``tables``"""
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+
+
+def _bump(connection, tables):
+    """Increment the counters for ``tables``, creating missing rows"""
+    table = TableVersion.__table__
+    name = connection.dialect.name
+    if name in ('postgresql', 'sqlite'):
+        if name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.table_name],
+            set_={'version': table.c.version + 1}
+        )
+        connection.execute(stmt, [{'table_name': t, 'version': 1} for t in tables])
+        return
+
+    for t in tables:
+        updated = connection.execute(
+            table.update().where(table.c.table_name == t).values(version=table.c.version + 1)
+        ).rowcount
+        if not updated:
+            connection.execute(table.insert().values(table_name=t, version=1))
+
+
+def init_app(app):
+    """Attach the session listeners (once per process)"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'do_orm_execute', _do_orm_execute)
+        event.listen(db.session, 'before_commit', _before_commit)
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
+
+
+def etag_for(tables):
+    """Strong ETag value derived from the current counters of ``tables``"""
+    rows = dict(db.session.query(TableVersion.table_name, TableVersion.version).filter(
+        TableVersion.table_name.in_(tables)
+    ).all())
+    state = ';'.join(f'{t}:{rows.get(t, 0)}' for t in sorted(tables))
+    return hashlib.sha1(state.encode()).hexdigest()
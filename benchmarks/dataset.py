@@ -0,0 +1,246 @@
+"""Seeded synthetic dataset for benchmarks.
+
+    flask db upgrade
+    python benchmarks/dataset.py --transactions 300000 --years 6 --rules 3000
+
+Fills the database named by DATABASE_URL (which should be empty) with
+category groups and categories, bi-weekly pay periods, planned amounts,
+recurring templates, category rules and transactions whose descriptions the
+rules partly match. The same seed and sizes always produce the same rows.
+``write_statement`` produces bank CSVs in the same style for import runs.
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.extensions import db  # noqa: E402
+from app.importer import dedupe_hash  # noqa: E402
+from app.money import format_cents  # noqa: E402
+from app.models import (BudgetCategory, CategoryGroup, CategoryRule, PayPeriod, PlannedAmount,  # noqa: E402
+                        RecurringTemplate, Transaction)
+from app.recurrence import FREQUENCIES  # noqa: E402
+from app import rollup  # noqa: E402
+
+
+MERCHANTS = [
+    'AMAZON MKTPLACE', 'WALMART SUPERCENTER', 'TARGET', 'KROGER', 'HY-VEE', 'DILLONS', 'COSTCO WHSE',
+    'SHELL OIL', 'QUIKTRIP', 'CASEYS GEN STORE', 'STARBUCKS', 'MCDONALDS', 'CHIPOTLE', 'TACO BELL',
+    'NETFLIX.COM', 'SPOTIFY USA', 'HULU', 'APPLE.COM/BILL', 'EVERGY KS', 'KANSAS GAS SERVICE',
+    'CITY OF TOPEKA WATER', 'COX COMMUNICATIONS', 'VERIZON WIRELESS', 'STATE FARM INSURANCE',
+    'HOME DEPOT', 'LOWES', 'WALGREENS', 'CVS PHARMACY', 'PETSMART', 'CHEWY.COM', 'UBER TRIP',
+    'LYFT RIDE', 'DELTA AIR', 'MARRIOTT', 'BEST BUY', 'GAMESTOP', 'OLD NAVY', 'KOHLS', 'PANERA BREAD',
+    'SUBWAY', 'DOMINOS PIZZA', 'PLANET FITNESS', 'ETSY', 'EBAY', 'PAYPAL TRANSFER', 'VENMO PAYMENT',
+]
+CITIES = ['TOPEKA KS', 'LAWRENCE KS', 'KANSAS CITY MO', 'MANHATTAN KS', 'WICHITA KS', 'ONLINE']
+EXPENSE_GROUPS = ['Housing', 'Utilities', 'Food', 'Transportation', 'Insurance', 'Health', 'Entertainment',
+                  'Shopping', 'Personal', 'Savings', 'Debt', 'Misc']
+INCOME_GROUPS = ['Paychecks', 'Other Income', 'Misc']
+STORES_PER_MERCHANT = 400
+BATCH_SIZE = 10000
+
+
+@dataclass
+class DatasetSize:
+    categories: int = 60
+    years: int = 5
+    transactions: int = 300000
+    rules: int = 2000
+    templates: int = 25
+    seed: int = 42
+
+
+def describe(rng):
+    """A bank-style description and its (merchant, store) key"""
+    merchant = rng.randrange(len(MERCHANTS))
+    store = rng.randrange(STORES_PER_MERCHANT)
+    city = rng.choice(CITIES)
+    return f'POS {MERCHANTS[merchant]} #{store:04d} {city}', (merchant, store)
+
+
+def rule_pattern(key):
+    merchant, store = key
+    return f'{MERCHANTS[merchant]} #{store:04d}'
+
+
+def random_amount(rng):
+    """Cents: mostly small debits, occasional large bills and paychecks"""
+    roll = rng.random()
+    if roll < 0.04:
+        return rng.randrange(120000, 320000)
+    if roll < 0.10:
+        return -rng.randrange(20000, 180000)
+    return -(int(rng.lognormvariate(7.5, 1.0)) % 50000 + 99)
+
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def build(size=None, start=date(2020, 1, 3), log=print):
+    """Generate the whole dataset in the current app context and commit it"""
+    size = size or DatasetSize()
+    rng = random.Random(size.seed)
+    now = datetime.utcnow()
+
+    group_rows = [{'name': name, 'category_type': 'expense', 'sort_order': i, 'created_at': now}
+                  for i, name in enumerate(EXPENSE_GROUPS)]
+    group_rows += [{'name': name, 'category_type': 'income', 'sort_order': i, 'created_at': now}
+                   for i, name in enumerate(INCOME_GROUPS)]
+    _insert(CategoryGroup, group_rows)
+    groups = db.session.query(CategoryGroup.id, CategoryGroup.category_type).order_by(CategoryGroup.id).all()
+    expense_groups = [g.id for g in groups if g.category_type == 'expense']
+    income_groups = [g.id for g in groups if g.category_type == 'income']
+
+    income_count = max(2, size.categories // 10)
+    category_rows = [{
+        'name': f'{"Income" if i < income_count else "Expense"} {i:03d}',
+        'category_type': 'income' if i < income_count else 'expense',
+        'group_id': rng.choice(income_groups if i < income_count else expense_groups),
+        'sort_order': i,
+        'is_active': True,
+        'is_parent_only': False,
+        'created_at': now,
+    } for i in range(size.categories)]
+    _insert(BudgetCategory, category_rows)
+    categories = db.session.query(BudgetCategory.id, BudgetCategory.category_type).order_by(BudgetCategory.id).all()
+    expense_ids = [c.id for c in categories if c.category_type == 'expense']
+    income_ids = [c.id for c in categories if c.category_type == 'income']
+    log(f'{len(group_rows)} groups, {len(category_rows)} categories')
+
+    period_count = size.years * 26
+    _insert(PayPeriod, [{
+        'start_date': start + timedelta(days=14 * i),
+        'end_date': start + timedelta(days=14 * i + 13),
+        'created_at': now,
+    } for i in range(period_count)])
+    period_ids = [p.id for p in db.session.query(PayPeriod.id).order_by(PayPeriod.start_date)]
+    log(f'{period_count} pay periods')
+
+    # A planned amount for most expense categories in every period
+    planned_categories = expense_ids[:max(1, int(len(expense_ids) * 0.8))]
+    _insert(PlannedAmount, [{
+        'category_id': category_id,
+        'pay_period_id': period_id,
+        'amount': rng.randrange(2500, 80000),
+        'is_cleared': rng.random() < 0.5,
+        'created_at': now,
+        'updated_at': now,
+    } for period_id in period_ids for category_id in planned_categories])
+    log(f'{len(period_ids) * len(planned_categories)} planned amounts')
+
+    # Templates target the unplanned categories, so applying them has cells to fill
+    template_categories = expense_ids[len(planned_categories):] or expense_ids
+    _insert(RecurringTemplate, [{
+        'name': f'Template {i:03d}',
+        'category_id': rng.choice(template_categories),
+        'amount': rng.randrange(1000, 50000),
+        'frequency': rng.choice(FREQUENCIES),
+        'is_active': True,
+        'created_at': now,
+    } for i in range(size.templates)])
+
+    # Rules for distinct (merchant, store) keys; transactions hit them ~60% of the time
+    rule_keys = rng.sample([(m, s) for m in range(len(MERCHANTS)) for s in range(STORES_PER_MERCHANT)],
+                           min(size.rules, len(MERCHANTS) * STORES_PER_MERCHANT))
+    rule_category = {key: rng.choice(expense_ids) for key in rule_keys}
+    _insert(CategoryRule, [{
+        'pattern': rule_pattern(key), 'category_id': category_id, 'is_active': True, 'created_at': now
+    } for key, category_id in rule_category.items()])
+    log(f'{len(rule_keys)} category rules')
+
+    days = period_count * 14
+    seen = set()
+    batch = []
+    inserted = 0
+    while inserted < size.transactions:
+        amount = random_amount(rng)
+        offset = rng.randrange(days)
+        trans_date = start + timedelta(days=offset)
+        if amount > 0:
+            description, category_id = 'PAYROLL DIRECT DEP', rng.choice(income_ids)
+        elif rng.random() < 0.6 and rule_keys:
+            key = rng.choice(rule_keys)
+            description = f'POS {rule_pattern(key)} {rng.choice(CITIES)}'
+            category_id = rule_category[key]
+        else:
+            description, _ = describe(rng)
+            category_id = None
+        row_hash = dedupe_hash(trans_date, description, amount)
+        if row_hash in seen:
+            continue
+        seen.add(row_hash)
+        batch.append({
+            'date': trans_date,
+            'pay_period_id': period_ids[offset // 14],
+            'description': description,
+            'amount': amount,
+            'category_id': category_id,
+            'is_categorized': category_id is not None,
+            'dedupe_hash': row_hash,
+            'created_at': now,
+        })
+        inserted += 1
+        if len(batch) == BATCH_SIZE:
+            db.session.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(Transaction), batch)
+    log(f'{inserted} transactions')
+
+    cells = rollup.rebuild()
+    db.session.commit()
+    log(f'{cells} rollup cells')
+    return {
+        'category_ids': [c.id for c in categories],
+        'expense_category_ids': expense_ids,
+        'period_ids': period_ids,
+        'start_date': start,
+        'end_date': start + timedelta(days=days - 1),
+    }
+
+
+def write_statement(path, rows=5000, seed=0, start=date(2020, 1, 3), days=365, duplicate_share=0.05):
+    """Write a bank CSV with Date/Description/Amount/Reference columns.
+
+    About ``duplicate_share`` of the rows are repeated with different case and
+    spacing, as overlapping re-exports are.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for i in range(rows):
+        description, _ = describe(rng)
+        trans_date = start + timedelta(days=rng.randrange(days))
+        lines.append([trans_date.strftime('%m/%d/%Y'), description, format_cents(random_amount(rng)), ''])
+    for line in rng.sample(lines, int(rows * duplicate_share)):
+        lines.append([line[0], '  ' + line[1].title().replace(' ', '  '), line[2], ''])
+    rng.shuffle(lines)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', 'Description', 'Amount', 'Reference'])
+        writer.writerows(lines)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for field, default in asdict(DatasetSize()).items():
+        parser.add_argument(f'--{field}', type=int, default=default)
+    args = parser.parse_args()
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        build(DatasetSize(**vars(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Show the query plans chosen for the hot route queries.
+
+    flask db upgrade
+    python benchmarks/explain_plans.py              # EXPLAIN (plan only)
+    python benchmarks/explain_plans.py --analyze    # EXPLAIN ANALYZE on PostgreSQL
+
+Each entry mirrors a query issued by a route or by the importer/rollup, built
+with the same ORM expressions and compiled with literal parameters from the
+current data. Run it against a database of realistic size after changing
+indexes; the planner seq-scans small tables regardless.
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import select, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import BudgetCategory, CategoryPeriodActual, PayPeriod, PlannedAmount, Transaction  # noqa: E402
+from app import rollup, trends  # noqa: E402
+from app.importer import dedupe_hash  # noqa: E402
+
+
+def sample_values():
+    """A few real ids/dates so the planner sees representative constants"""
+    period_ids = [row.id for row in db.session.query(PayPeriod.id).order_by(PayPeriod.start_date.desc()).limit(26)]
+    category_ids = [row.id for row in db.session.query(BudgetCategory.id).limit(20)]
+    latest = db.session.query(db.func.max(Transaction.date)).scalar() or date.today()
+    return period_ids or [1], category_ids or [1], latest
+
+
+def hot_queries():
+    period_ids, category_ids, latest = sample_values()
+    month_ago = latest - timedelta(days=30)
+    return {
+        'transactions page (GET /api/transactions)': select(Transaction).order_by(
+            Transaction.date.desc(), Transaction.id.desc()
+        ).limit(101),
+        'transactions by category': select(Transaction).where(
+            Transaction.category_id == category_ids[0]
+        ).order_by(Transaction.date.desc(), Transaction.id.desc()).limit(101),
+        'transactions by date range': select(Transaction).where(
+            Transaction.date >= month_ago, Transaction.date <= latest
+        ).order_by(Transaction.date.desc(), Transaction.id.desc()).limit(101),
+        'import dedupe conflict check (dedupe_hash)': select(Transaction.id).where(
+            Transaction.dedupe_hash == dedupe_hash(latest, 'Coffee Shop', -1000)
+        ),
+        'pay period window (GET /api/budget-grid)': select(PayPeriod).where(
+            PayPeriod.end_date >= month_ago
+        ).order_by(PayPeriod.start_date).limit(26),
+        'active categories (GET /api/categories)': select(BudgetCategory).where(
+            BudgetCategory.is_active.is_(True)
+        ).order_by(BudgetCategory.category_type, BudgetCategory.sort_order),
+        'grid cells (GET /api/budget-grid)': select(PlannedAmount).where(
+            PlannedAmount.pay_period_id.in_(period_ids),
+            PlannedAmount.category_id.in_(category_ids)
+        ),
+        'rollup refresh aggregate': rollup._aggregate_select(period_ids[:2], category_ids[:3]),
+        'actuals per category (budget-vs-actual)': select(
+            CategoryPeriodActual.category_id, db.func.sum(CategoryPeriodActual.spent)
+        ).group_by(CategoryPeriodActual.category_id),
+        'spending trend by month and category (GET /api/analytics/spending-trend)': trends._calendar_select(
+            'month', 'category', latest - timedelta(days=365), latest, db.engine.dialect.name
+        ),
+        'spending trend by pay period and group': trends._period_select('group', period_ids),
+    }
+
+
+def explain(statement, analyze=False):
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    if dialect.name == 'postgresql':
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if analyze else 'EXPLAIN '
+    elif dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN '
+    rows = db.session.execute(text(prefix + sql)).all()
+    # SQLite returns (id, parent, notused, detail); PostgreSQL one text column
+    return [row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--analyze', action='store_true', help='Execute the queries (PostgreSQL only)')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        print(f'dialect: {db.engine.dialect.name}')
+        for name, statement in hot_queries().items():
+            print(f'\n== {name}')
+            for line in explain(statement, analyze=args.analyze):
+                print(f'   {line}')
+        db.session.rollback()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Startup-time benchmark based on `python -X importtime`.
+
+    python benchmarks/startup.py            # import app + create_app()
+    python benchmarks/startup.py --top 25   # show more of the slowest imports
+
+Each run happens in a fresh interpreter. The script reports the wall time of
+importing the package and building the app, the total import time, the
+slowest top-level imports (cumulative microseconds from -X importtime), and
+whether heavy optional dependencies such as pandas were loaded. Set
+DATABASE_URL like the app does; no connection is opened at startup.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only load on first use
+LAZY_MODULES = ('pandas', 'openpyxl', 'numpy')
+
+PROBE = f'''
+import sys, time
+started = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - started
+print('WALL', elapsed)
+print('LOADED', ','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))
+'''
+
+
+def run_once():
+    """Run the probe under -X importtime; returns (wall_s, loaded, imports)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    wall, loaded = None, []
+    for line in result.stdout.splitlines():
+        if line.startswith('WALL '):
+            wall = float(line.split()[1])
+        elif line.startswith('LOADED '):
+            loaded = [m for m in line.split(' ', 1)[1].split(',') if m]
+
+    # "import time: self [us] | cumulative | imported package"
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        # Nesting is shown by two extra spaces of indentation per level
+        imports.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return wall, loaded, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='Slowest top-level imports to list')
+    args = parser.parse_args()
+
+    walls = []
+    for _ in range(args.runs):
+        wall, loaded, imports = run_once()
+        walls.append(wall)
+
+    total_us = sum(self_us for _, self_us, _ in imports)
+    top_level = [(name, cumulative) for name, _, cumulative in imports
+                 if not name.startswith(' ')]
+    top_level.sort(key=lambda item: item[1], reverse=True)
+
+    print(f'create_app wall time over {args.runs} runs: '
+          f'median {statistics.median(walls) * 1000:.1f} ms, min {min(walls) * 1000:.1f} ms')
+    print(f'total import time (last run): {total_us / 1000:.1f} ms across {len(imports)} modules')
+    print(f'heavy modules loaded at startup: {", ".join(loaded) or "none"}')
+    print('\nslowest top-level imports (cumulative ms):')
+    for name, cumulative in top_level[:args.top]:
+        print(f'  {cumulative / 1000:8.1f}  {name}')
+
+
+if __name__ == '__main__':
+    main()
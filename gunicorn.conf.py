@@ -0,0 +1,31 @@
+# Gunicorn settings for the production entry point (wsgi:app).
+# Every value can be overridden from the environment.
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Threaded workers: requests mostly wait on PostgreSQL, so threads overlap
+# them cheaply while several processes use more than one core. Keep
+# workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) below PostgreSQL's max_connections.
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Imports run as background jobs, so requests stay short; upload parsing is
+# the slowest synchronous path
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Restart workers now and then to bound memory growth from large imports
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = 100
+
+# Each worker builds its own app, engine pool and import thread pool;
+# preloading would share pooled connections across fork()
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
@@ -0,0 +1,76 @@
+"""Small concurrent load test for comparing the dev server and gunicorn.
+
+    python run.py                                   # dev server on :5000
+    python loadtest.py --concurrency 16 --duration 15
+
+    gunicorn -c gunicorn.conf.py wsgi:app           # production server on :5000
+    python loadtest.py --concurrency 16 --duration 15
+
+Only the standard library is used, so it runs from any environment that can
+reach the app. Each worker thread keeps issuing GETs round-robin over the
+paths until the duration elapses.
+"""
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_PATHS = [
+    '/api/bootstrap',
+    '/api/transactions',
+    '/api/budget-grid',
+    '/api/analytics/budget-vs-actual',
+    '/api/analytics/spending-trend',
+]
+
+
+def worker(base_url, paths, deadline, offset):
+    latencies, errors, i = [], 0, offset
+    while time.perf_counter() < deadline:
+        url = base_url + paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                response.read()
+        except (urllib.error.URLError, OSError):
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000', help='Base URL of the running app')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='Path to request (repeatable); defaults to the main read endpoints')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    base_url = args.url.rstrip('/')
+    started = time.perf_counter()
+    deadline = started + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(
+            lambda n: worker(base_url, paths, deadline, n), range(args.concurrency)
+        ))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for result in results for l in result[0])
+    errors = sum(result[1] for result in results)
+    print(f'{args.concurrency} clients, {elapsed:.1f}s, {len(paths)} paths against {base_url}')
+    print(f'requests: {len(latencies)}  errors: {errors}  throughput: {len(latencies) / elapsed:.1f} req/s')
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f'latency ms: p50 {statistics.median(latencies) * 1000:.1f}  '
+              f'p95 {p95 * 1000:.1f}  max {latencies[-1] * 1000:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""add import_jobs table
+
+Revision ID: 0dd08ff25081
+Revises: 42e1f14b9fd6
+Create Date: 2026-10-17 09:12:04.118530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0dd08ff25081'
+down_revision = '42e1f14b9fd6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('import_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('rows_parsed', sa.Integer(), nullable=True),
+    sa.Column('rows_inserted', sa.Integer(), nullable=True),
+    sa.Column('rows_duplicate', sa.Integer(), nullable=True),
+    sa.Column('rows_invalid', sa.Integer(), nullable=True),
+    sa.Column('rows_categorized', sa.Integer(), nullable=True),
+    sa.Column('timings', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.CheckConstraint("status IN ('queued', 'running', 'completed', 'failed')", name='valid_job_status'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('import_jobs')
@@ -0,0 +1,28 @@
+"""add table_versions change counters
+
+Revision ID: 1c2d8f5dbf98
+Revises: 6034f35145ca
+Create Date: 2026-10-17 14:05:52.310446
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c2d8f5dbf98'
+down_revision = '6034f35145ca'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,28 @@
+"""add transaction keyset pagination indexes
+
+Revision ID: 407e776bad45
+Revises: 0dd08ff25081
+Create Date: 2026-10-17 10:02:47.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '407e776bad45'
+down_revision = '0dd08ff25081'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_date_id', ['date', 'id'], unique=False)
+        batch_op.create_index('ix_transactions_category_date_id', ['category_id', 'date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_category_date_id')
+        batch_op.drop_index('ix_transactions_date_id')
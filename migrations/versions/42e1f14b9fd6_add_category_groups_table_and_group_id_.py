@@ -1,7 +1,7 @@
 """add category_groups table and group_id to budget_categories
 
 Revision ID: 42e1f14b9fd6
-Revises: 
+Revises: 5b7e2c9a1f04
 Create Date: 2026-03-01 15:11:38.933217
 
 """
@@ -11,7 +11,7 @@ from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision = '42e1f14b9fd6'
-down_revision = None
+down_revision = '5b7e2c9a1f04'
 branch_labels = None
 depends_on = None
 
@@ -21,7 +21,7 @@ def upgrade():
     op.drop_table('categories')
     with op.batch_alter_table('budget_categories', schema=None) as batch_op:
         batch_op.add_column(sa.Column('group_id', sa.Integer(), nullable=True))
-        batch_op.create_foreign_key(None, 'category_groups', ['group_id'], ['id'])
+        batch_op.create_foreign_key('budget_categories_group_id_fkey', 'category_groups', ['group_id'], ['id'])
 
     with op.batch_alter_table('category_groups', schema=None) as batch_op:
         batch_op.drop_constraint(batch_op.f('category_groups_name_key'), type_='unique')
@@ -35,7 +35,7 @@ def downgrade():
         batch_op.create_unique_constraint(batch_op.f('category_groups_name_key'), ['name'], postgresql_nulls_not_distinct=False)
 
     with op.batch_alter_table('budget_categories', schema=None) as batch_op:
-        batch_op.drop_constraint(None, type_='foreignkey')
+        batch_op.drop_constraint('budget_categories_group_id_fkey', type_='foreignkey')
         batch_op.drop_column('group_id')
 
     op.create_table('categories',
@@ -0,0 +1,122 @@
+"""initial schema
+
+Revision ID: 5b7e2c9a1f04
+Revises: 
+Create Date: 2026-10-17 17:02:13.480615
+
+Tables as they stood before the first migration, when they were still created
+by db.create_all() at startup. Databases built that way already contain them
+and were stamped at a later revision, so this only runs on fresh databases.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c9a1f04'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('category_groups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('category_type', sa.String(length=20), nullable=False),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name', name='category_groups_name_key')
+    )
+    op.create_table('categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('category_type', sa.String(length=20), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['group_id'], ['category_groups.id'], name='categories_group_id_fkey'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('budget_categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('category_type', sa.String(length=20), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('is_parent_only', sa.Boolean(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.CheckConstraint("category_type IN ('expense', 'income')", name='valid_category_type'),
+    sa.ForeignKeyConstraint(['parent_id'], ['budget_categories.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('pay_periods',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('start_date')
+    )
+    op.create_table('planned_amounts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('pay_period_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('is_cleared', sa.Boolean(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['budget_categories.id']),
+    sa.ForeignKeyConstraint(['pay_period_id'], ['pay_periods.id']),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('category_id', 'pay_period_id', name='unique_category_period')
+    )
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('is_categorized', sa.Boolean(), nullable=True),
+    sa.Column('matched_planned_id', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['budget_categories.id']),
+    sa.ForeignKeyConstraint(['matched_planned_id'], ['planned_amounts.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('category_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pattern', sa.String(length=100), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['budget_categories.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('recurring_templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('frequency', sa.String(length=20), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['budget_categories.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('recurring_templates')
+    op.drop_table('category_rules')
+    op.drop_table('transactions')
+    op.drop_table('planned_amounts')
+    op.drop_table('pay_periods')
+    op.drop_table('budget_categories')
+    op.drop_table('categories')
+    op.drop_table('category_groups')
@@ -0,0 +1,40 @@
+"""add resolved pay_period_id to transactions
+
+Revision ID: 6034f35145ca
+Revises: 9600385b6b18
+Create Date: 2026-10-17 12:41:09.207718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6034f35145ca'
+down_revision = '9600385b6b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pay_period_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('transactions_pay_period_id_fkey', 'pay_periods', ['pay_period_id'], ['id'])
+        batch_op.create_index('ix_transactions_pay_period_id', ['pay_period_id'], unique=False)
+
+    # Backfill: the latest-starting period that contains each transaction date
+    op.execute("""
+        UPDATE transactions SET pay_period_id = (
+            SELECT p.id FROM pay_periods p
+            WHERE p.start_date <= transactions.date AND p.end_date >= transactions.date
+            ORDER BY p.start_date DESC
+            LIMIT 1
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_pay_period_id')
+        batch_op.drop_constraint('transactions_pay_period_id_fkey', type_='foreignkey')
+        batch_op.drop_column('pay_period_id')
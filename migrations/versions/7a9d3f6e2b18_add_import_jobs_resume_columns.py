@@ -0,0 +1,28 @@
+"""add resume columns to import_jobs
+
+Revision ID: 7a9d3f6e2b18
+Revises: e83b5d0c6a47
+Create Date: 2026-10-17 19:03:37.215640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a9d3f6e2b18'
+down_revision = 'e83b5d0c6a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('import_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('chunks_committed', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('filepath', sa.String(length=512), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('import_jobs', schema=None) as batch_op:
+        batch_op.drop_column('filepath')
+        batch_op.drop_column('chunks_committed')
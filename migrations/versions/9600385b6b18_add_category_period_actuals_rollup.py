@@ -0,0 +1,55 @@
+"""add category_period_actuals rollup table
+
+Revision ID: 9600385b6b18
+Revises: 407e776bad45
+Create Date: 2026-10-17 11:20:31.662054
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9600385b6b18'
+down_revision = '407e776bad45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('category_period_actuals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('pay_period_id', sa.Integer(), nullable=False),
+    sa.Column('spent', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('received', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['budget_categories.id'], ),
+    sa.ForeignKeyConstraint(['pay_period_id'], ['pay_periods.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('category_id', 'pay_period_id', name='unique_actual_category_period')
+    )
+    with op.batch_alter_table('category_period_actuals', schema=None) as batch_op:
+        batch_op.create_index('ix_category_period_actuals_pay_period_id', ['pay_period_id'], unique=False)
+
+    # Backfill from existing transactions (same as `flask rebuild-rollup`)
+    op.execute("""
+        INSERT INTO category_period_actuals
+            (category_id, pay_period_id, spent, received, transaction_count, updated_at)
+        SELECT t.category_id, p.id,
+               COALESCE(SUM(CASE WHEN t.amount < 0 THEN t.amount ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN t.amount > 0 THEN t.amount ELSE 0 END), 0),
+               COUNT(t.id),
+               CURRENT_TIMESTAMP
+        FROM transactions t
+        JOIN pay_periods p ON t.date >= p.start_date AND t.date <= p.end_date
+        GROUP BY t.category_id, p.id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('category_period_actuals', schema=None) as batch_op:
+        batch_op.drop_index('ix_category_period_actuals_pay_period_id')
+
+    op.drop_table('category_period_actuals')
@@ -0,0 +1,72 @@
+"""store money columns as integer cents
+
+Revision ID: b3e8d15c7f42
+Revises: 7a9d3f6e2b18
+Create Date: 2026-10-17 21:12:48.530917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8d15c7f42'
+down_revision = '7a9d3f6e2b18'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, precision of the old NUMERIC(p, 2) type)
+MONEY_COLUMNS = [
+    ('planned_amounts', 'amount', 10),
+    ('transactions', 'amount', 10),
+    ('recurring_templates', 'amount', 10),
+    ('category_period_actuals', 'spent', 12),
+    ('category_period_actuals', 'received', 12),
+]
+
+
+def upgrade():
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table, column, precision in MONEY_COLUMNS:
+        if postgresql:
+            # Convert in place; NUMERIC(p, 2) couldn't hold the scaled values first
+            op.alter_column(table, column, type_=sa.BigInteger(), existing_type=sa.Numeric(precision, 2),
+                            existing_nullable=False, postgresql_using=f'round({column} * 100)::bigint')
+            continue
+        # SQLite's NUMERIC columns take any value, so scale first and let the
+        # batch table copy cast to the new type
+        op.execute(f'UPDATE {table} SET {column} = round({column} * 100)')
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, type_=sa.BigInteger(), existing_type=sa.Numeric(precision, 2),
+                                  existing_nullable=False)
+
+    # 9600385b6b18 filled the rollup with a date-range join before transactions
+    # had pay_period_id; overlapping periods counted a transaction in each of
+    # them. Rebuild it from pay_period_id in cents (same as rollup.rebuild())
+    op.execute('DELETE FROM category_period_actuals')
+    op.execute("""
+        INSERT INTO category_period_actuals
+            (category_id, pay_period_id, spent, received, transaction_count, updated_at)
+        SELECT category_id, pay_period_id,
+               COALESCE(SUM(CASE WHEN amount < 0 THEN amount ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END), 0),
+               COUNT(id),
+               CURRENT_TIMESTAMP
+        FROM transactions
+        WHERE pay_period_id IS NOT NULL
+        GROUP BY category_id, pay_period_id
+    """)
+
+
+def downgrade():
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table, column, precision in reversed(MONEY_COLUMNS):
+        if postgresql:
+            op.alter_column(table, column, type_=sa.Numeric(precision, 2), existing_type=sa.BigInteger(),
+                            existing_nullable=False, postgresql_using=f'{column} / 100.0')
+            continue
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, type_=sa.Numeric(precision, 2), existing_type=sa.BigInteger(),
+                                  existing_nullable=False)
+        op.execute(f'UPDATE {table} SET {column} = {column} / 100.0')
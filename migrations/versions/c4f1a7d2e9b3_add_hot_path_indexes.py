@@ -0,0 +1,51 @@
+"""add indexes for the hot query paths
+
+Revision ID: c4f1a7d2e9b3
+Revises: 1c2d8f5dbf98
+Create Date: 2026-10-17 17:41:26.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1a7d2e9b3'
+down_revision = '1c2d8f5dbf98'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        # Superseded by the (pay_period_id, category_id, amount) index below
+        batch_op.drop_index('ix_transactions_pay_period_id')
+        batch_op.create_index('ix_transactions_period_category_amount',
+                              ['pay_period_id', 'category_id', 'amount'], unique=False)
+        batch_op.create_index('ix_transactions_matched_planned_id', ['matched_planned_id'], unique=False)
+
+    with op.batch_alter_table('pay_periods', schema=None) as batch_op:
+        batch_op.create_index('ix_pay_periods_end_date', ['end_date'], unique=False)
+
+    with op.batch_alter_table('planned_amounts', schema=None) as batch_op:
+        batch_op.create_index('ix_planned_amounts_pay_period_id', ['pay_period_id'], unique=False)
+
+    with op.batch_alter_table('budget_categories', schema=None) as batch_op:
+        batch_op.create_index('ix_budget_categories_active_type_sort',
+                              ['is_active', 'category_type', 'sort_order'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('budget_categories', schema=None) as batch_op:
+        batch_op.drop_index('ix_budget_categories_active_type_sort')
+
+    with op.batch_alter_table('planned_amounts', schema=None) as batch_op:
+        batch_op.drop_index('ix_planned_amounts_pay_period_id')
+
+    with op.batch_alter_table('pay_periods', schema=None) as batch_op:
+        batch_op.drop_index('ix_pay_periods_end_date')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_matched_planned_id')
+        batch_op.drop_index('ix_transactions_period_category_amount')
+        batch_op.create_index('ix_transactions_pay_period_id', ['pay_period_id'], unique=False)
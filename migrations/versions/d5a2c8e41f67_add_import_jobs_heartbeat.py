@@ -0,0 +1,26 @@
+"""add heartbeat_at to import_jobs
+
+Revision ID: d5a2c8e41f67
+Revises: b3e8d15c7f42
+Create Date: 2026-10-17 23:41:09.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a2c8e41f67'
+down_revision = 'b3e8d15c7f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('import_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('import_jobs', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
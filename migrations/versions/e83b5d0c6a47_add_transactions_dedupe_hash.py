@@ -0,0 +1,86 @@
+"""add unique dedupe_hash to transactions
+
+Revision ID: e83b5d0c6a47
+Revises: c4f1a7d2e9b3
+Create Date: 2026-10-17 18:20:51.377902
+
+"""
+import hashlib
+from decimal import Decimal
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e83b5d0c6a47'
+down_revision = 'c4f1a7d2e9b3'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def _dedupe_hash(trans_date, description, amount):
+    # Same normalization as app.importer.dedupe_hash at this revision (no
+    # bank reference is known for existing rows)
+    key = '\x1f'.join([
+        trans_date.isoformat(),
+        ' '.join(description.split()).lower(),
+        str(Decimal(str(amount)).quantize(Decimal('0.01'))),
+        '',
+    ])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('dedupe_hash', sa.String(length=64), nullable=True))
+
+    # Only imported rows get a hash. Nothing recorded which existing rows came
+    # from a statement, but the importer has never set notes, so rows with
+    # notes are manual entries and stay NULL. The rest are treated as
+    # imported; a manual entry among them can only block a later import of
+    # the very same date/description/amount. Backfill in id order; rows whose
+    # key already appeared keep NULL, so duplicates imported before this
+    # revision don't block the constraint
+    bind = op.get_bind()
+    transactions = sa.table(
+        'transactions',
+        sa.column('id', sa.Integer), sa.column('date', sa.Date),
+        sa.column('description', sa.String), sa.column('amount', sa.Numeric(10, 2)),
+        sa.column('notes', sa.Text), sa.column('dedupe_hash', sa.String)
+    )
+    seen = set()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(transactions.c.id, transactions.c.date, transactions.c.description, transactions.c.amount)
+            .where(transactions.c.id > last_id)
+            .where(sa.func.coalesce(transactions.c.notes, '') == '')
+            .order_by(transactions.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            row_hash = _dedupe_hash(row.date, row.description, row.amount)
+            if row_hash not in seen:
+                seen.add(row_hash)
+                updates.append({'row_id': row.id, 'row_hash': row_hash})
+        if updates:
+            bind.execute(
+                transactions.update().where(transactions.c.id == sa.bindparam('row_id'))
+                .values(dedupe_hash=sa.bindparam('row_hash')),
+                updates
+            )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_transaction_dedupe_hash', ['dedupe_hash'])
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_constraint('unique_transaction_dedupe_hash', type_='unique')
+        batch_op.drop_column('dedupe_hash')
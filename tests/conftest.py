@@ -0,0 +1,48 @@
+"""Shared fixtures: an app on a fresh SQLite database migrated to head."""
+import os
+
+import pytest
+from flask_migrate import upgrade
+
+from app import create_app, pay_periods, rules
+from app.extensions import db
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+def make_app(tmp_path, monkeypatch, revision='head'):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS, revision=revision)
+    return app
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_caches():
+    # The pay period index and rule matcher are cached per process and keyed
+    # on cheap fingerprints that two test databases can share
+    pay_periods.invalidate()
+    rules.invalidate()
+    yield
+    pay_periods.invalidate()
+    rules.invalidate()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    app = make_app(tmp_path, monkeypatch)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def ctx(app):
+    """An app context for tests that work with the session directly"""
+    with app.app_context():
+        yield
+        db.session.remove()
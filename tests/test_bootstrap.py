@@ -0,0 +1,54 @@
+"""Bootstrap payload revalidation through per-table change counters."""
+from app.extensions import db
+from app.importer import import_statement
+from app.models import BudgetCategory
+
+
+def test_unchanged_data_revalidates_with_304(app):
+    client = app.test_client()
+
+    first = client.get('/api/bootstrap')
+    again = client.get('/api/bootstrap', headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert set(first.get_json()) >= {'categories', 'pay_periods', 'transactions', 'category_rules'}
+    assert again.status_code == 304
+    assert again.headers['ETag'] == first.headers['ETag']
+    assert again.data == b''
+
+
+def test_writes_change_the_etag(app, tmp_path):
+    client = app.test_client()
+    etags = [client.get('/api/bootstrap').headers['ETag']]
+
+    client.post('/api/transactions', json={'date': '2026-01-02', 'description': 'Deli', 'amount': -5})
+    etags.append(client.get('/api/bootstrap').headers['ETag'])
+
+    statement = tmp_path / 'jan.csv'
+    statement.write_text('Date,Description,Amount\n2026-01-03,Market,-40.00\n')
+    with app.app_context():
+        import_statement(str(statement))
+    etags.append(client.get('/api/bootstrap').headers['ETag'])
+
+    with app.app_context():
+        db.session.add(BudgetCategory(name='Food', category_type='expense'))
+        db.session.commit()
+    response = client.get('/api/bootstrap', headers={'If-None-Match': etags[-1]})
+
+    assert response.status_code == 200
+    assert len(set(etags + [response.headers['ETag']])) == 4
+    assert [c['name'] for c in response.get_json()['categories']] == ['Food']
+
+
+def test_rolled_back_writes_keep_the_etag(app):
+    client = app.test_client()
+    etag = client.get('/api/bootstrap').headers['ETag']
+
+    with app.app_context():
+        db.session.add(BudgetCategory(name='Scratch', category_type='expense'))
+        db.session.flush()
+        db.session.rollback()
+    client.post('/api/category-rules/apply', json={'scope': 'all', 'dry_run': True})
+
+    assert client.get('/api/bootstrap', headers={'If-None-Match': etag}).status_code == 304
@@ -0,0 +1,56 @@
+"""Pre-pivoted budget grid windows."""
+import pytest
+
+from app.extensions import db
+from app.models import BudgetCategory
+
+
+@pytest.fixture
+def budget(app):
+    """Four biweekly periods from 2026-01-01, two expense and one income category"""
+    with app.app_context():
+        food = BudgetCategory(name='Food', category_type='expense', sort_order=1)
+        rent = BudgetCategory(name='Rent', category_type='expense', sort_order=2)
+        pay = BudgetCategory(name='Salary', category_type='income', sort_order=1)
+        db.session.add_all([food, rent, pay])
+        db.session.commit()
+        ids = food.id, rent.id, pay.id
+        db.session.remove()
+
+    client = app.test_client()
+    periods = client.post('/api/pay-periods', json={'start_date': '2026-01-01', 'generate_count': 4}).get_json()
+    return ids, [p['id'] for p in sorted(periods, key=lambda p: p['startdate'])]
+
+
+def test_cells_are_dense_and_row_major(app, budget):
+    (food, rent, _), periods = budget
+    client = app.test_client()
+    client.post('/api/planned-amounts', json={'category_id': rent, 'pay_period_id': periods[2],
+                                              'amount': 1200.5, 'due_date': '2026-02-01'})
+
+    grid = client.get('/api/budget-grid?start_date=2026-01-20&count=2').get_json()
+
+    assert grid['category_ids'] == [food, rent]
+    assert grid['period_ids'] == periods[1:3]
+    assert grid['amounts'] == [None, None, None, 1200.5]
+    assert grid['due_dates'] == [None, None, None, '2026-02-01']
+    assert grid['cleared'] == [False] * 4
+    assert (grid['prev_start_date'], grid['next_start_date']) == ('2026-01-01', '2026-02-12')
+
+
+def test_window_edges(app, budget):
+    (_, _, pay), periods = budget
+    client = app.test_client()
+
+    first = client.get('/api/budget-grid?start_date=2026-01-01&count=2&category_type=income').get_json()
+    past_the_end = client.get('/api/budget-grid?start_date=2027-01-01&count=2').get_json()
+
+    assert first['category_ids'] == [pay]
+    assert (first['prev_start_date'], first['next_start_date']) == (None, '2026-01-29')
+    # Nothing ahead of start_date falls back to the latest window
+    assert past_the_end['period_ids'] == periods[2:]
+    assert past_the_end['next_start_date'] is None
+
+
+def test_invalid_start_date_is_rejected(app, budget):
+    assert app.test_client().get('/api/budget-grid?start_date=2026-13-01').status_code == 400
@@ -0,0 +1,69 @@
+"""Analytics response cache: hits, write invalidation and the default window."""
+from datetime import date
+
+import pytest
+
+from app import routes, trends
+from app.extensions import db
+from app.models import Transaction
+
+TREND = '/api/analytics/spending-trend?granularity=day'
+
+
+class FrozenDate(date):
+    today_value = date(2026, 3, 10)
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    monkeypatch.setattr(routes, 'date', FrozenDate)
+    monkeypatch.setattr(trends, 'date', FrozenDate)
+    with app.app_context():
+        db.session.add(Transaction(date=date(2026, 3, 9), description='Coffee', amount=-450))
+        db.session.commit()
+        db.session.remove()
+    return app.test_client()
+
+
+def test_second_request_is_a_hit(client):
+    first = client.get(TREND)
+    second = client.get(TREND)
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json()
+
+
+def test_write_retires_the_entry(client, app):
+    client.get(TREND)
+    with app.app_context():
+        db.session.add(Transaction(date=date(2026, 3, 10), description='Lunch', amount=-1200))
+        db.session.commit()
+
+    response = client.get(TREND)
+
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['series'][0]['total'] == 16.5
+
+
+def test_default_window_moves_with_the_date(client, monkeypatch):
+    assert client.get(TREND).get_json()['end_date'] == '2026-03-10'
+
+    monkeypatch.setattr(FrozenDate, 'today_value', date(2026, 3, 11))
+    response = client.get(TREND)
+
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['end_date'] == '2026-03-11'
+
+
+def test_explicit_window_ignores_the_date(client, monkeypatch):
+    url = TREND + '&start_date=2026-03-01&end_date=2026-03-10'
+    client.get(url)
+
+    monkeypatch.setattr(FrozenDate, 'today_value', date(2026, 3, 11))
+
+    assert client.get(url).headers['X-Cache'] == 'HIT'
@@ -0,0 +1,53 @@
+"""POST /api/transactions/categorize: many rows and planned matches per request."""
+from datetime import date
+
+import pytest
+
+from app.extensions import db
+from app.models import BudgetCategory, CategoryPeriodActual, PayPeriod, PlannedAmount, Transaction
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        food = BudgetCategory(name='Food', category_type='expense')
+        period = PayPeriod(start_date=date(2026, 4, 1), end_date=date(2026, 4, 14))
+        db.session.add_all([food, period])
+        db.session.flush()
+        planned = PlannedAmount(category_id=food.id, pay_period_id=period.id, amount=5000)
+        rows = [Transaction(date=date(2026, 4, 2 + i), description=f'Shop {i}', amount=-1000,
+                            pay_period_id=period.id) for i in range(3)]
+        db.session.add(planned)
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = {'food': food.id, 'period': period.id, 'planned': planned.id, 'rows': [t.id for t in rows]}
+        db.session.remove()
+    return ids
+
+
+def test_batch_updates_rows_and_matches_one_planned_amount(app, seeded):
+    items = [{'transaction_id': tid, 'category_id': seeded['food'], 'auto_match': True} for tid in seeded['rows']]
+
+    body = app.test_client().post('/api/transactions/categorize', json={'items': items}).get_json()
+
+    assert (body['updated'], body['matched'], body['errors']) == (3, 1, 0)
+    assert all(r['transaction']['category_id'] == seeded['food'] for r in body['results'])
+    with app.app_context():
+        assert db.session.get(PlannedAmount, seeded['planned']).is_cleared
+        assert Transaction.query.filter(Transaction.matched_planned_id.isnot(None)).count() == 1
+        cell = CategoryPeriodActual.query.filter_by(category_id=seeded['food']).one()
+        assert cell.spent == -3000
+
+
+def test_bad_items_are_reported_per_item(app, seeded):
+    items = [
+        {'transaction_id': seeded['rows'][0], 'category_id': seeded['food']},
+        {'transaction_id': 999999, 'category_id': seeded['food']},
+        {'transaction_id': 'x', 'category_id': seeded['food']},
+        {'transaction_id': seeded['rows'][0], 'category_id': 424242},
+    ]
+
+    body = app.test_client().post('/api/transactions/categorize', json={'items': items}).get_json()
+
+    assert [r['status'] for r in body['results']] == ['error', 'error', 'error', 'error']
+    assert body['updated'] == 0
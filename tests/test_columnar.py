@@ -0,0 +1,59 @@
+"""Columnar list payloads and their compression."""
+import gzip
+import json
+
+from app.columnar import COLUMNAR_MIMETYPE
+
+
+def seed(client, n=5):
+    for day in range(1, n + 1):
+        client.post('/api/transactions', json={'date': f'2026-01-{day:02d}', 'description': f'Shop {day}',
+                                               'amount': -day * 1.25})
+
+
+def rows_of(columns):
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def test_columns_carry_the_same_rows_as_the_row_format(app):
+    client = app.test_client()
+    seed(client)
+
+    rows = client.get('/api/transactions?limit=3').get_json()
+    response = client.get('/api/transactions?limit=3&format=columnar')
+    body = json.loads(response.data)
+
+    assert response.mimetype == COLUMNAR_MIMETYPE
+    assert body['count'] == 3 and body['has_more'] is True
+    # Amounts travel as integer cents; everything else matches field for field
+    expected = [{**t, 'amount_cents': round(t['amount'] * 100)} for t in rows['transactions']]
+    assert rows_of(body['columns']) == [{name: t[name] for name in body['columns']} for t in expected]
+
+    rest = json.loads(client.get(f"/api/transactions?format=columnar&cursor={body['next_cursor']}").data)
+    assert rest['columns']['date'] == ['2026-01-02', '2026-01-01']
+    assert rest['has_more'] is False and rest['next_cursor'] is None
+
+
+def test_only_an_explicit_accept_selects_columnar(app):
+    client = app.test_client()
+
+    explicit = client.get('/api/planned-amounts', headers={'Accept': COLUMNAR_MIMETYPE})
+    wildcard = client.get('/api/planned-amounts', headers={'Accept': '*/*'})
+
+    assert explicit.mimetype == COLUMNAR_MIMETYPE
+    assert json.loads(explicit.data)['columns']['amount_cents'] == []
+    assert wildcard.mimetype == 'application/json'
+
+
+def test_large_payloads_are_compressed_when_accepted(app, monkeypatch):
+    client = app.test_client()
+    seed(client)
+    monkeypatch.setitem(app.config, 'COLUMNAR_COMPRESS_MIN_BYTES', 0)
+
+    plain = client.get('/api/transactions?format=columnar')
+    packed = client.get('/api/transactions?format=columnar', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in plain.headers
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(packed.data) == plain.data
+    assert {'Accept', 'Accept-Encoding'} <= set(packed.vary)
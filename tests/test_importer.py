@@ -0,0 +1,120 @@
+"""Statement import: content-hash dedupe, ON CONFLICT inserts and chunked resume."""
+from datetime import date
+
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import text
+
+from app.extensions import db
+from app.importer import dedupe_hash, import_statement
+from app.models import Transaction
+from conftest import MIGRATIONS, make_app
+
+STATEMENT = (
+    'Date,Description,Amount\n'
+    '2026-01-05,Coffee Shop,-4.50\n'
+    '2026-01-06,Grocery Store,-82.10\n'
+    '2026-01-07,Paycheck,1500.00\n'
+)
+WITH_REFERENCES = (
+    'Date,Description,Amount,Reference\n'
+    '2026-01-05,Coffee Shop,-4.50,R-1001\n'
+    '2026-01-06,Grocery Store,-82.10,R-1002\n'
+    '2026-01-07,Paycheck,1500.00,R-1003\n'
+)
+
+
+def write(tmp_path, content, name='statement.csv'):
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+def test_dedupe_hash_normalizes_description_and_amount():
+    day = date(2026, 1, 5)
+    assert dedupe_hash(day, '  Coffee   SHOP ', -450) == dedupe_hash(day, 'coffee shop', -450)
+    assert dedupe_hash(day, 'Coffee Shop', -450) != dedupe_hash(day, 'Coffee Shop', -451)
+    assert dedupe_hash(day, 'Coffee Shop', -450, 'R-1') != dedupe_hash(day, 'Coffee Shop', -450)
+
+
+def test_reimport_inserts_nothing(app, ctx, tmp_path):
+    path = write(tmp_path, STATEMENT)
+    first = import_statement(path)
+    second = import_statement(path)
+
+    assert first['imported'] == 3
+    assert second['imported'] == 0
+    assert second['skipped_duplicates'] == 3
+    assert Transaction.query.count() == 3
+
+
+def test_same_day_repeats_with_distinct_references_are_kept(app, ctx, tmp_path):
+    path = write(tmp_path, 'Date,Description,Amount,FITID\n'
+                           '2026-01-05,Coffee Shop,-4.50,A1\n'
+                           '2026-01-05,Coffee Shop,-4.50,A2\n')
+    assert import_statement(path)['imported'] == 2
+
+
+def test_referenced_statement_over_backfilled_rows_inserts_nothing(tmp_path, monkeypatch):
+    # Rows stored before dedupe_hash existed get the reference-less hash from
+    # the migration's backfill
+    app = make_app(tmp_path, monkeypatch, revision='c4f1a7d2e9b3')
+    with app.app_context():
+        db.session.execute(text(
+            "INSERT INTO transactions (date, description, amount, is_categorized, created_at) VALUES "
+            "('2026-01-05', 'Coffee Shop', -4.50, 0, '2026-01-10'), "
+            "('2026-01-06', 'GROCERY  STORE', -82.10, 0, '2026-01-10'), "
+            "('2026-01-07', 'Paycheck', 1500.00, 0, '2026-01-10')"
+        ))
+        db.session.commit()
+        upgrade(directory=MIGRATIONS)
+
+        summary = import_statement(write(tmp_path, WITH_REFERENCES))
+
+        assert summary['imported'] == 0
+        assert summary['skipped_duplicates'] == 3
+        assert Transaction.query.count() == 3
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_referenced_rows_extend_a_reference_less_import(app, ctx, tmp_path):
+    import_statement(write(tmp_path, STATEMENT))
+    overlapping = WITH_REFERENCES + '2026-01-08,Bookstore,-12.00,R-1004\n'
+
+    summary = import_statement(write(tmp_path, overlapping, 'next.csv'))
+
+    assert summary['imported'] == 1
+    assert Transaction.query.count() == 4
+
+
+def test_interrupted_csv_resumes_by_record(app, ctx, tmp_path):
+    # A blank line and a quoted multi-line description: file lines and
+    # records no longer line up
+    path = write(tmp_path, 'Date,Description,Amount\n'
+                           '2026-02-01,Rent,-1200.00\n'
+                           '\n'
+                           '2026-02-02,"Hardware\nstore",-35.20\n'
+                           '2026-02-03,Coffee Shop,-4.50\n'
+                           '2026-02-04,Grocery Store,-82.10\n'
+                           '2026-02-05,Bookstore,-12.00\n'
+                           '2026-02-06,Paycheck,1500.00\n')
+    saved = {}
+
+    def crash_after_first_chunk(**counts):
+        if counts['chunks_committed'] > 1:
+            raise RuntimeError('worker restarted')
+        saved.update(counts)
+
+    with pytest.raises(RuntimeError):
+        import_statement(path, progress=crash_after_first_chunk, chunk_size=3)
+    db.session.rollback()
+    assert Transaction.query.count() == 3
+
+    summary = import_statement(path, chunk_size=3, resume=saved)
+
+    assert summary['parsed'] == 6
+    assert summary['imported'] == 6
+    assert summary['skipped_duplicates'] == 0
+    assert sorted(t.description for t in Transaction.query) == [
+        'Bookstore', 'Coffee Shop', 'Grocery Store', 'Hardware\nstore', 'Paycheck', 'Rent']
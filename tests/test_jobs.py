@@ -0,0 +1,49 @@
+"""Reclaiming import jobs whose worker stopped heartbeating."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.jobs import JobQueueFull, job_runner
+from app.models import ImportJob
+
+
+def add_job(status='running', age=None, heartbeat=True):
+    stamp = datetime.utcnow() - timedelta(seconds=age or 0)
+    job = ImportJob(filename='statement.csv', status=status, created_at=stamp,
+                    heartbeat_at=stamp if heartbeat else None)
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+def test_reclaim_fails_only_jobs_without_a_recent_heartbeat(ctx):
+    stale = add_job(age=600)
+    legacy = add_job(status='queued', age=600, heartbeat=False)
+    live = add_job(age=10)
+    finished = add_job(status='completed', age=600)
+
+    assert job_runner.reclaim_stale() == 2
+    db.session.expire_all()
+    statuses = {job.id: job.status for job in ImportJob.query}
+    assert statuses == {stale: 'failed', legacy: 'failed', live: 'running', finished: 'completed'}
+    assert 'resume' in db.session.get(ImportJob, stale).error
+
+
+def test_jobs_held_by_this_process_are_never_reclaimed(ctx, monkeypatch):
+    held = add_job(age=600)
+    monkeypatch.setattr(job_runner, '_held', {held})
+
+    assert job_runner.reclaim_stale() == 0
+
+
+def test_stale_jobs_do_not_count_against_the_queue_limit(app, ctx, monkeypatch):
+    monkeypatch.setitem(app.config, 'IMPORT_MAX_PENDING', 1)
+    monkeypatch.setattr(job_runner, '_schedule', lambda job_id: None)
+    add_job(age=600)
+
+    job = job_runner.submit_import('next.csv', '/tmp/next.csv')
+    assert job.status == 'queued'
+
+    with pytest.raises(JobQueueFull):
+        job_runner.submit_import('another.csv', '/tmp/another.csv')
@@ -0,0 +1,72 @@
+"""Data migrations on SQLite: money to integer cents and the rollup rebuild."""
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import text
+
+from app import rollup
+from app.extensions import db
+from app.models import CategoryPeriodActual, PlannedAmount, Transaction
+from conftest import MIGRATIONS, make_app
+
+
+def _rollup_cells():
+    return sorted((c.category_id, c.pay_period_id, c.spent, c.received, c.transaction_count)
+                  for c in CategoryPeriodActual.query)
+
+
+def test_upgrade_converts_money_and_rebuilds_the_rollup(tmp_path, monkeypatch):
+    # Data as it stood when the rollup was first filled by a date-range join;
+    # periods 1 and 2 overlap on Jan 10-14
+    app = make_app(tmp_path, monkeypatch, revision='9600385b6b18')
+    with app.app_context():
+        db.session.execute(text(
+            "INSERT INTO budget_categories (id, name, category_type, is_active, is_parent_only, sort_order) "
+            "VALUES (1, 'Food', 'expense', 1, 0, 0)"
+        ))
+        db.session.execute(text(
+            "INSERT INTO pay_periods (id, start_date, end_date) VALUES "
+            "(1, '2026-01-01', '2026-01-14'), (2, '2026-01-10', '2026-01-23')"
+        ))
+        db.session.execute(text(
+            "INSERT INTO planned_amounts (category_id, pay_period_id, amount, is_cleared) VALUES (1, 1, 250.10, 0)"
+        ))
+        db.session.execute(text(
+            "INSERT INTO transactions (date, description, amount, category_id, is_categorized) VALUES "
+            "('2026-01-05', 'Grocer', -12.34, 1, 1), "
+            "('2026-01-12', 'Cafe', -4.50, 1, 1), "
+            "('2026-01-20', 'Refund', 10.01, 1, 1)"
+        ))
+        db.session.commit()
+        db.session.execute(text(
+            "INSERT INTO category_period_actuals "
+            "(category_id, pay_period_id, spent, received, transaction_count, updated_at) "
+            "SELECT t.category_id, p.id, "
+            "SUM(CASE WHEN t.amount < 0 THEN t.amount ELSE 0 END), "
+            "SUM(CASE WHEN t.amount > 0 THEN t.amount ELSE 0 END), COUNT(t.id), CURRENT_TIMESTAMP "
+            "FROM transactions t JOIN pay_periods p ON t.date BETWEEN p.start_date AND p.end_date "
+            "GROUP BY t.category_id, p.id"
+        ))
+        db.session.commit()
+
+        upgrade(directory=MIGRATIONS)
+
+        amounts = sorted(amount for (amount,) in db.session.query(Transaction.amount))
+        assert amounts == [-1234, -450, 1001]
+        assert db.session.query(PlannedAmount.amount).scalar() == 25010
+        # Jan 12 resolves to the later-starting period only
+        migrated = _rollup_cells()
+        assert migrated == [(1, 1, -1234, 0, 1), (1, 2, -450, 1001, 2)]
+        rollup.rebuild()
+        assert _rollup_cells() == migrated
+
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_downgrade_to_base_and_back(tmp_path, monkeypatch):
+    app = make_app(tmp_path, monkeypatch)
+    with app.app_context():
+        downgrade(directory=MIGRATIONS, revision='base')
+        upgrade(directory=MIGRATIONS)
+        assert db.session.execute(text('SELECT COUNT(*) FROM transactions')).scalar() == 0
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,31 @@
+"""Integer-cents helpers used at the API edges."""
+from decimal import Decimal
+
+import pytest
+
+from app.money import format_cents, to_cents, to_dollars
+
+
+@pytest.mark.parametrize('value, cents', [
+    ('12.34', 1234),
+    ('$1,234.50', 123450),
+    (' -0.01 ', -1),
+    (10, 1000),
+    (0.1 + 0.2, 30),
+    (Decimal('2.005'), 201),
+    ('-2.005', -201),
+])
+def test_to_cents_is_exact(value, cents):
+    assert to_cents(value) == cents
+
+
+@pytest.mark.parametrize('value', ['', 'abc', None, 'NaN', 'Infinity'])
+def test_to_cents_rejects_non_numbers(value):
+    with pytest.raises(ValueError):
+        to_cents(value)
+
+
+def test_to_dollars_and_format_cents():
+    assert to_dollars(123450) == 1234.5
+    assert to_dollars(None) is None
+    assert [format_cents(c) for c in (0, 5, -5, 123456, -100)] == ['0.00', '0.05', '-0.05', '1234.56', '-1.00']
@@ -0,0 +1,35 @@
+"""Pay period interval index: bisect lookups instead of table scans."""
+from datetime import date
+
+from app.pay_periods import PayPeriodIndex
+
+INDEX = PayPeriodIndex([
+    (date(2026, 1, 15), date(2026, 1, 28), 2),
+    (date(2026, 1, 1), date(2026, 1, 14), 1),
+    # Gap from Jan 29 to Feb 4
+    (date(2026, 2, 5), date(2026, 2, 18), 3),
+])
+
+
+def test_resolve_finds_the_containing_period():
+    assert INDEX.resolve(date(2026, 1, 1)) == 1
+    assert INDEX.resolve(date(2026, 1, 14)) == 1
+    assert INDEX.resolve(date(2026, 1, 15)) == 2
+    assert INDEX.resolve(date(2026, 2, 18)) == 3
+
+
+def test_dates_outside_every_period_resolve_to_none():
+    assert INDEX.resolve_many([date(2025, 12, 31), date(2026, 2, 1), date(2026, 3, 1)]) == [None, None, None]
+
+
+def test_overlapping_returns_periods_touching_the_range():
+    assert INDEX.overlapping(date(2026, 1, 10), date(2026, 1, 20)) == [1, 2]
+    assert INDEX.overlapping(date(2026, 1, 29), date(2026, 2, 4)) == []
+    assert INDEX.overlapping(date(2026, 1, 29), date(2026, 2, 5)) == [3]
+
+
+def test_empty_index():
+    empty = PayPeriodIndex([])
+    assert len(empty) == 0
+    assert empty.resolve(date(2026, 1, 1)) is None
+    assert empty.overlapping(date(2026, 1, 1), date(2026, 12, 31)) == []
@@ -0,0 +1,52 @@
+"""POST /api/planned-amounts/batch: one upsert for many cells."""
+from datetime import date
+
+import pytest
+
+from app.extensions import db
+from app.models import BudgetCategory, PayPeriod, PlannedAmount
+
+
+@pytest.fixture
+def cell(app):
+    with app.app_context():
+        category = BudgetCategory(name='Rent', category_type='expense')
+        periods = [PayPeriod(start_date=date(2026, 1, 1), end_date=date(2026, 1, 14)),
+                   PayPeriod(start_date=date(2026, 1, 15), end_date=date(2026, 1, 28))]
+        db.session.add_all([category, *periods])
+        db.session.flush()
+        db.session.add(PlannedAmount(category_id=category.id, pay_period_id=periods[0].id, amount=1000,
+                                     is_cleared=True))
+        db.session.commit()
+        ids = category.id, [p.id for p in periods]
+        db.session.remove()
+    return ids
+
+
+def test_creates_and_updates_in_one_request(app, cell):
+    category, (first, second) = cell
+    body = app.test_client().post('/api/planned-amounts/batch', json={'items': [
+        {'category_id': category, 'pay_period_id': first, 'amount': '12.34'},
+        {'category_id': category, 'pay_period_id': second, 'amount': 50, 'due_date': '2026-01-20'},
+    ]}).get_json()
+
+    assert (body['created'], body['updated'], body['errors']) == (1, 1, 0)
+    assert [r['status'] for r in body['results']] == ['updated', 'created']
+    with app.app_context():
+        updated = PlannedAmount.query.filter_by(pay_period_id=first).one()
+        # Fields the item doesn't carry are left as they were
+        assert (updated.amount, updated.is_cleared) == (1234, True)
+        assert PlannedAmount.query.filter_by(pay_period_id=second).one().due_date == date(2026, 1, 20)
+
+
+def test_bad_items_do_not_abort_the_batch(app, cell):
+    category, (first, second) = cell
+    body = app.test_client().post('/api/planned-amounts/batch', json={'items': [
+        {'category_id': category, 'pay_period_id': 999, 'amount': 1},
+        {'category_id': category, 'pay_period_id': second, 'amount': 'lots'},
+        {'category_id': category, 'pay_period_id': first, 'amount': 1},
+        {'category_id': category, 'pay_period_id': first, 'amount': 2},
+    ]}).get_json()
+
+    assert [r['status'] for r in body['results']] == ['error', 'error', 'error', 'updated']
+    assert body['results'][3]['planned']['amount'] == 2
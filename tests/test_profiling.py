@@ -0,0 +1,52 @@
+"""Opt-in request timing, metrics and single-request cProfile capture."""
+import pytest
+
+from app.extensions import db
+from app.profiling import profiler
+from conftest import make_app
+
+
+@pytest.fixture
+def profiled_app(tmp_path, monkeypatch):
+    # The profiler is a module singleton; put its settings back afterwards
+    for name in ('enabled', 'slow_query_ms', 'profile_dir'):
+        monkeypatch.setattr(profiler, name, getattr(profiler, name))
+    monkeypatch.setattr(profiler, '_routes', {})
+    monkeypatch.setenv('ENABLE_PROFILING', '1')
+    monkeypatch.setenv('PROFILE_DIR', str(tmp_path / 'profiles'))
+    app = make_app(tmp_path, monkeypatch)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_requests_get_server_timing_and_metrics(profiled_app):
+    client = profiled_app.test_client()
+
+    response = client.get('/api/transactions')
+    metrics = client.get('/api/_metrics').get_json()
+
+    timings = response.headers['Server-Timing']
+    assert all(f'{name};dur=' in timings for name in ('sql', 'app', 'json', 'total'))
+    assert metrics['enabled'] is True
+    assert metrics['routes']['GET /api/transactions']['count'] == 1
+
+
+def test_profile_capture_is_saved_and_exclusive(profiled_app, tmp_path):
+    client = profiled_app.test_client()
+
+    saved = client.get('/api/transactions', headers={'X-Profile': '1'})
+    assert (tmp_path / 'profiles' / saved.headers['X-Profile-File']).exists()
+
+    # Another request is mid-profile: the next one asking for a profile is turned away
+    assert profiler._profile_lock.acquire(blocking=False)
+    try:
+        busy = client.get('/api/transactions?_profile=1')
+        plain = client.get('/api/transactions')
+    finally:
+        profiler._profile_lock.release()
+
+    assert busy.status_code == 409
+    assert plain.status_code == 200
+    assert client.get('/api/transactions?_profile=1').status_code == 200
@@ -0,0 +1,86 @@
+"""Re-running the category rules over stored transactions."""
+import pytest
+
+from app.extensions import db
+from app.models import BudgetCategory, CategoryPeriodActual, Transaction
+
+
+@pytest.fixture
+def seeded(app):
+    """Food/Fuel categories, rules for each, one period and four transactions"""
+    with app.app_context():
+        food = BudgetCategory(name='Food', category_type='expense')
+        fuel = BudgetCategory(name='Fuel', category_type='expense')
+        db.session.add_all([food, fuel])
+        db.session.commit()
+        ids = food.id, fuel.id
+        db.session.remove()
+
+    food, fuel = ids
+    client = app.test_client()
+    client.post('/api/pay-periods', json={'start_date': '2026-01-01', 'generate_count': 2})
+    for day, description, category in [
+        ('2026-01-02', 'MARKET 12', None), ('2026-01-03', 'Shell gas', None),
+        ('2026-01-04', 'Market deli', fuel), ('2026-01-05', 'Bookstore', None),
+    ]:
+        client.post('/api/transactions', json={'date': day, 'description': description, 'amount': -10,
+                                               'category_id': category})
+    # Rules are added after the rows, so nothing is categorized yet
+    client.post('/api/category-rules', json={'pattern': 'market', 'category_id': food})
+    client.post('/api/category-rules', json={'pattern': 'gas', 'category_id': fuel})
+    return ids
+
+
+def categories_by_description(app):
+    with app.app_context():
+        return {t.description: t.category_id for t in Transaction.query}
+
+
+def test_uncategorized_scope_leaves_existing_categories(app, seeded):
+    food, fuel = seeded
+
+    body = app.test_client().post('/api/category-rules/apply', json={}).get_json()
+
+    assert (body['scope'], body['scanned'], body['changed']) == ('uncategorized', 3, 2)
+    assert sorted((r['pattern'], r['changed']) for r in body['rules']) == [('gas', 1), ('market', 1)]
+    assert categories_by_description(app) == {
+        'MARKET 12': food, 'Shell gas': fuel, 'Market deli': fuel, 'Bookstore': None}
+
+
+def test_all_scope_overrides_and_refreshes_the_rollup(app, seeded):
+    food, fuel = seeded
+
+    body = app.test_client().post('/api/category-rules/apply', json={'scope': 'all'}).get_json()
+
+    assert (body['scanned'], body['changed']) == (4, 3)
+    assert categories_by_description(app)['Market deli'] == food
+    with app.app_context():
+        cells = {c.category_id: (c.spent, c.transaction_count) for c in CategoryPeriodActual.query}
+    assert cells == {food: (-2000, 2), fuel: (-1000, 1), None: (-1000, 1)}
+
+
+def test_date_range_limits_the_rows_scanned(app, seeded):
+    body = app.test_client().post('/api/category-rules/apply', json={
+        'start_date': '2026-01-03', 'end_date': '2026-01-04'}).get_json()
+
+    assert (body['scanned'], body['changed']) == (1, 1)
+
+
+def test_dry_run_reports_without_writing(app, seeded):
+    before = categories_by_description(app)
+
+    body = app.test_client().post('/api/category-rules/apply', json={'scope': 'all', 'dry_run': True}).get_json()
+
+    assert body['dry_run'] is True
+    assert body['changed'] == 3
+    assert categories_by_description(app) == before
+
+
+@pytest.mark.parametrize('payload', [{'scope': 'everything'}, {'dry_run': 'false'}, {'start_date': '01/03/2026'}])
+def test_invalid_requests_are_rejected(app, seeded, payload):
+    before = categories_by_description(app)
+
+    response = app.test_client().post('/api/category-rules/apply', json=payload)
+
+    assert response.status_code == 400
+    assert categories_by_description(app) == before
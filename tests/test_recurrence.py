@@ -0,0 +1,66 @@
+"""Due-date arithmetic for recurring expenses (no database)."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.recurrence import clamp_day, monthly_due_dates, schedule
+
+
+def biweekly(first_start, count):
+    """(start, end, id) tuples for back-to-back 14-day periods"""
+    return [(first_start + timedelta(days=14 * i), first_start + timedelta(days=14 * i + 13), i + 1)
+            for i in range(count)]
+
+
+@pytest.mark.parametrize('year, month, day, expected', [
+    (2026, 1, 31, date(2026, 1, 31)),
+    (2026, 2, 31, date(2026, 2, 28)),
+    (2028, 2, 30, date(2028, 2, 29)),
+    (2026, 4, 31, date(2026, 4, 30)),
+    (2026, 4, 15, date(2026, 4, 15)),
+])
+def test_clamp_day_stops_at_month_end(year, month, day, expected):
+    assert clamp_day(year, month, day) == expected
+
+
+def test_monthly_due_dates_clamp_each_month():
+    assert monthly_due_dates(31, date(2026, 1, 1), date(2026, 4, 30)) == [
+        date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)]
+
+
+def test_quarterly_follows_the_anchor_month():
+    dates = monthly_due_dates(10, date(2026, 1, 1), date(2026, 12, 31), step=3, anchor=date(2026, 2, 1))
+    assert dates == [date(2026, 2, 10), date(2026, 5, 10), date(2026, 8, 10), date(2026, 11, 10)]
+
+
+def test_schedule_places_one_date_per_period():
+    result = schedule('monthly', 5, biweekly(date(2026, 1, 1), 6))
+    assert result == [(1, date(2026, 1, 5)), (3, date(2026, 2, 5)), (5, date(2026, 3, 5))]
+
+
+def test_mid_period_start_drops_earlier_due_dates():
+    # The first period (Jan 1-14) began before the expense does; its Jan 5
+    # due date is before start_date and must not be generated
+    periods = biweekly(date(2026, 1, 1), 4)
+    start = date(2026, 1, 10)
+
+    monthly = schedule('monthly', 5, periods, anchor=start, start_date=start)
+    every = schedule('everyperiod', 3, periods, start_date=start)
+
+    assert monthly == [(3, date(2026, 2, 5))]
+    assert every == [(2, date(2026, 1, 17)), (3, date(2026, 1, 31)), (4, date(2026, 2, 14))]
+
+
+def test_mid_period_start_keeps_a_later_date_in_the_same_period():
+    periods = biweekly(date(2026, 1, 1), 2)
+    assert schedule('monthly', 12, periods, start_date=date(2026, 1, 10)) == [(1, date(2026, 1, 12))]
+
+
+def test_month_end_due_day_in_february():
+    periods = biweekly(date(2026, 2, 19), 3)
+    assert schedule('monthly', 31, periods) == [(1, date(2026, 2, 28)), (3, date(2026, 3, 31))]
+
+
+def test_unknown_frequency_is_rejected():
+    with pytest.raises(ValueError):
+        schedule('weekly', 1, biweekly(date(2026, 1, 1), 1))
@@ -0,0 +1,62 @@
+"""Recurring templates applied in bulk across pay periods."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import BudgetCategory, PayPeriod, PlannedAmount, RecurringTemplate
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        rent = BudgetCategory(name='Rent', category_type='expense')
+        phone = BudgetCategory(name='Phone', category_type='expense')
+        db.session.add_all([rent, phone])
+        db.session.flush()
+        periods = [PayPeriod(start_date=date(2026, 1, 1) + timedelta(days=14 * i),
+                             end_date=date(2026, 1, 14) + timedelta(days=14 * i)) for i in range(4)]
+        templates = [RecurringTemplate(name='Rent', category_id=rent.id, amount=120000, frequency='monthly'),
+                     RecurringTemplate(name='Phone', category_id=phone.id, amount=6000, frequency='monthly')]
+        db.session.add_all(periods + templates)
+        db.session.flush()
+        # One cell already planned; applying must leave it alone
+        db.session.add(PlannedAmount(category_id=rent.id, pay_period_id=periods[0].id, amount=99))
+        db.session.commit()
+        ids = {'periods': [p.id for p in periods], 'templates': [t.id for t in templates]}
+        db.session.remove()
+    return ids
+
+
+def test_all_templates_over_a_date_range_fill_only_missing_cells(app, seeded):
+    body = app.test_client().post('/api/recurring-templates/apply', json={
+        'template_ids': 'all', 'start_date': '2026-01-01', 'end_date': '2026-02-28'
+    }).get_json()
+
+    assert body['applied_count'] == 7
+    with app.app_context():
+        assert PlannedAmount.query.count() == 8
+        assert PlannedAmount.query.filter_by(amount=99).count() == 1
+
+
+def test_listed_templates_and_periods(app, seeded):
+    body = app.test_client().post('/api/recurring-templates/apply', json={
+        'template_ids': seeded['templates'][1:], 'pay_period_ids': seeded['periods'][:2]
+    }).get_json()
+
+    assert body == {'applied_count': 2, 'templates': [{'template_id': seeded['templates'][1], 'applied_count': 2}]}
+
+
+@pytest.mark.parametrize('body', [
+    {'template_ids': 'some', 'start_date': '2026-01-01'},
+    {'template_ids': 3, 'start_date': '2026-01-01'},
+    {'template_ids': ['1', 2], 'start_date': '2026-01-01'},
+    {'template_ids': [True], 'start_date': '2026-01-01'},
+    {'template_ids': 'all', 'pay_period_ids': 'all'},
+    {'template_ids': 'all'},
+])
+def test_invalid_bodies_are_rejected(app, seeded, body):
+    response = app.test_client().post('/api/recurring-templates/apply', json=body)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,77 @@
+"""The incrementally maintained actuals rollup always equals a full rebuild."""
+import pytest
+
+from app import rollup
+from app.extensions import db
+from app.importer import import_statement
+from app.models import BudgetCategory, CategoryPeriodActual
+
+
+def cells():
+    return sorted((c.category_id, c.pay_period_id, c.spent, c.received, c.transaction_count)
+                  for c in CategoryPeriodActual.query)
+
+
+def assert_matches_rebuild(app):
+    with app.app_context():
+        maintained = cells()
+        rollup.rebuild()
+        rebuilt = cells()
+        db.session.rollback()
+        assert maintained == rebuilt
+        return maintained
+
+
+@pytest.fixture
+def categories(app):
+    with app.app_context():
+        food = BudgetCategory(name='Food', category_type='expense')
+        pay = BudgetCategory(name='Salary', category_type='income')
+        db.session.add_all([food, pay])
+        db.session.commit()
+        ids = food.id, pay.id
+        db.session.remove()
+    return ids
+
+
+def test_writes_keep_the_rollup_in_step(app, categories, tmp_path):
+    food, pay = categories
+    client = app.test_client()
+
+    # Transactions before any period exist have no cell
+    client.post('/api/transactions', json={'date': '2026-01-03', 'description': 'Deli', 'amount': -12.5,
+                                           'category_id': food})
+    assert assert_matches_rebuild(app) == []
+
+    client.post('/api/pay-periods', json={'start_date': '2026-01-01', 'generate_count': 3})
+    assert assert_matches_rebuild(app) == [(food, 1, -1250, 0, 1)]
+
+    client.post('/api/transactions', json={'date': '2026-01-16', 'description': 'Payroll', 'amount': 2000})
+    statement = tmp_path / 'jan.csv'
+    statement.write_text('Date,Description,Amount\n2026-01-20,Market,-40.00\n2026-01-30,Market,-10.00\n')
+    with app.app_context():
+        import_statement(str(statement))
+
+    listed = client.get('/api/transactions').get_json()['transactions']
+    payroll = next(t for t in listed if t['description'] == 'Payroll')
+    client.put(f"/api/transactions/{payroll['id']}/categorize", json={'category_id': pay})
+    markets = [t['id'] for t in listed if t['description'] == 'Market']
+    client.post('/api/transactions/categorize', json={'items': [
+        {'transaction_id': tid, 'category_id': food} for tid in markets]})
+
+    assert assert_matches_rebuild(app) == [
+        (food, 1, -1250, 0, 1), (food, 2, -4000, 0, 1), (food, 3, -1000, 0, 1), (pay, 2, 0, 200000, 1)]
+
+
+def test_budget_vs_actual_counts_transactions_outside_every_period(app, categories):
+    food, _ = categories
+    client = app.test_client()
+    client.post('/api/pay-periods', json={'start_date': '2026-01-01', 'generate_count': 1})
+    client.post('/api/transactions', json={'date': '2026-01-05', 'description': 'In', 'amount': -10,
+                                           'category_id': food})
+    client.post('/api/transactions', json={'date': '2025-06-01', 'description': 'Before', 'amount': -5,
+                                           'category_id': food})
+
+    body = client.get('/api/analytics/budget-vs-actual').get_json()
+
+    assert body['actual_total'] == -15
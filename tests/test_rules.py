@@ -0,0 +1,47 @@
+"""Compiled rule matcher: one regex scan, lowest rule id wins."""
+from app import rules
+from app.extensions import db
+from app.models import BudgetCategory, CategoryRule
+from app.rules import RuleMatcher
+
+
+def test_first_rule_wins_wherever_it_occurs():
+    matcher = RuleMatcher([('coffee', 1), ('shop', 2), ('coffee shop', 3)])
+
+    assert matcher.match('COFFEE SHOP #12') == 1
+    assert matcher.match('Pet shop coffee') == 1
+    assert matcher.match('Thrift Shop') == 2
+    assert matcher.match('Bakery') is None
+    assert matcher.match(None) is None
+
+
+def test_patterns_are_literal_and_case_insensitive():
+    matcher = RuleMatcher([('a+b (co)', 7), ('.', 8)])
+
+    assert matcher.match('Paid A+B (Co) Ltd') == 7
+    assert matcher.match('no dot here') is None
+    assert matcher.match('v1.2') == 8
+
+
+def test_overlapping_patterns_are_all_seen():
+    # 'market' starts inside 'supermarket'; the lookahead still finds it
+    matcher = RuleMatcher([('market', 1), ('supermarket', 2)])
+    assert matcher.match('SUPERMARKET 44') == 1
+
+
+def test_duplicate_patterns_keep_the_first_rule():
+    matcher = RuleMatcher([('gas', 1, 10), ('GAS', 2, 11)])
+    assert len(matcher) == 1
+    assert matcher.match_rule('Gas station') == (10, 1)
+
+
+def test_cached_matcher_sees_new_rules(app, ctx):
+    food = BudgetCategory(name='Food', category_type='expense')
+    db.session.add(food)
+    db.session.flush()
+    assert rules.categorize(['Corner Deli']) == [None]
+
+    db.session.add(CategoryRule(pattern='deli', category_id=food.id))
+    db.session.commit()
+
+    assert rules.categorize(['Corner Deli', 'Bank fee']) == [food.id, None]
@@ -0,0 +1,78 @@
+"""Each list endpoint must cost exactly one SQL query, however many rows it returns.
+
+The serializers in app/serializers.py join related names in up front; a
+regression back to model ``to_dict`` (lazy-loading ``category``/``parent``/
+``group`` per row) shows up here as extra queries.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import (BudgetCategory, CategoryGroup, CategoryRule, PayPeriod, PlannedAmount,
+                        RecurringTemplate, Transaction)
+
+ROWS = 5
+
+
+@pytest.fixture(autouse=True)
+def seeded(app):
+    with app.app_context():
+        _seed()
+        db.session.remove()
+
+
+def _seed():
+    groups = [CategoryGroup(name=f'Group {i}', category_type='expense') for i in range(2)]
+    db.session.add_all(groups)
+    db.session.flush()
+    parent = BudgetCategory(name='Parent', category_type='expense', group_id=groups[0].id, is_parent_only=True)
+    db.session.add(parent)
+    db.session.flush()
+    categories = [BudgetCategory(name=f'Category {i}', category_type='expense', parent_id=parent.id,
+                                 group_id=groups[i % 2].id, sort_order=i) for i in range(ROWS)]
+    db.session.add_all(categories)
+    db.session.flush()
+    periods = [PayPeriod(start_date=date(2026, 1, 2) + timedelta(days=14 * i),
+                         end_date=date(2026, 1, 15) + timedelta(days=14 * i)) for i in range(ROWS)]
+    db.session.add_all(periods)
+    db.session.flush()
+    for i, category in enumerate(categories):
+        db.session.add(PlannedAmount(category_id=category.id, pay_period_id=periods[i].id, amount=1000 * i))
+        db.session.add(Transaction(date=periods[i].start_date, description=f'Shop {i}', amount=-500 * i,
+                                   category_id=category.id, is_categorized=True, pay_period_id=periods[i].id))
+        db.session.add(CategoryRule(pattern=f'SHOP {i}', category_id=category.id))
+        db.session.add(RecurringTemplate(name=f'Bill {i}', category_id=category.id, amount=2500,
+                                         frequency='monthly'))
+    db.session.commit()
+
+
+@pytest.fixture
+def count_queries(app):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.mark.parametrize('path, key', [
+    ('/api/categories', None),
+    ('/api/planned-amounts', None),
+    ('/api/transactions', 'transactions'),
+    ('/api/category-rules', None),
+    ('/api/recurring-templates', None),
+])
+def test_list_endpoint_issues_one_query(app, count_queries, path, key):
+    response = app.test_client().get(path)
+
+    assert response.status_code == 200
+    rows = response.get_json()[key] if key else response.get_json()
+    assert len(rows) >= ROWS
+    assert len(count_queries) == 1, count_queries
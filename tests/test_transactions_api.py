@@ -0,0 +1,57 @@
+"""GET /api/transactions: keyset pages, server-side filters and totals."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import BudgetCategory, Transaction
+
+
+@pytest.fixture
+def client(app):
+    with app.app_context():
+        category = BudgetCategory(name='Food', category_type='expense')
+        db.session.add(category)
+        db.session.flush()
+        for i in range(7):
+            categorized = i % 2 == 0
+            db.session.add(Transaction(date=date(2026, 3, 1) + timedelta(days=i), description=f'Shop {i}',
+                                       amount=-100 * (i + 1), category_id=category.id if categorized else None,
+                                       is_categorized=categorized))
+        db.session.commit()
+        db.session.remove()
+    return app.test_client()
+
+
+def test_pages_follow_the_cursor_newest_first(client):
+    seen = []
+    params = {'limit': 3}
+    while True:
+        body = client.get('/api/transactions', query_string=params).get_json()
+        seen.extend(row['description'] for row in body['transactions'])
+        if not body['has_more']:
+            break
+        params['cursor'] = body['next_cursor']
+
+    assert seen == [f'Shop {i}' for i in reversed(range(7))]
+
+
+def test_filters_apply_before_paging(client):
+    body = client.get('/api/transactions?uncategorized=1&limit=2&with_total=1').get_json()
+    assert body['total'] == 3
+    assert all(row['category_id'] is None for row in body['transactions'])
+    assert body['has_more']
+
+    body = client.get('/api/transactions?categorized=1&with_total=1').get_json()
+    assert body['total'] == 4
+    assert client.get('/api/transactions?q=shop 3&with_total=1').get_json()['total'] == 1
+
+
+def test_total_is_only_added_on_request(client):
+    assert 'total' not in client.get('/api/transactions').get_json()
+
+
+@pytest.mark.parametrize('query', ['limit=0', 'limit=abc', 'category_id=abc', 'cursor=nope',
+                                   'start_date=03/01/2026', 'min_amount=ten'])
+def test_invalid_arguments_are_rejected(client, query):
+    assert client.get(f'/api/transactions?{query}').status_code == 400
@@ -0,0 +1,85 @@
+"""Spending trend buckets, splits and rolling averages."""
+from datetime import date
+
+import pytest
+
+from app.extensions import db
+from app.models import BudgetCategory, Transaction
+from app.trends import _rolling_average, bucket_start, next_bucket, previous_bucket, spending_trend
+
+
+def test_calendar_bucket_arithmetic():
+    assert bucket_start(date(2026, 3, 12), 'week') == date(2026, 3, 9)  # Monday
+    assert bucket_start(date(2026, 3, 12), 'month') == date(2026, 3, 1)
+    assert next_bucket(date(2026, 1, 1), 'month') == date(2026, 2, 1)
+    assert next_bucket(date(2026, 12, 1), 'month') == date(2027, 1, 1)
+    assert previous_bucket(date(2026, 3, 1), 'month') == date(2026, 2, 1)
+    assert previous_bucket(date(2026, 3, 9), 'week') == date(2026, 3, 2)
+
+
+def test_rolling_average_waits_for_a_full_window():
+    assert _rolling_average([100, 200, 300, 400], 3) == [None, None, 2.0, 3.0]
+
+
+@pytest.fixture
+def spending(app):
+    with app.app_context():
+        food = BudgetCategory(name='Food', category_type='expense')
+        db.session.add(food)
+        db.session.flush()
+        for day, amount, category in [
+            (date(2026, 1, 5), -1000, food.id), (date(2026, 1, 20), -500, None),
+            (date(2026, 2, 3), -2000, food.id), (date(2026, 2, 10), 300000, None),
+            (date(2026, 4, 1), -700, food.id),
+        ]:
+            db.session.add(Transaction(date=day, description='x', amount=amount, category_id=category))
+        db.session.commit()
+        food_id = food.id
+        db.session.remove()
+    return food_id
+
+
+def test_monthly_buckets_are_dense_and_in_dollars(app, spending):
+    with app.app_context():
+        trend = spending_trend('month', start_date=date(2026, 1, 1), end_date=date(2026, 4, 30))
+
+    assert trend['buckets'] == ['2026-01-01', '2026-02-01', '2026-03-01', '2026-04-01']
+    assert trend['series'] == [{'key': 'total', 'label': 'Total', 'values': [15.0, 20.0, 0.0, 7.0], 'total': 42.0}]
+
+
+def test_weekly_buckets_start_on_monday(app, spending):
+    with app.app_context():
+        trend = spending_trend('week', start_date=date(2026, 1, 7), end_date=date(2026, 1, 21))
+
+    assert trend['buckets'] == ['2026-01-05', '2026-01-12', '2026-01-19']
+    assert trend['series'][0]['values'] == [10.0, 0.0, 5.0]
+
+
+def test_split_by_category_and_type(app, spending):
+    with app.app_context():
+        by_category = spending_trend('month', split='category', start_date=date(2026, 1, 1),
+                                     end_date=date(2026, 2, 28))
+        by_type = spending_trend('month', split='type', start_date=date(2026, 1, 1), end_date=date(2026, 2, 28))
+
+    assert [(s['label'], s['values']) for s in by_category['series']] == [
+        ('Food', [10.0, 20.0]), ('Uncategorized', [5.0, 0.0])]
+    assert {s['key']: s['values'] for s in by_type['series']} == {
+        'expense': [15.0, 20.0], 'income': [0.0, 3000.0]}
+
+
+def test_rolling_average_uses_buckets_before_the_window(app, spending):
+    with app.app_context():
+        trend = spending_trend('month', start_date=date(2026, 2, 1), end_date=date(2026, 2, 28), rolling=2)
+
+    assert trend['buckets'] == ['2026-02-01']
+    assert trend['series'][0]['rolling_average'] == [17.5]
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'granularity': 'year'}, {'split': 'merchant'}, {'measure': 'avg'}, {'rolling': 0},
+    {'start_date': date(2026, 2, 1), 'end_date': date(2026, 1, 1)},
+    {'granularity': 'day', 'start_date': date(2020, 1, 1), 'end_date': date(2026, 1, 1)},
+])
+def test_invalid_arguments_raise(app, ctx, kwargs):
+    with pytest.raises(ValueError):
+        spending_trend(**kwargs)
@@ -0,0 +1,7 @@
+"""Production WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:app
+
+run.py stays the local development server (flask run / python run.py).
+"""
+from app import create_app
+
+app = create_app()